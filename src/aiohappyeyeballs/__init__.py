@@ -1,14 +1,51 @@
 __version__ = "2.7.1"
 
-from .impl import start_connection
-from .types import AddrInfoType, SocketFactoryType
+from .backoff import AddressBackoff
+from .cache import ResolutionCache
+from .health import FamilyHealth
+from .hedging import HedgeBudget, HedgedCallError, hedged_call
+from .history import ConnectionHistory
+from .hosts import HostsFile
+from .impl import (
+    StartConnectionTimeoutError,
+    start_connection,
+    start_connection_by_host,
+    start_connections,
+)
+from .pool import WarmPool
+from .resolver import StubResolver
+from .rfc6724 import sort_by_rfc6724
+from .route import RouteProbe
+from .types import (
+    AddrInfoType,
+    HappyEyeballsDelayType,
+    ResolverType,
+    SocketFactoryType,
+)
 from .utils import addr_to_addr_infos, pop_addr_infos_interleave, remove_addr_infos
 
 __all__ = (
     "AddrInfoType",
+    "AddressBackoff",
+    "ConnectionHistory",
+    "FamilyHealth",
+    "HappyEyeballsDelayType",
+    "HedgeBudget",
+    "HedgedCallError",
+    "HostsFile",
+    "ResolutionCache",
+    "ResolverType",
+    "RouteProbe",
     "SocketFactoryType",
+    "StartConnectionTimeoutError",
+    "StubResolver",
+    "WarmPool",
     "addr_to_addr_infos",
+    "hedged_call",
     "pop_addr_infos_interleave",
     "remove_addr_infos",
+    "sort_by_rfc6724",
     "start_connection",
+    "start_connection_by_host",
+    "start_connections",
 )
@@ -1,49 +1,539 @@
 import asyncio
-import contextlib
-from collections.abc import Awaitable, Callable, Iterable
-from typing import (
-    TYPE_CHECKING,
-    Any,
-    TypeVar,
+import sys
+from collections import deque
+from collections.abc import (
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
 )
+from typing import Any, Generic, TypeVar
+
+from ._timer_wheel import WheelTimer, get_timer_wheel
 
 _T = TypeVar("_T")
 
 RE_RAISE_EXCEPTIONS = (SystemExit, KeyboardInterrupt)
 
+_DelayCallable = Callable[[int], float | None]
+_CoroFns = (
+    Iterable[Callable[[], Awaitable[_T]]] | AsyncIterable[Callable[[], Awaitable[_T]]]
+)
 
-def _set_result(wait_next: "asyncio.Future[None]") -> None:
-    """Set the result of a future if it is not already done."""
-    if not wait_next.done():
-        wait_next.set_result(None)
+if sys.version_info >= (3, 12):
 
+    def _ensure_future_eager(
+        aw: Awaitable[_T], loop: asyncio.AbstractEventLoop
+    ) -> "asyncio.Future[_T]":
+        """
+        Wrap an awaitable in a future, running coroutines eagerly.
 
-async def _wait_one(
-    futures: "Iterable[asyncio.Future[Any]]",
-    loop: asyncio.AbstractEventLoop,
-) -> _T:
-    """Wait for the first future to complete."""
-    wait_next = loop.create_future()
+        The coroutine runs up to its first suspension point right away,
+        so if it completes without suspending the returned task is
+        already done. Loops with a custom task factory are left alone.
+        """
+        if asyncio.iscoroutine(aw) and loop.get_task_factory() is None:
+            return asyncio.Task(aw, loop=loop, eager_start=True)
+        return asyncio.ensure_future(aw, loop=loop)
 
-    def _on_completion(fut: "asyncio.Future[Any]") -> None:
-        if not wait_next.done():
-            wait_next.set_result(fut)
+else:  # pragma: no cover
 
-    for f in futures:
-        f.add_done_callback(_on_completion)
+    def _ensure_future_eager(
+        aw: Awaitable[_T], loop: asyncio.AbstractEventLoop
+    ) -> "asyncio.Future[_T]":
+        """Wrap an awaitable in a future, eager tasks need Python 3.12."""
+        return asyncio.ensure_future(aw, loop=loop)
 
-    try:
-        return await wait_next
-    finally:
-        for f in futures:
-            f.remove_done_callback(_on_completion)
+
+class CandidateQueue(Generic[_T]):
+    """
+    Coroutine functions for staggered_race which can be added while it runs.
+
+    Iterating the queue waits for the next coroutine function to be
+    appended, until the queue is closed. Pass it as *coro_fns* to race
+    the candidates as soon as they are known, e.g. as DNS answers arrive.
+
+    A race takes the coroutine functions from the queue only when it is
+    about to start them, so subclasses can override ``_take`` to decide
+    the order as late as possible. A queue is meant for a single race.
+    """
+
+    __slots__ = ("_closed", "_items", "_listener", "_waiter")
+
+    def __init__(self, coro_fns: Iterable[Callable[[], Awaitable[_T]]] = ()) -> None:
+        self._closed = False
+        self._items: deque[Callable[[], Awaitable[_T]]] = deque(coro_fns)
+        self._listener: Callable[[], None] | None = None
+        self._waiter: asyncio.Future[None] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of coroutine functions not taken yet."""
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        """Return True if no more coroutine functions will be appended."""
+        return self._closed
+
+    def append(self, coro_fn: Callable[[], Awaitable[_T]]) -> None:
+        """Append a coroutine function."""
+        if self._closed:
+            raise RuntimeError("CandidateQueue is closed")
+        self._items.append(coro_fn)
+        self._wakeup()
+
+    def close(self) -> None:
+        """Signal that no more coroutine functions will be appended."""
+        self._closed = True
+        self._wakeup()
+
+    def _take(self) -> Callable[[], Awaitable[_T]] | None:
+        """Return the next coroutine function, if there is one."""
+        return self._items.popleft() if self._items else None
+
+    def _wakeup(self) -> None:
+        if (waiter := self._waiter) is not None and not waiter.done():
+            waiter.set_result(None)
+        if self._listener is not None:
+            self._listener()
+
+    def __aiter__(self) -> "CandidateQueue[_T]":
+        return self
+
+    async def __anext__(self) -> Callable[[], Awaitable[_T]]:
+        while (coro_fn := self._take()) is None:
+            if self._closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return coro_fn
+
+
+class _StaggeredRace(Generic[_T]):
+    """
+    Callback driven state machine for a single staggered race.
+
+    Every attempt is a future (coroutines are wrapped in a task) with a
+    single done callback registered on it. Starting the next attempt is
+    done directly from the timer or the done callback, so the only thing
+    the race coroutine awaits is the one result future of the race.
+
+    Start times are absolute times on the loop clock and a single timer
+    per race is used to wait for the next one. Timers are scheduled on the
+    loop, or on the shared timer wheel of the loop if requested.
+
+    Coroutine functions from an async iterable are collected by a feeder
+    task, a CandidateQueue is read directly and wakes the race up when it
+    changes. When an attempt is due but none has arrived yet the race is
+    starved, and the next one to arrive is started right away.
+
+    The race ends once count attempts succeeded. Until then every start
+    starts as many attempts as there are winners missing.
+    """
+
+    __slots__ = (
+        "_coro_iter",
+        "_count",
+        "_deadline",
+        "_deadline_timer",
+        "_delay",
+        "_feeder",
+        "_feeding",
+        "_held_back",
+        "_loop",
+        "_max_in_flight",
+        "_next_start",
+        "_on_late_result",
+        "_pending",
+        "_queue",
+        "_reraise",
+        "_source",
+        "_starved",
+        "_timer",
+        "_timer_when",
+        "_use_timer_wheel",
+        "exceptions",
+        "result",
+        "running",
+        "timed_out",
+        "winners",
+    )
+
+    def __init__(
+        self,
+        coro_fns: _CoroFns[_T],
+        delay: float | _DelayCallable | None,
+        loop: asyncio.AbstractEventLoop,
+        max_in_flight: int | None = None,
+        deadline: float | None = None,
+        use_timer_wheel: bool = False,
+        count: int = 1,
+        on_late_result: Callable[[_T], object] | None = None,
+    ) -> None:
+        self._coro_iter: Iterator[Callable[[], Awaitable[_T]]] | None = None
+        self._source: AsyncIterable[Callable[[], Awaitable[_T]]] | None = None
+        self._queue: CandidateQueue[_T] | None = None
+        if isinstance(coro_fns, CandidateQueue):
+            self._queue = coro_fns
+        elif isinstance(coro_fns, AsyncIterable):
+            self._source = coro_fns
+        else:
+            self._coro_iter = iter(coro_fns)
+        self._pending: deque[Callable[[], Awaitable[_T]]] = deque()
+        self._feeder: asyncio.Task[None] | None = None
+        self._feeding = False
+        self._starved = False
+        self._count = count
+        self._deadline = deadline
+        self._deadline_timer: asyncio.TimerHandle | WheelTimer | None = None
+        self._delay = delay
+        self._held_back = False
+        self._loop = loop
+        self._max_in_flight = max_in_flight
+        self._next_start: float | None = None
+        self._on_late_result = on_late_result
+        self._reraise: BaseException | None = None
+        self._timer: asyncio.TimerHandle | WheelTimer | None = None
+        self._timer_when = 0.0
+        self._use_timer_wheel = use_timer_wheel
+        self.exceptions: list[BaseException | None] = []
+        self.result: asyncio.Future[None] = loop.create_future()
+        self.running: dict[asyncio.Future[_T], int] = {}
+        self.timed_out = False
+        self.winners: list[tuple[_T, int]] = []
+
+    def start(self) -> None:
+        """Start the race."""
+        if self._deadline is not None:
+            self._deadline_timer = self._call_at(self._deadline, self._on_deadline)
+        if (queue := self._queue) is not None:
+            self._feeding = not queue.closed
+            queue._listener = self._on_queue_changed
+        elif self._source is not None:
+            self._feeding = True
+            self._feeder = self._loop.create_task(self._feed(self._source))
+        self.start_next()
+
+    def _on_queue_changed(self) -> None:
+        """Start a starved attempt once the queue has a new candidate."""
+        if self._queue is not None and self._queue.closed:
+            self._feeding = False
+        if self._starved:
+            self.start_next()
+
+    async def _feed(self, source: AsyncIterable[Callable[[], Awaitable[_T]]]) -> None:
+        """Collect coroutine functions from an async iterable."""
+        try:
+            async for coro_fn in source:
+                self._pending.append(coro_fn)
+                if self._starved:
+                    self.start_next()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            # The source failed, which ends the race
+            self._feeding = False
+            if not self.result.done():
+                self.result.set_exception(e)
+            elif isinstance(e, RE_RAISE_EXCEPTIONS):
+                self._reraise = e
+            return
+        self._feeding = False
+        if self._starved:
+            self.start_next()
+
+    def _next_coro_fn(self) -> Callable[[], Awaitable[_T]] | None:
+        """Return the next coroutine function, if one is available."""
+        if self._coro_iter is not None:
+            return next(self._coro_iter, None)
+        if self._queue is not None:
+            return self._queue._take()
+        if self._pending:
+            return self._pending.popleft()
+        return None
+
+    def _on_deadline(self) -> None:
+        """Stop the race without a winner once the deadline is reached."""
+        self._deadline_timer = None
+        if not self.result.done():
+            self.timed_out = True
+            self.result.set_result(None)
+
+    def start_next(self) -> None:
+        """Start the next attempt now, the schedule moves along with it."""
+        self._start_from_callback(self._loop.time())
+
+    def _on_timer(self) -> None:
+        """Start the attempts that are due according to the schedule."""
+        self._timer = None
+        if (next_start := self._next_start) is None:
+            return
+        if next_start > self._loop.time():
+            # The schedule moved back after the timer was armed
+            self._arm_timer(next_start)
+            return
+        self._start_from_callback(next_start)
+
+    def _start_from_callback(self, start_at: float) -> None:
+        """
+        Start attempts outside of the race coroutine.
+
+        Only the result future reaches the caller from a loop callback,
+        so an error of the coroutine functions ends the race with it
+        instead of going to the exception handler of the loop.
+        """
+        try:
+            self._start_attempts(start_at)
+        except BaseException as e:
+            if not self.result.done():
+                self.result.set_exception(e)
+            if isinstance(e, RE_RAISE_EXCEPTIONS):
+                raise
+
+    def _arm_timer(self, when: float) -> None:
+        """
+        Make sure the timer fires no later than when.
+
+        An armed timer that fires earlier is kept, it re-arms itself for
+        the rest of the wait, so moving the schedule back does not churn
+        the timer heap of the loop.
+        """
+        if self._timer is not None:
+            if self._timer_when <= when:
+                return
+            self._timer.cancel()
+        self._timer = self._call_at(when, self._on_timer)
+        self._timer_when = when
+
+    def _call_at(
+        self, when: float, callback: Callable[[], None]
+    ) -> asyncio.TimerHandle | WheelTimer:
+        """Schedule callback on the loop or on the shared timer wheel."""
+        if self._use_timer_wheel:
+            return get_timer_wheel(self._loop).call_at(when, callback)
+        return self._loop.call_at(when, callback)
+
+    def _start_attempts(self, start_at: float) -> None:
+        """
+        Start the attempt scheduled at start_at.
+
+        The start time of the attempt after it is start_at plus its delay,
+        so the schedule does not drift when the loop runs late. Attempts
+        which are overdue by the time they are scheduled are started right
+        away, otherwise the timer is armed for the next one.
+
+        If there are no coroutine functions left and nothing is running,
+        the race is over without a winner. If more may still arrive from
+        an async iterable, the race waits for them.
+
+        If max_in_flight attempts are already running, the start is held
+        back until one of them finishes.
+
+        No attempts are started once the deadline has passed.
+
+        If more than one winner is missing, as many attempts are started
+        together.
+        """
+        loop = self._loop
+        now = loop.time()
+        deadline = self._deadline
+        self._next_start = None
+        batch = self._count - len(self.winners)
+        while not self.result.done():
+            if deadline is not None and now >= deadline:
+                # The deadline timer stops the race
+                return
+            if (
+                self._max_in_flight is not None
+                and len(self.running) >= self._max_in_flight
+            ):
+                self._held_back = True
+                return
+            self._held_back = False
+            if (coro_fn := self._next_coro_fn()) is None:
+                if self._feeding:
+                    # Start the next one as soon as it arrives
+                    self._starved = True
+                elif not self.running:
+                    # We exhausted the coro_fns list and no attempts are
+                    # running so we have no winner and all coroutines failed.
+                    self.result.set_result(None)
+                return
+            self._starved = False
+            this_index = len(self.exceptions)
+            self.exceptions.append(None)
+            fut: asyncio.Future[_T]
+            try:
+                if this_index:
+                    fut = asyncio.ensure_future(coro_fn(), loop=loop)
+                else:
+                    fut = _ensure_future_eager(coro_fn(), loop)
+            except RE_RAISE_EXCEPTIONS:
+                raise
+            except BaseException as e:
+                # Calling the coroutine function failed, which counts as
+                # a failed attempt so move straight on to the next one.
+                self.exceptions[this_index] = e
+                start_at = now
+                continue
+            self.running[fut] = this_index
+            if fut.done():
+                # The attempt completed without suspending, handle it right
+                # away so a synchronous winner is returned without arming
+                # the timer or starting any further attempts.
+                if self._attempt_done(fut):
+                    start_at = now
+                    batch = min(batch, self._count - len(self.winners))
+                    continue
+                return
+            fut.add_done_callback(self._on_attempt_done)
+            if (batch := batch - 1) > 0:
+                continue
+            if (delay := self._delay) is not None and callable(delay):
+                delay = delay(this_index + 1)
+            if delay is None:
+                return
+            start_at += delay
+            if deadline is not None and start_at >= deadline:
+                # The next attempt would only start after the deadline
+                return
+            if start_at > now:
+                self._next_start = start_at
+                self._arm_timer(start_at)
+                return
+            # The next attempt is already overdue, start it right away
+            batch = self._count - len(self.winners)
+
+    def _on_attempt_done(self, fut: "asyncio.Future[_T]") -> None:
+        """Done callback of a single attempt."""
+        if self._attempt_done(fut):
+            self.start_next()  # Kickstart the next coroutine
+
+    def _attempt_done(self, fut: "asyncio.Future[_T]") -> bool:
+        """
+        Handle the completion of a single attempt.
+
+        If the attempt failed, record the exception and return True if it
+        was the most recently started attempt, or a start was held back
+        waiting for a free slot, so the next one is started.
+
+        If the attempt succeeded and the race is not over yet, it wins.
+        Return True if winners are still missing and nothing is running
+        or a start was held back, so the next one is started. A success
+        after the race is over is passed to on_late_result.
+
+        If SystemExit or KeyboardInterrupt is raised, re-raise it from
+        the race.
+        """
+        this_index = self.running.pop(fut)
+        try:
+            result = fut.result()
+        except RE_RAISE_EXCEPTIONS as e:
+            if self.result.done():
+                self._reraise = e
+            else:
+                self.result.set_exception(e)
+            return False
+        except BaseException as e:
+            if self.timed_out and isinstance(e, asyncio.CancelledError):
+                # The attempt was cut off by the deadline of the race
+                self.exceptions[this_index] = TimeoutError(
+                    "attempt cancelled at the deadline of the race"
+                )
+            else:
+                self.exceptions[this_index] = e
+            # Only the failure of the most recently started attempt, or of
+            # the last one still running, kickstarts the next coroutine,
+            # unless a start is waiting for this slot to free up.
+            return (
+                self._held_back
+                or this_index == len(self.exceptions) - 1
+                or not self.running
+            )
+        if self.result.done():
+            if self._on_late_result is not None:
+                self._dispose(self._on_late_result, result)
+            return False
+        self.winners.append((result, this_index))
+        if len(self.winners) == self._count:
+            self.result.set_result(None)
+            return False
+        return self._held_back or not self.running
+
+    def _dispose(self, on_late_result: Callable[[_T], object], result: _T) -> None:
+        """Pass the result of a late attempt to on_late_result."""
+        try:
+            on_late_result(result)
+        except Exception as exc:
+            self._loop.call_exception_handler(
+                {"message": "Exception in on_late_result callback", "exception": exc}
+            )
+
+    async def finish(self, background: bool = False) -> None:
+        """
+        Stop the race and wait for all attempts to finish.
+
+        If there are any attempts left, cancel them and then
+        wait for them so they fill the exceptions list.
+
+        If background is True, the cancelled attempts are not waited
+        for, their done callbacks reap them once they finish.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._deadline_timer is not None:
+            self._deadline_timer.cancel()
+            self._deadline_timer = None
+        if self._queue is not None:
+            self._queue._listener = None
+        if not self.result.done():
+            self.result.cancel()
+        feeder = self._feeder
+        if feeder is not None and not feeder.done():
+            feeder.cancel()
+        else:
+            feeder = None
+        if (running := self.running) or feeder is not None:
+            for fut in running:
+                fut.cancel()
+            if not background:
+                pending: set[asyncio.Future[Any]] = set(running)
+                if feeder is not None:
+                    pending.add(feeder)
+                await asyncio.wait(pending)
+        if (reraise := self._reraise) is not None:
+            self._reraise = None
+            raise reraise
+
+
+def _delay_schedule(delays: Sequence[float]) -> _DelayCallable:
+    """Return a delay callable that steps through a sequence of delays."""
+    if not delays:
+        raise ValueError("delay sequence must not be empty")
+    last = len(delays) - 1
+
+    def _delay_for(index: int) -> float:
+        return delays[min(index - 1, last)]
+
+    return _delay_for
 
 
 async def staggered_race(
-    coro_fns: Iterable[Callable[[], Awaitable[_T]]],
-    delay: float | None,
+    coro_fns: _CoroFns[_T],
+    delay: float | Sequence[float] | _DelayCallable | None,
     *,
     loop: asyncio.AbstractEventLoop | None = None,
+    cancel_losers_in_background: bool = False,
+    max_in_flight: int | None = None,
+    deadline: float | None = None,
+    use_timer_wheel: bool = False,
+    on_late_result: Callable[[_T], object] | None = None,
 ) -> tuple[_T | None, int | None, list[BaseException | None]]:
     """
     Run coroutines with staggered start times and take the first to finish.
@@ -55,6 +545,14 @@ async def staggered_race(
     successfully, in which case all others are cancelled, or until all
     coroutines fail.
 
+    The race is driven by a single callback based state machine: each
+    attempt gets one done callback and the race only awaits one future,
+    so no per-attempt wrapper coroutines or futures are created.
+
+    The first attempt is started eagerly on Python 3.12+, if it completes
+    without suspending (for example a loopback connection) its result is
+    returned without arming the timer or starting any further attempts.
+
     The coroutines provided should be well-behaved in the following way:
 
     * They should only ``return`` if completed successfully.
@@ -72,14 +570,60 @@ async def staggered_race(
     Args:
     ----
         coro_fns: an iterable of coroutine functions, i.e. callables that
-            return a coroutine object when called. Use ``functools.partial`` or
-            lambdas to pass arguments.
+            return a coroutine object (or any other awaitable) when called.
+            Use ``functools.partial`` or lambdas to pass arguments. An async
+            iterable (for example a ``CandidateQueue``) is consumed while
+            the race runs: an attempt that is due before the next coroutine
+            function arrives is started as soon as it does, and the race
+            only ends without a winner once the async iterable is exhausted
+            and every attempt failed. An exception raised by the async
+            iterable is raised from the race.
 
         delay: amount of time, in seconds, between starting coroutines. If
-            ``None``, the coroutines will run sequentially.
+            ``None`` or ``0``, the coroutines will run sequentially. A
+            sequence gives the delay before each coroutine after the first:
+            ``delay[0]`` before the second, ``delay[1]`` before the third and
+            so on, the last delay is reused once the sequence runs out. A
+            callable is called with the index of the coroutine about to be
+            scheduled and returns its delay, or ``None`` to only start it
+            once the previous coroutine fails. A delay of ``0`` from a
+            sequence or a callable starts the coroutine right away.
 
         loop: the event loop to use. If ``None``, the running loop is used.
 
+        cancel_losers_in_background: if ``True``, the winner is returned as
+            soon as it is known. The remaining coroutines are cancelled but
+            not waited for, they are reaped in the background and their
+            entries in *exceptions* are filled in once they finish.
+
+        max_in_flight: the maximum number of coroutines running at the same
+            time. When the limit is reached, starting the next coroutine is
+            held back until a running one fails or is cancelled. If
+            ``None``, there is no limit.
+
+        deadline: the time, on the clock of the event loop (see
+            ``loop.time()``), at which the race is abandoned. No coroutine
+            is started at or after the deadline, the stagger timer is not
+            armed if it would only fire after it, and coroutines still
+            running at the deadline are cancelled and get a
+            ``TimeoutError`` entry in *exceptions*. If ``None``, the race
+            has no deadline.
+
+        use_timer_wheel: if ``True``, the race timers are scheduled on the
+            timer wheel shared by all races on the loop instead of directly
+            on the loop. The wheel has millisecond resolution and keeps a
+            single timer on the loop, which saves scheduler work when many
+            races run at the same time and most of their timers are
+            cancelled before they fire.
+
+        on_late_result: called with the result of every coroutine which
+            completes successfully once the race is over, for example one
+            that completed just before it could be cancelled, so whatever
+            it holds can be released. If the race is cancelled or raises,
+            it is called with the winner found so far as well, which the
+            caller never gets. Errors raised by it are passed to the
+            exception handler of the loop.
+
     Returns:
     -------
         tuple *(winner_result, winner_index, exceptions)* where
@@ -98,100 +642,148 @@ async def staggered_race(
           coroutine's entry is ``None``.
 
     """
-    loop = loop or asyncio.get_running_loop()
-    exceptions: list[BaseException | None] = []
-    tasks: set[asyncio.Task[tuple[_T, int] | None]] = set()
-
-    async def run_one_coro(
-        coro_fn: Callable[[], Awaitable[_T]],
-        this_index: int,
-        start_next: "asyncio.Future[None]",
-    ) -> tuple[_T, int] | None:
-        """
-        Run a single coroutine.
+    race = await _run_race(
+        coro_fns,
+        delay,
+        loop,
+        cancel_losers_in_background,
+        max_in_flight,
+        deadline,
+        use_timer_wheel,
+        1,
+        on_late_result,
+    )
+    if race.winners:
+        return *race.winners[0], race.exceptions
+    return None, None, race.exceptions
+
+
+async def staggered_race_many(
+    coro_fns: _CoroFns[_T],
+    delay: float | Sequence[float] | _DelayCallable | None,
+    count: int,
+    *,
+    loop: asyncio.AbstractEventLoop | None = None,
+    cancel_losers_in_background: bool = False,
+    max_in_flight: int | None = None,
+    deadline: float | None = None,
+    use_timer_wheel: bool = False,
+    on_late_result: Callable[[_T], object] | None = None,
+) -> tuple[list[tuple[_T, int]], list[BaseException | None]]:
+    """
+    Run coroutines with staggered start times and take the first count to finish.
 
-        If the coroutine fails, set the exception in the exceptions list and
-        start the next coroutine by setting the result of the start_next.
+    This works like ``staggered_race``, except that the race goes on until
+    *count* coroutines completed successfully. Every time coroutines are
+    started, as many are started together as there are winners missing,
+    so with the same coroutine function repeated *count* times in a row
+    all winners can be found in about the time it takes to find one.
+    A success also starts the next coroutines right away if nothing else
+    is running.
 
-        If the coroutine succeeds, return the result and the index of the
-        coroutine in the coro_fns list.
+    Once *count* coroutines won, all others are cancelled. Coroutines
+    completing successfully after that are not winners, their results are
+    passed to *on_late_result*.
 
-        If SystemExit or KeyboardInterrupt is raised, re-raise it.
-        """
-        try:
-            result = await coro_fn()
-        except RE_RAISE_EXCEPTIONS:
-            raise
-        except BaseException as e:
-            exceptions[this_index] = e
-            _set_result(start_next)  # Kickstart the next coroutine
-            return None
-
-        return result, this_index
-
-    start_next_timer: asyncio.TimerHandle | None = None
-    start_next: asyncio.Future[None] | None
-    task: asyncio.Task[tuple[_T, int] | None]
-    done: asyncio.Future[None] | asyncio.Task[tuple[_T, int] | None]
-    coro_iter = iter(coro_fns)
-    this_index = -1
+    Args:
+    ----
+        coro_fns: the coroutine functions, as for ``staggered_race``.
+
+        delay: the delay between starts, as for ``staggered_race``.
+
+        count: the number of winners to race for.
+
+        loop: the event loop to use. If ``None``, the running loop is used.
+
+        cancel_losers_in_background: as for ``staggered_race``, applies once
+            all *count* winners are known.
+
+        max_in_flight: as for ``staggered_race``, also bounds the number of
+            coroutines started together.
+
+        deadline: as for ``staggered_race``, the winners found by then are
+            returned.
+
+        use_timer_wheel: as for ``staggered_race``.
+
+        on_late_result: as for ``staggered_race``, called for the results
+            of the coroutines completing after all winners are known, and
+            for the winners found so far if the race is cancelled or raises.
+
+    Returns:
+    -------
+        tuple *(winners, exceptions)* where *winners* is a list of
+        *(winner_result, winner_index)* tuples in the order the coroutines
+        won, with fewer than *count* entries if the coroutines ran out or
+        the deadline was reached first, and *exceptions* is the same as
+        for ``staggered_race``.
+
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    race = await _run_race(
+        coro_fns,
+        delay,
+        loop,
+        cancel_losers_in_background,
+        max_in_flight,
+        deadline,
+        use_timer_wheel,
+        count,
+        on_late_result,
+    )
+    return race.winners, race.exceptions
+
+
+async def _run_race(
+    coro_fns: _CoroFns[_T],
+    delay: float | Sequence[float] | _DelayCallable | None,
+    loop: asyncio.AbstractEventLoop | None,
+    cancel_losers_in_background: bool,
+    max_in_flight: int | None,
+    deadline: float | None,
+    use_timer_wheel: bool,
+    count: int,
+    on_late_result: Callable[[_T], object] | None,
+) -> _StaggeredRace[_T]:
+    """Run a staggered race to the end and return it."""
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    if isinstance(delay, Sequence):
+        delay = _delay_schedule(delay)
+    elif not delay:
+        # A delay of 0 runs the coroutines one after the other
+        delay = None
+    loop = loop or asyncio.get_running_loop()
+    race: _StaggeredRace[_T] = _StaggeredRace(
+        coro_fns,
+        delay,
+        loop,
+        max_in_flight,
+        deadline,
+        use_timer_wheel,
+        count,
+        on_late_result,
+    )
+    finished = False
     try:
-        while True:
-            if coro_fn := next(coro_iter, None):
-                this_index += 1
-                exceptions.append(None)
-                start_next = loop.create_future()
-                task = loop.create_task(run_one_coro(coro_fn, this_index, start_next))
-                tasks.add(task)
-                start_next_timer = (
-                    loop.call_later(delay, _set_result, start_next) if delay else None
-                )
-            elif not tasks:
-                # We exhausted the coro_fns list and no tasks are running
-                # so we have no winner and all coroutines failed.
-                break
-
-            while tasks or start_next:
-                done = await _wait_one(
-                    (*tasks, start_next) if start_next else tasks, loop
-                )
-                if done is start_next:
-                    # The current task has failed or the timer has expired
-                    # so we need to start the next task.
-                    start_next = None
-                    if start_next_timer:
-                        start_next_timer.cancel()
-                        start_next_timer = None
-
-                    # Break out of the task waiting loop to start the next
-                    # task.
-                    break
-
-                if TYPE_CHECKING:
-                    assert isinstance(done, asyncio.Task)
-
-                tasks.remove(done)
-                if winner := done.result():
-                    return *winner, exceptions
+        race.start()
+        await race.result
+        finished = True
     finally:
         # We either have:
         #  - a winner
-        #  - all tasks failed
+        #  - all attempts failed
         #  - a KeyboardInterrupt or SystemExit.
-
-        #
-        # If the timer is still running, cancel it.
-        #
-        if start_next_timer:
-            start_next_timer.cancel()
-
-        #
-        # If there are any tasks left, cancel them and than
-        # wait them so they fill the exceptions list.
-        #
-        for task in tasks:
-            task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await task
-
-    return None, None, exceptions
+        #  - been cancelled
+        try:
+            await race.finish(
+                cancel_losers_in_background and finished and bool(race.winners)
+            )
+        finally:
+            if not finished and on_late_result is not None:
+                # The caller never gets the winners found so far
+                for result, _ in race.winners:
+                    race._dispose(on_late_result, result)
+                race.winners.clear()
+    return race
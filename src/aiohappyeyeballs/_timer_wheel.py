@@ -0,0 +1,157 @@
+import asyncio
+import heapq
+import math
+from collections.abc import Callable
+
+RE_RAISE_EXCEPTIONS = (SystemExit, KeyboardInterrupt)
+
+_WHEELS: dict[asyncio.AbstractEventLoop, "TimerWheel"] = {}
+
+
+class WheelTimer:
+    """A timer scheduled on a :class:`TimerWheel`."""
+
+    __slots__ = ("_callback", "_cancelled", "_wheel", "when")
+
+    def __init__(
+        self, wheel: "TimerWheel", when: float, callback: Callable[[], object]
+    ) -> None:
+        self._wheel = wheel
+        self._callback = callback
+        self._cancelled = False
+        self.when = when
+
+    def cancel(self) -> None:
+        """Cancel the timer, does nothing if it already fired."""
+        if not self._cancelled:
+            self._cancelled = True
+            self._wheel._discard()
+
+    def cancelled(self) -> bool:
+        """Return True if the timer was cancelled or already fired."""
+        return self._cancelled
+
+
+class TimerWheel:
+    """
+    Coarse timers for an event loop sharing a single loop timer.
+
+    Timers are hashed into buckets of *resolution* seconds, rounded up so
+    they never fire early. Only the earliest bucket has a timer on the
+    loop and cancelling a timer just marks it, so timers which are
+    cancelled before they fire never reach the scheduler of the loop.
+
+    Once the last pending timer is cancelled or fired the loop timer is
+    cancelled as well, an idle wheel does not keep the loop busy.
+    """
+
+    __slots__ = (
+        "_buckets",
+        "_handle",
+        "_handle_tick",
+        "_live",
+        "_loop",
+        "_resolution",
+        "_ticks",
+    )
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, resolution: float = 0.001
+    ) -> None:
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self._loop = loop
+        self._resolution = resolution
+        self._buckets: dict[int, list[WheelTimer]] = {}
+        # Heap of the ticks in _buckets
+        self._ticks: list[int] = []
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_tick = 0
+        self._live = 0
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        return self._live
+
+    def call_at(self, when: float, callback: Callable[[], object]) -> WheelTimer:
+        """Call callback at the time when on the clock of the loop."""
+        tick = math.ceil(when / self._resolution)
+        timer = WheelTimer(self, when, callback)
+        if (bucket := self._buckets.get(tick)) is None:
+            self._buckets[tick] = [timer]
+            heapq.heappush(self._ticks, tick)
+        else:
+            bucket.append(timer)
+        self._live += 1
+        if self._handle is None or tick < self._handle_tick:
+            self._arm(tick)
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], object]) -> WheelTimer:
+        """Call callback after delay seconds."""
+        return self.call_at(self._loop.time() + delay, callback)
+
+    def _arm(self, tick: int) -> None:
+        """Arm the loop timer for the bucket at tick."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self._loop.call_at(tick * self._resolution, self._run)
+        self._handle_tick = tick
+
+    def _discard(self) -> None:
+        """Account for a cancelled timer, clear the wheel once it is idle."""
+        self._live -= 1
+        if not self._live:
+            self._clear()
+
+    def _clear(self) -> None:
+        """Drop the cancelled timers and the loop timer of an idle wheel."""
+        self._buckets.clear()
+        self._ticks.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if _WHEELS.get(self._loop) is self:
+            del _WHEELS[self._loop]
+
+    def _run(self) -> None:
+        """Fire the timers of every bucket that is due."""
+        self._handle = None
+        loop = self._loop
+        due = max(self._handle_tick, math.floor(loop.time() / self._resolution))
+        buckets = self._buckets
+        ticks = self._ticks
+        while ticks and ticks[0] <= due:
+            for timer in buckets.pop(heapq.heappop(ticks)):
+                if timer._cancelled:
+                    continue
+                timer._cancelled = True
+                self._live -= 1
+                try:
+                    timer._callback()
+                except RE_RAISE_EXCEPTIONS:
+                    raise
+                except BaseException as exc:
+                    msg = f"Exception in timer callback {timer._callback!r}"
+                    loop.call_exception_handler({"message": msg, "exception": exc})
+        self._rearm()
+
+    def _rearm(self) -> None:
+        """Arm the loop timer for the earliest bucket left after a run."""
+        if not self._live:
+            self._clear()
+        elif self._handle is None or self._handle_tick != self._ticks[0]:
+            # Callbacks may have armed it for a bucket that was run already
+            self._arm(self._ticks[0])
+
+
+def get_timer_wheel(loop: asyncio.AbstractEventLoop) -> TimerWheel:
+    """
+    Return the shared timer wheel of the loop.
+
+    A wheel is created on first use and dropped again once it has no
+    pending timers, so the wheels do not keep closed loops alive.
+    """
+    if (wheel := _WHEELS.get(loop)) is None:
+        wheel = _WHEELS[loop] = TimerWheel(loop)
+    return wheel
@@ -0,0 +1,117 @@
+"""Back off from addresses which failed to connect."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from .types import AddrInfoType
+
+
+class _Failures:
+    """The failures of one address and until when it is avoided."""
+
+    __slots__ = ("count", "until")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.until = 0.0
+
+
+class AddressBackoff:
+    """
+    Avoid the addresses which failed to connect, backing off exponentially.
+
+    Every failed attempt to an address marks it as bad for a backoff
+    which starts at *initial* seconds and is multiplied by *factor* with
+    every consecutive failure, up to *maximum* seconds. A successful
+    attempt clears the failures of the address.
+
+    ``sort`` moves the addresses which are marked as bad to the end of
+    the list, so a dead address stops costing an attempt and a happy
+    eyeballs delay on every connection while the others work. It is
+    still attempted when everything before it failed. Once its backoff
+    expired, the next ``sort`` puts it in its usual place again while
+    the following ones keep avoiding it for another backoff, so a single
+    connection retries it to notice when it recovered.
+
+    The failures of at most *max_size* addresses are kept, the least
+    recently used are forgotten first.
+
+    Pass the backoff as ``backoff`` to start_connection(), which sorts the
+    addresses with it and records the outcome of every attempt.
+    """
+
+    __slots__ = ("_clock", "_failures", "factor", "initial", "max_size", "maximum")
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        maximum: float = 300.0,
+        factor: float = 2.0,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.max_size = max_size
+        self._clock = clock
+        self._failures: OrderedDict[tuple[Any, ...], _Failures] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of addresses with failures."""
+        return len(self._failures)
+
+    def is_bad(self, addr_info: AddrInfoType) -> bool:
+        """Return True if the address is backed off from."""
+        failures = self._failures.get(addr_info[4])
+        return failures is not None and self._clock() < failures.until
+
+    def sort(self, addr_infos: Iterable[AddrInfoType]) -> list[AddrInfoType]:
+        """Return the addresses, the ones marked as bad last."""
+        now = self._clock()
+        good: list[AddrInfoType] = []
+        bad: list[AddrInfoType] = []
+        for addr_info in addr_infos:
+            if (failures := self._failures.get(addr_info[4])) is None:
+                good.append(addr_info)
+            elif now < failures.until:
+                bad.append(addr_info)
+            else:
+                # Retry it this time only, until the outcome is recorded
+                failures.until = now + self._backoff(failures.count)
+                good.append(addr_info)
+        return good + bad
+
+    def record_success(self, addr_info: AddrInfoType, rtt: float) -> None:
+        """Record an attempt which connected, clearing the failures."""
+        self._failures.pop(addr_info[4], None)
+
+    def record_failure(
+        self, addr_info: AddrInfoType, exc: BaseException | None = None
+    ) -> None:
+        """Record an attempt which failed, backing off from the address."""
+        sockaddr = addr_info[4]
+        if (failures := self._failures.get(sockaddr)) is None:
+            failures = self._failures[sockaddr] = _Failures()
+            if len(self._failures) > self.max_size:
+                self._failures.popitem(last=False)
+        else:
+            self._failures.move_to_end(sockaddr)
+        failures.count += 1
+        failures.until = self._clock() + self._backoff(failures.count)
+
+    def record_cancel(self, addr_info: AddrInfoType, elapsed: float) -> None:
+        """Ignore an attempt which was cancelled before it finished."""
+
+    def clear(self) -> None:
+        """Forget the failures of every address."""
+        self._failures.clear()
+
+    def _backoff(self, count: int) -> float:
+        """Return the backoff after count consecutive failures."""
+        # The exponent is capped so the float does not overflow
+        return min(self.initial * self.factor ** min(count - 1, 64), self.maximum)
@@ -0,0 +1,171 @@
+"""An in-process cache for address resolution."""
+
+import asyncio
+import functools
+import socket
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+from .impl import _getaddrinfo
+from .types import AddrInfoType, ResolverType
+
+_Key = tuple[str, int, int]
+
+
+class _Entry:
+    """The cached answer for one key."""
+
+    __slots__ = ("addr_infos", "error", "expires")
+
+    def __init__(
+        self,
+        expires: float,
+        addr_infos: Sequence[AddrInfoType] = (),
+        error: OSError | None = None,
+    ) -> None:
+        self.expires = expires
+        self.addr_infos = addr_infos
+        self.error = error
+
+
+class ResolutionCache:
+    """
+    Cache resolved addresses for a time to live, evicting the least recent.
+
+    Lookups of the stream addresses are keyed by ``(host, port, family)``
+    and made with the ``resolver``, by default the ``getaddrinfo()`` of the
+    running loop. Any ``ResolverType`` can be cached, e.g. a StubResolver,
+    a HostsFile or another cache. Concurrent lookups of the same key share
+    a single call to the resolver.
+
+    * Addresses are cached for *ttl* seconds. Once expired they are still
+        returned for up to *stale_ttl* seconds while they are refreshed in
+        the background, so a popular name never waits for the resolver.
+        If the refresh fails the stale addresses are kept until then.
+    * A failed lookup (``OSError``, e.g. ``socket.gaierror``) is cached
+        for *negative_ttl* seconds and raised again without asking the
+        resolver.
+    * At most *max_size* keys are kept, the least recently used are
+        evicted first.
+
+    ``hits`` and ``misses`` count the lookups answered from the cache,
+    including stale and negative answers, and the ones which had to wait
+    for the resolver.
+
+    The cache can be passed as the ``resolver`` of start_connection_by_host()
+    or be used to get the ``addr_infos`` for start_connection()::
+
+        cache = ResolutionCache()
+        addr_infos = await cache.resolve("example.org", 80)
+        sock = await start_connection(addr_infos)
+    """
+
+    __slots__ = (
+        "_clock",
+        "_entries",
+        "_lookups",
+        "_resolver",
+        "hits",
+        "max_size",
+        "misses",
+        "negative_ttl",
+        "stale_ttl",
+        "ttl",
+    )
+
+    def __init__(
+        self,
+        resolver: ResolverType | None = None,
+        *,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        stale_ttl: float = 30.0,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._lookups: dict[_Key, asyncio.Task[Sequence[AddrInfoType]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached keys."""
+        return len(self._entries)
+
+    async def __call__(
+        self, host: str, port: int, family: int
+    ) -> Sequence[AddrInfoType]:
+        """Resolve the stream addresses of one family, as a resolver."""
+        return await self.resolve(host, port, family)
+
+    async def resolve(
+        self,
+        host: str,
+        port: int,
+        family: int = socket.AF_UNSPEC,
+    ) -> list[AddrInfoType]:
+        """Return the addresses of host, from the cache if possible."""
+        key = (host, port, family)
+        if (entry := self._entries.get(key)) is not None:
+            now = self._clock()
+            if entry.error is not None:
+                if now < entry.expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    raise entry.error.with_traceback(None)
+            elif now < entry.expires + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if now >= entry.expires:
+                    self._lookup(key)
+                return list(entry.addr_infos)
+            del self._entries[key]
+        self.misses += 1
+        # Shielded so a cancelled caller does not fail the others waiting
+        return list(await asyncio.shield(self._lookup(key)))
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        self._entries.clear()
+
+    def _lookup(self, key: _Key) -> "asyncio.Task[Sequence[AddrInfoType]]":
+        """Return the task looking up key, starting one if needed."""
+        if (task := self._lookups.get(key)) is None:
+            task = asyncio.ensure_future(self._resolve(*key))
+            task.add_done_callback(functools.partial(self._store, key))
+            self._lookups[key] = task
+        return task
+
+    async def _resolve(
+        self, host: str, port: int, family: int
+    ) -> Sequence[AddrInfoType]:
+        if (resolver := self._resolver) is None:
+            return await _getaddrinfo(asyncio.get_running_loop(), host, port, family)
+        return await resolver(host, port, family)
+
+    def _store(self, key: _Key, task: "asyncio.Task[Sequence[AddrInfoType]]") -> None:
+        """Cache the outcome of a lookup."""
+        del self._lookups[key]
+        if task.cancelled():
+            return
+        now = self._clock()
+        if (exc := task.exception()) is None:
+            entry = _Entry(now + self.ttl, task.result())
+        elif isinstance(exc, OSError) and key not in self._entries:
+            # A failed refresh keeps serving the stale addresses instead
+            entry = _Entry(now + self.negative_ttl, error=exc)
+        else:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
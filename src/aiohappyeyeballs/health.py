@@ -0,0 +1,140 @@
+"""Track the health of the address families across destinations."""
+
+import errno
+import time
+from collections.abc import Callable, Iterable
+
+from .types import AddrInfoType
+
+# Errors of the network rather than of the server
+_NETWORK_ERRNOS = frozenset(
+    (errno.ENETUNREACH, errno.EHOSTUNREACH, errno.EADDRNOTAVAIL, errno.ETIMEDOUT)
+)
+
+
+class _Health:
+    """The consecutive failures of one family and until when it is avoided."""
+
+    __slots__ = ("failures", "until")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.until = 0.0
+
+
+class FamilyHealth:
+    """
+    Lead with the healthy address family when the other one is broken.
+
+    On a network where IPv6 is configured but does not work, every
+    happy eyeballs race first spends an attempt and the happy eyeballs
+    delay on IPv6 before trying IPv4. The family health notices this
+    across all destinations: once *threshold* attempts of a family failed
+    in a row, without one of them connecting, the family is unhealthy
+    and ``sort`` moves its addresses after the ones of the healthy
+    family, so the race leads with the healthy family. The addresses of
+    the unhealthy family are still attempted when the others fail.
+
+    An attempt which failed with an error of the network, like
+    ``ENETUNREACH`` or ``ETIMEDOUT``, or was cancelled after running for
+    at least *timeout* seconds, usually because an attempt of the other
+    family won the race, counts as a failure. Errors of the server, like
+    ``ECONNREFUSED``, do not, as a host which publishes IPv6 addresses but
+    only listens on IPv4 says nothing about the other destinations. An
+    attempt which connected makes its family healthy again.
+
+    Every *reprobe_interval* seconds the next ``sort`` lets an unhealthy
+    family lead again, so a single connection notices when it recovered.
+
+    Use one family health for the whole process, passing it as
+    ``family_health`` to start_connection() or start_connection_by_host(),
+    which sort the addresses with it and record the outcome of every
+    attempt.
+    """
+
+    __slots__ = ("_clock", "_health", "reprobe_interval", "threshold", "timeout")
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        timeout: float = 0.25,
+        reprobe_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        self.threshold = threshold
+        self.timeout = timeout
+        self.reprobe_interval = reprobe_interval
+        self._clock = clock
+        self._health: dict[int, _Health] = {}
+
+    def is_healthy(self, family: int) -> bool:
+        """Return False if the family is avoided."""
+        health = self._health.get(family)
+        return (
+            health is None
+            or health.failures < self.threshold
+            or self._clock() >= health.until
+        )
+
+    def sort(self, addr_infos: Iterable[AddrInfoType]) -> list[AddrInfoType]:
+        """Return the addresses, the ones of unhealthy families last."""
+        addr_infos = list(addr_infos)
+        if not (unhealthy := self._unhealthy({addr[0] for addr in addr_infos})):
+            return addr_infos
+        # sorted() is stable, which keeps the order within each group
+        return sorted(addr_infos, key=lambda addr_info: addr_info[0] in unhealthy)
+
+    def prefer(self, families: Iterable[int]) -> list[int]:
+        """Return the families, the healthy ones first."""
+        families = list(families)
+        if not (unhealthy := self._unhealthy(set(families))):
+            return families
+        return sorted(families, key=lambda family: family in unhealthy)
+
+    def record_success(self, addr_info: AddrInfoType, rtt: float) -> None:
+        """Record an attempt which connected, making its family healthy."""
+        self._health.pop(addr_info[0], None)
+
+    def record_failure(
+        self, addr_info: AddrInfoType, exc: BaseException | None = None
+    ) -> None:
+        """Record an attempt which failed to connect, with exc if known."""
+        if exc is not None and not (
+            isinstance(exc, TimeoutError)
+            or (isinstance(exc, OSError) and exc.errno in _NETWORK_ERRNOS)
+        ):
+            # The server was reached, the family works
+            return
+        if (health := self._health.get(addr_info[0])) is None:
+            health = self._health[addr_info[0]] = _Health()
+        health.failures += 1
+        if health.failures >= self.threshold:
+            health.until = self._clock() + self.reprobe_interval
+
+    def record_cancel(self, addr_info: AddrInfoType, elapsed: float) -> None:
+        """Record an attempt cancelled after elapsed seconds."""
+        if elapsed >= self.timeout:
+            self.record_failure(addr_info)
+
+    def clear(self) -> None:
+        """Forget the failures of every family."""
+        self._health.clear()
+
+    def _unhealthy(self, families: set[int]) -> set[int]:
+        """Return the families to avoid, if another one is healthy."""
+        if len(families) < 2:
+            return set()
+        now = self._clock()
+        unhealthy: set[int] = set()
+        for family in families:
+            health = self._health.get(family)
+            if health is None or health.failures < self.threshold:
+                continue
+            if now < health.until:
+                unhealthy.add(family)
+            else:
+                # Probe it this time only, until the outcome is recorded
+                health.until = now + self.reprobe_interval
+        return unhealthy if len(unhealthy) < len(families) else set()
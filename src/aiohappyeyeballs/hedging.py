@@ -0,0 +1,178 @@
+"""Hedged calls for arbitrary coroutines."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+from typing import TypeVar
+
+from . import _staggered
+
+_T = TypeVar("_T")
+
+
+class HedgeBudget:
+    """
+    Limit the hedged attempts to a share of the calls made.
+
+    A hedge is allowed while the hedges made in the last *window* seconds
+    stay below *min_hedges* plus *ratio* times the calls made in the same
+    window, so ``ratio=0.1`` allows at most 10% extra attempts once the
+    call rate is high enough. *min_hedges* lets a low call rate still
+    hedge. The counts are kept for the current and the previous window,
+    the previous one weighted by how much of it still overlaps the last
+    *window* seconds.
+
+    A budget can be shared by any number of hedged calls.
+    """
+
+    __slots__ = (
+        "_calls",
+        "_clock",
+        "_hedges",
+        "_prev_calls",
+        "_prev_hedges",
+        "_start",
+        "min_hedges",
+        "ratio",
+        "window",
+    )
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        window: float = 10.0,
+        min_hedges: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.ratio = ratio
+        self.window = window
+        self.min_hedges = min_hedges
+        self._clock = clock
+        self._start = clock()
+        self._calls = 0
+        self._hedges = 0
+        self._prev_calls = 0
+        self._prev_hedges = 0
+
+    def _weight(self) -> float:
+        """Roll the windows forward, return the weight of the previous one."""
+        elapsed = self._clock() - self._start
+        if elapsed >= self.window:
+            if elapsed >= 2 * self.window:
+                self._prev_calls = self._prev_hedges = 0
+            else:
+                self._prev_calls = self._calls
+                self._prev_hedges = self._hedges
+            self._calls = self._hedges = 0
+            self._start += elapsed - elapsed % self.window
+            elapsed %= self.window
+        return 1 - elapsed / self.window
+
+    def record_call(self) -> None:
+        """Record a call, which earns the budget for ratio hedges."""
+        self._weight()
+        self._calls += 1
+
+    def try_hedge(self) -> bool:
+        """Take a hedge from the budget, return False if there is none left."""
+        weight = self._weight()
+        hedges = self._hedges + self._prev_hedges * weight
+        calls = self._calls + self._prev_calls * weight
+        if hedges >= self.min_hedges + self.ratio * calls:
+            return False
+        self._hedges += 1
+        return True
+
+
+class HedgedCallError(Exception):
+    """
+    Raised when every attempt of a hedged call failed.
+
+    The errors raised by the attempts are available as ``exceptions``.
+    """
+
+    def __init__(self, exceptions: list[BaseException]) -> None:
+        super().__init__(
+            "all {} attempts failed: {}".format(
+                len(exceptions), ", ".join(repr(exc) for exc in exceptions)
+            )
+        )
+        self.exceptions = exceptions
+
+
+async def hedged_call(
+    coro_fns: Iterable[Callable[[], Awaitable[_T]]],
+    delay: float | Sequence[float],
+    *,
+    budget: HedgeBudget | None = None,
+    on_late_result: Callable[[_T], object] | None = None,
+    timeout: float | None = None,
+    max_in_flight: int | None = None,
+    loop: asyncio.AbstractEventLoop | None = None,
+) -> _T:
+    """
+    Call coroutine functions, hedging the slow ones, and return the first result.
+
+    The first coroutine function is called right away. Whenever *delay*
+    seconds pass without a result, or the most recent attempt fails, the
+    next one is called, e.g. the same request against the next replica.
+    The first successful result is returned and the other attempts are
+    cancelled.
+
+    ``delay`` is either the delay before every hedge or a sequence of
+    delays before the first, second, ... hedge, the last one reused.
+
+    ``budget`` limits the extra attempts, shared by all the calls using
+    it. Once it runs out no further attempts are started and the call
+    waits for the ones already running.
+
+    ``on_late_result`` is called with every result returned by an attempt
+    other than the winning one, e.g. an attempt which completed just
+    before it was cancelled, so resources like connections are released.
+    If the call is cancelled, it is called with the winning result too.
+
+    ``timeout`` bounds the time of the whole call, raising ``TimeoutError``
+    once it runs out. ``max_in_flight`` bounds the number of attempts
+    running at the same time.
+
+    If every attempt fails, the exception of the only attempt or a
+    ``HedgedCallError`` with all of them is raised.
+    """
+    current_loop = loop or asyncio.get_running_loop()
+    deadline = None if timeout is None else current_loop.time() + timeout
+    if budget is not None:
+        budget.record_call()
+    race = _staggered.staggered_race(
+        _attempts(coro_fns, budget),
+        delay,
+        loop=current_loop,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        on_late_result=on_late_result,
+    )
+    winner, winner_index, exceptions = await race
+    if winner_index is not None:
+        return winner  # type: ignore[return-value]
+    errors = [exc for exc in exceptions if exc is not None]
+    if deadline is not None and current_loop.time() >= deadline:
+        raise TimeoutError(f"hedged call timed out after {timeout} seconds")
+    if not errors:
+        raise ValueError("coro_fns must not be empty")
+    if len(errors) == 1:
+        raise errors[0]
+    raise HedgedCallError(errors)
+
+
+def _attempts(
+    coro_fns: Iterable[Callable[[], Awaitable[_T]]],
+    budget: HedgeBudget | None,
+) -> Iterator[Callable[[], Awaitable[_T]]]:
+    """Yield the attempts of a hedged call as long as the budget allows."""
+    for index, coro_fn in enumerate(coro_fns):
+        if index and budget is not None and not budget.try_hedge():
+            return
+        yield coro_fn
@@ -0,0 +1,108 @@
+"""Connection history to order the addresses by how well they did."""
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from .types import AddrInfoType
+
+
+class _AddressStats:
+    """What is known about connecting to one address."""
+
+    __slots__ = ("failed", "srtt")
+
+    def __init__(self) -> None:
+        self.srtt: float | None = None
+        self.failed = False
+
+
+class ConnectionHistory:
+    """
+    Remember how connecting to each address went, to try the best first.
+
+    For every socket address the smoothed connect round trip time of the
+    attempts which succeeded is kept, like TCP does for its RTT estimate,
+    along with whether the last attempt failed. RFC 8305 recommends using
+    this history to order the addresses of a destination: ``sort`` puts
+    the addresses which connected first, fastest first, then the ones
+    without history in their original order, and the ones whose last
+    attempt failed last. The winner of the previous race, or whichever
+    address connected fastest, is thus attempted first next time.
+
+    The history of at most *max_size* addresses is kept, the least
+    recently used are forgotten first. *alpha* is the weight of a new
+    round trip time in the smoothed one.
+
+    Pass the history as ``history`` to start_connection(), which sorts the
+    addresses with it before interleaving them and records the outcome of
+    every attempt.
+    """
+
+    __slots__ = ("_stats", "alpha", "max_size")
+
+    def __init__(self, max_size: int = 1024, alpha: float = 0.125) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.max_size = max_size
+        self.alpha = alpha
+        self._stats: OrderedDict[tuple[Any, ...], _AddressStats] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of addresses with a history."""
+        return len(self._stats)
+
+    def rtt(self, addr_info: AddrInfoType) -> float | None:
+        """Return the smoothed connect time of the address, if known."""
+        stats = self._stats.get(addr_info[4])
+        return None if stats is None else stats.srtt
+
+    def sort(self, addr_infos: Iterable[AddrInfoType]) -> list[AddrInfoType]:
+        """Return the addresses, the most promising first."""
+        get = self._stats.get
+
+        def _key(addr_info: AddrInfoType) -> tuple[int, float]:
+            stats = get(addr_info[4])
+            if stats is None:
+                return (1, 0.0)
+            if stats.failed or stats.srtt is None:
+                return (2, 0.0)
+            return (0, stats.srtt)
+
+        # sorted() is stable, which keeps the order of equal addresses
+        return sorted(addr_infos, key=_key)
+
+    def record_success(self, addr_info: AddrInfoType, rtt: float) -> None:
+        """Record an attempt which connected in rtt seconds."""
+        stats = self._get(addr_info)
+        stats.failed = False
+        if stats.srtt is None:
+            stats.srtt = rtt
+        else:
+            stats.srtt += self.alpha * (rtt - stats.srtt)
+
+    def record_failure(
+        self, addr_info: AddrInfoType, exc: BaseException | None = None
+    ) -> None:
+        """Record an attempt which failed to connect."""
+        self._get(addr_info).failed = True
+
+    def record_cancel(self, addr_info: AddrInfoType, elapsed: float) -> None:
+        """Ignore an attempt which was cancelled before it finished."""
+
+    def clear(self) -> None:
+        """Forget the history of every address."""
+        self._stats.clear()
+
+    def _get(self, addr_info: AddrInfoType) -> _AddressStats:
+        """Return the stats of the address, creating them if needed."""
+        sockaddr = addr_info[4]
+        if (stats := self._stats.get(sockaddr)) is None:
+            stats = self._stats[sockaddr] = _AddressStats()
+            if len(self._stats) > self.max_size:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(sockaddr)
+        return stats
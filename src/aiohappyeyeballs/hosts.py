@@ -0,0 +1,131 @@
+"""Look up host names in the hosts file."""
+
+import asyncio
+import os
+import socket
+from collections.abc import Sequence
+
+from .types import AddrInfoType, ResolverType
+from .utils import _ip_address_family, addr_to_addr_infos
+
+# (family, address, scope id) of the entries of a name, in file order
+_Entries = dict[str, list[tuple[int, str, int]]]
+
+
+class HostsFile:
+    """
+    Resolve the names pinned in a hosts file before asking a resolver.
+
+    The file is parsed on first use and only parsed again once its
+    modification time changes, so a lookup costs a ``stat()`` and a dict
+    lookup. Names are matched case insensitively, with or without a
+    trailing dot.
+
+    ``lookup`` returns the addresses in the file in the shape of
+    addr_to_addr_infos(). As a ``ResolverType``, names which are not in
+    the file are resolved by *resolver*, by default ``loop.getaddrinfo()``,
+    so the hosts file can front e.g. a StubResolver. A name in the file
+    has no addresses of the families it is not pinned for, like with the
+    ``files`` source of NSS, so resolving it never waits for the resolver::
+
+        resolver = HostsFile(resolver=StubResolver())
+        sock = await start_connection_by_host("db.internal", 80, resolver=resolver)
+    """
+
+    __slots__ = ("_entries", "_mtime", "_resolver", "path")
+
+    def __init__(
+        self, path: str = "/etc/hosts", resolver: ResolverType | None = None
+    ) -> None:
+        self.path = path
+        self._resolver = resolver
+        self._entries: _Entries = {}
+        self._mtime: int | None = None
+
+    async def __call__(
+        self, host: str, port: int, family: int
+    ) -> Sequence[AddrInfoType]:
+        """Resolve host from the hosts file, or else with the resolver."""
+        self._reload()
+        if (entries := self._entries.get(_name_key(host))) is not None:
+            return _addr_infos(entries, port, family)
+        if self._resolver is not None:
+            return await self._resolver(host, port, family)
+        return await asyncio.get_running_loop().getaddrinfo(
+            host, port, family=family, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP
+        )
+
+    def lookup(
+        self, host: str, port: int, family: int = socket.AF_UNSPEC
+    ) -> list[AddrInfoType]:
+        """Return the addresses of host in the hosts file, if any."""
+        self._reload()
+        return _addr_infos(self._entries.get(_name_key(host), ()), port, family)
+
+    def _reload(self) -> None:
+        """Parse the file again if it changed since it was last parsed."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._entries = {}
+            self._mtime = None
+            return
+        if mtime != self._mtime:
+            self._entries = _parse_hosts(self.path)
+            self._mtime = mtime
+
+
+def _name_key(host: str) -> str:
+    """Return the name as it is looked up in the entries."""
+    return host.rstrip(".").lower()
+
+
+def _addr_infos(
+    entries: Sequence[tuple[int, str, int]], port: int, family: int
+) -> list[AddrInfoType]:
+    """Return the addresses of the entries of the family."""
+    addr_infos: list[AddrInfoType] = []
+    for entry_family, address, scope_id in entries:
+        if family not in (socket.AF_UNSPEC, entry_family):
+            continue
+        addr: tuple[str, int, int, int] | tuple[str, int] = (
+            (address, port, 0, scope_id)
+            if entry_family == socket.AF_INET6
+            else (address, port)
+        )
+        addr_infos.extend(addr_to_addr_infos(addr) or ())
+    return addr_infos
+
+
+def _parse_hosts(path: str) -> _Entries:
+    """Parse the address of every name in a hosts file."""
+    entries: _Entries = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return entries
+    for line in lines:
+        fields = line.split("#", 1)[0].split()
+        if len(fields) < 2:
+            continue
+        address, _, scope = fields[0].partition("%")
+        if (family := _ip_address_family(address)) is None:
+            continue
+        scope_id = 0
+        if scope:
+            if family != socket.AF_INET6:
+                continue
+            try:
+                scope_id = (
+                    int(scope) if scope.isdigit() else socket.if_nametoindex(scope)
+                )
+            except OSError:
+                # The interface does not exist
+                continue
+        entry = (family, address, scope_id)
+        for name in fields[1:]:
+            name_entries = entries.setdefault(_name_key(name), [])
+            if entry not in name_entries:
+                name_entries.append(entry)
+    return entries
@@ -2,24 +2,71 @@
 
 import asyncio
 import contextlib
+import errno
 import functools
 import itertools
 import socket
-from collections import defaultdict
-from collections.abc import Sequence
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import NoReturn, Protocol
 
 from . import _staggered
-from .types import AddrInfoType, SocketFactoryType
+from .backoff import AddressBackoff
+from .health import FamilyHealth
+from .history import ConnectionHistory
+from .rfc6724 import sort_by_rfc6724
+from .route import RouteProbe
+from .types import (
+    AddrInfoType,
+    HappyEyeballsDelayType,
+    ResolverType,
+    SocketFactoryType,
+)
+
+# Errors of the network rather than of the server, which every address of
+# the same family would most likely fail with as well
+_UNREACHABLE_ERRNOS = frozenset(
+    (errno.ENETUNREACH, errno.EHOSTUNREACH, errno.EADDRNOTAVAIL)
+)
+
+
+class StartConnectionTimeoutError(TimeoutError):
+    """
+    Raised when start_connection runs out of its overall timeout.
+
+    The errors raised by the attempts made before the timeout are
+    available as ``exceptions``.
+    """
+
+    def __init__(
+        self, timeout: float, exceptions: list[OSError | RuntimeError]
+    ) -> None:
+        msg = f"timed out after {timeout} seconds while connecting"
+        if exceptions:
+            msg += ": {}".format(", ".join(str(exc) for exc in exceptions))
+        super().__init__(errno.ETIMEDOUT, msg)
+        self.exceptions = exceptions
 
 
 async def start_connection(
     addr_infos: Sequence[AddrInfoType],
     *,
     local_addr_infos: Sequence[AddrInfoType] | None = None,
-    happy_eyeballs_delay: float | None = None,
+    happy_eyeballs_delay: HappyEyeballsDelayType | None = None,
     interleave: int | None = None,
     loop: asyncio.AbstractEventLoop | None = None,
     socket_factory: SocketFactoryType | None = None,
+    cancel_losers_in_background: bool = False,
+    max_in_flight: int | None = None,
+    timeout: float | None = None,
+    attempt_timeout: float | None = None,
+    use_timer_wheel: bool = False,
+    history: ConnectionHistory | None = None,
+    backoff: AddressBackoff | None = None,
+    family_health: FamilyHealth | None = None,
+    rfc6724: bool = False,
+    route_probe: RouteProbe | None = None,
+    skip_unreachable: bool = False,
 ) -> socket.socket:
     """
     Connect to a TCP server.
@@ -44,6 +91,68 @@ async def start_connection(
     in the background. When successful, the coroutine returns a
     socket.
 
+    ``happy_eyeballs_delay`` is either the delay between every attempt, a
+    sequence of delays (``happy_eyeballs_delay[0]`` before the second
+    attempt, ``[1]`` before the third and so on, reusing the last one) or
+    a callable ``happy_eyeballs_delay(attempt_index, addr_info)`` returning
+    the delay before starting the attempt at ``attempt_index`` of the
+    (interleaved) addresses, e.g. to use a short first fallback and longer
+    subsequent ones as recommended by RFC 8305.
+
+    When using happy eyeballs, ``cancel_losers_in_background=True`` returns
+    the winning socket as soon as it is connected instead of waiting for
+    the other attempts to be cancelled first. Their sockets are still
+    closed once the cancellation is processed in the background.
+
+    ``max_in_flight`` bounds how many happy eyeballs attempts can be
+    connecting at the same time. Once reached, the next attempt is only
+    started when one of the pending attempts fails, which keeps the number
+    of file descriptors and SYNs bounded when a destination is blackholed.
+
+    ``timeout`` bounds the total time spent connecting, over all attempts.
+    No attempt is started once it runs out, attempts still connecting are
+    cancelled and ``StartConnectionTimeoutError`` is raised with the errors
+    collected so far in its ``exceptions`` attribute.
+
+    ``attempt_timeout`` bounds the time a single attempt may spend
+    connecting, independent of the happy eyeballs delay. An attempt that
+    takes longer is abandoned with a ``TimeoutError`` and its socket is
+    closed, instead of waiting for the kernel to give up on it.
+
+    ``use_timer_wheel=True`` schedules the happy eyeballs timers on a timer
+    wheel shared by all connections on the loop, with millisecond
+    resolution, instead of scheduling one loop timer per attempt. This
+    saves scheduler work when many connections are started at once.
+
+    ``history`` is a ConnectionHistory used to try the addresses which
+    connected fastest before, and the ones which failed last, before
+    interleaving them. The outcome of every attempt is recorded in it.
+
+    ``backoff`` is an AddressBackoff used to move the addresses which
+    failed recently to the end, only retrying them once in a while. The
+    outcome of every attempt is recorded in it as well.
+
+    ``family_health`` is a FamilyHealth, shared by all connections, used to
+    lead with the healthy family when the attempts of the other family
+    keep failing or timing out, e.g. on a network with broken IPv6. The
+    outcome of every attempt is recorded in it as well.
+
+    ``rfc6724=True`` sorts the addresses by the destination address
+    selection of RFC 6724 before the history and the backoff do, see
+    sort_by_rfc6724(). This looks up the route to every address, and is
+    only needed when the addresses were not sorted by ``getaddrinfo()``.
+
+    ``route_probe`` is a RouteProbe used to drop the addresses the host has
+    no route to before anything else, so they do not take a place in the
+    race. It caches the routes per prefix, and is used for the route
+    lookups of ``rfc6724=True`` as well.
+
+    ``skip_unreachable=True`` skips the remaining addresses of a family once
+    an attempt failed with an error of the network rather than of the
+    server, ``ENETUNREACH``, ``EHOSTUNREACH`` or ``EADDRNOTAVAIL``, as they
+    would almost always fail the same way. A skipped address is recorded
+    as a failed attempt with the same errno.
+
     The expected use case is to use this method in conjunction with
     loop.create_connection() to establish a connection to a server::
 
@@ -55,9 +164,23 @@ async def start_connection(
         raise ValueError("addr_infos must not be empty")
 
     current_loop = loop or asyncio.get_running_loop()
+    deadline = None if timeout is None else current_loop.time() + timeout
 
     single_addr_info = len(addr_infos) == 1
 
+    if route_probe is not None and not single_addr_info:
+        addr_infos = route_probe.filter(addr_infos)
+        single_addr_info = len(addr_infos) == 1
+
+    if rfc6724 and not single_addr_info:
+        addr_infos = sort_by_rfc6724(
+            addr_infos, None if route_probe is None else route_probe.source_address
+        )
+
+    trackers = _trackers(history, backoff, family_health)
+    if trackers and not single_addr_info:
+        addr_infos = _sort_addr_infos(addr_infos, trackers)
+
     if happy_eyeballs_delay is not None and interleave is None:
         # If using happy eyeballs, default to interleave addresses by family
         interleave = 1
@@ -68,111 +191,585 @@ async def start_connection(
     sock: socket.socket | None = None
     # uvloop can raise RuntimeError instead of OSError
     exceptions: list[list[OSError | RuntimeError]] = []
+    connect = _attempt_factory(
+        current_loop,
+        exceptions,
+        local_addr_infos,
+        socket_factory,
+        attempt_timeout,
+        trackers,
+        skip_unreachable,
+    )
     if happy_eyeballs_delay is None or single_addr_info:
         # not using happy eyeballs
         for addrinfo in addr_infos:
+            if deadline is not None and current_loop.time() >= deadline:
+                break
             try:
-                sock = await _connect_sock(
-                    current_loop,
-                    exceptions,
-                    addrinfo,
-                    local_addr_infos,
-                    None,
-                    socket_factory,
-                )
+                if deadline is None:
+                    sock = await connect(addrinfo)
+                else:
+                    sock = await asyncio.wait_for(
+                        connect(addrinfo), deadline - current_loop.time()
+                    )
                 break
-            except (RuntimeError, OSError):
+            except (RuntimeError, OSError, asyncio.TimeoutError):
                 continue
     else:  # using happy eyeballs
-        open_sockets: set[socket.socket] = set()
-        try:
-            sock, _, _ = await _staggered.staggered_race(
-                (
-                    functools.partial(
-                        _connect_sock,
-                        current_loop,
-                        exceptions,
-                        addrinfo,
-                        local_addr_infos,
-                        open_sockets,
-                        socket_factory,
-                    )
-                    for addrinfo in addr_infos
-                ),
-                happy_eyeballs_delay,
+        if callable(happy_eyeballs_delay):
+            happy_eyeballs_delay = functools.partial(
+                _addr_info_delay, happy_eyeballs_delay, addr_infos
             )
+        race = _staggered.staggered_race(
+            (functools.partial(connect, addrinfo) for addrinfo in addr_infos),
+            happy_eyeballs_delay,
+            cancel_losers_in_background=cancel_losers_in_background,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            use_timer_wheel=use_timer_wheel,
+            # An attempt can connect just before it is cancelled, which
+            # leaves a "runner up" socket that has to be closed.
+            on_late_result=_close_socket,
+        )
+        sock, _, _ = await race
+
+    if sock is None:
+        try:
+            _raise_connect_error(current_loop, exceptions, timeout, deadline)
         finally:
-            # If we have a winner, staggered_race will
-            # cancel the other tasks, however there is a
-            # small race window where any of the other tasks
-            # can be done before they are cancelled which
-            # will leave the socket open. To avoid this problem
-            # we pass a set to _connect_sock to keep track of
-            # the open sockets and close them here if there
-            # are any "runner up" sockets.
-            for s in open_sockets:
-                if s is not sock:
-                    with contextlib.suppress(OSError):
-                        s.close()
-            open_sockets = None  # type: ignore[assignment]
+            exceptions = None  # type: ignore[assignment]
+
+    return sock
+
+
+async def start_connections(
+    addr_infos: Sequence[AddrInfoType],
+    count: int,
+    *,
+    local_addr_infos: Sequence[AddrInfoType] | None = None,
+    happy_eyeballs_delay: HappyEyeballsDelayType | None = None,
+    interleave: int | None = None,
+    loop: asyncio.AbstractEventLoop | None = None,
+    socket_factory: SocketFactoryType | None = None,
+    cancel_losers_in_background: bool = False,
+    max_in_flight: int | None = None,
+    timeout: float | None = None,
+    attempt_timeout: float | None = None,
+    use_timer_wheel: bool = False,
+) -> list[socket.socket]:
+    """
+    Connect several sockets to a TCP server in a single race.
+
+    This takes the same arguments as start_connection() plus the number
+    of sockets to connect, ``count``, and returns a list of connected
+    sockets, e.g. to fill a pool of parallel connections in about the
+    time it takes to connect one.
+
+    Every address is attempted ``count`` times in a row and every time
+    attempts are started, one is started for each socket still missing,
+    so all of them are connected to the first address that works. The
+    happy eyeballs delay (or the failure of the previous attempts, when
+    not using happy eyeballs) moves on to the next address. A callable
+    ``happy_eyeballs_delay`` sees every attempt, each address is repeated
+    ``count`` times in its ``attempt_index``.
+
+    Once ``count`` sockets are connected, the remaining attempts are
+    cancelled and any extra sockets are closed. Fewer sockets are
+    returned if the addresses run out or the ``timeout`` is reached
+    first, the error is only raised if no socket could be connected.
+    """
+    if not addr_infos:
+        raise ValueError("addr_infos must not be empty")
+
+    current_loop = loop or asyncio.get_running_loop()
+    deadline = None if timeout is None else current_loop.time() + timeout
+
+    if happy_eyeballs_delay is not None and interleave is None:
+        # If using happy eyeballs, default to interleave addresses by family
+        interleave = 1
+
+    if interleave and len(addr_infos) > 1:
+        addr_infos = _interleave_addrinfos(addr_infos, interleave)
+
+    candidates = [addrinfo for addrinfo in addr_infos for _ in range(count)]
+    if callable(happy_eyeballs_delay):
+        happy_eyeballs_delay = functools.partial(
+            _addr_info_delay, happy_eyeballs_delay, candidates
+        )
+
+    # uvloop can raise RuntimeError instead of OSError
+    exceptions: list[list[OSError | RuntimeError]] = []
+    connect = _attempt_factory(
+        current_loop,
+        exceptions,
+        local_addr_infos,
+        socket_factory,
+        attempt_timeout,
+        (),
+    )
+    winners, _ = await _staggered.staggered_race_many(
+        (functools.partial(connect, addrinfo) for addrinfo in candidates),
+        happy_eyeballs_delay,
+        count,
+        cancel_losers_in_background=cancel_losers_in_background,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        use_timer_wheel=use_timer_wheel,
+        # Close the sockets which connected after enough others did
+        on_late_result=_close_socket,
+    )
+    socks = [sock for sock, _ in winners]
+
+    if not socks:
+        try:
+            _raise_connect_error(current_loop, exceptions, timeout, deadline)
+        finally:
+            exceptions = None  # type: ignore[assignment]
+
+    return socks
+
+
+async def start_connection_by_host(
+    host: str,
+    port: int,
+    *,
+    resolver: ResolverType | None = None,
+    family: int = socket.AF_UNSPEC,
+    resolution_delay: float = 0.05,
+    local_addr_infos: Sequence[AddrInfoType] | None = None,
+    happy_eyeballs_delay: float | Sequence[float] | None = 0.25,
+    interleave: int = 1,
+    loop: asyncio.AbstractEventLoop | None = None,
+    socket_factory: SocketFactoryType | None = None,
+    cancel_losers_in_background: bool = False,
+    max_in_flight: int | None = None,
+    timeout: float | None = None,
+    attempt_timeout: float | None = None,
+    use_timer_wheel: bool = False,
+    history: ConnectionHistory | None = None,
+    backoff: AddressBackoff | None = None,
+    family_health: FamilyHealth | None = None,
+    skip_unreachable: bool = False,
+) -> socket.socket:
+    """
+    Resolve a host name and connect to it, racing resolution and connection.
+
+    Instead of resolving every address of the host before connecting,
+    the IPv6 (AAAA) and IPv4 (A) addresses are looked up concurrently
+    and the connection attempts start as soon as addresses are known,
+    as described in RFC 8305:
+
+    * IPv6 addresses are used as soon as they are resolved.
+    * IPv4 addresses resolved first are held back for up to
+        ``resolution_delay`` seconds, giving the IPv6 lookup a chance to
+        complete, and then used without waiting for it any longer.
+    * Addresses resolved while attempts are already running join the
+        race, interleaved by family with the addresses not attempted yet.
+
+    ``resolver(host, port, family)`` looks up the addresses of one family,
+    by default with ``loop.getaddrinfo()``. ``family`` restricts the lookup
+    to a single address family.
+
+    ``happy_eyeballs_delay`` is the delay between the attempts, or a
+    sequence of delays as for start_connection(). With ``None`` the next
+    attempt only starts once the previous one failed. ``interleave`` is the
+    number of addresses of the first family to attempt before alternating.
+    The other arguments are the same as for start_connection(), and
+    ``timeout`` covers the resolution as well. With a ``history`` or a
+    ``backoff`` the addresses of each family are sorted as they are
+    resolved. While IPv6 is unhealthy in the ``family_health`` the roles
+    of the families are swapped, leading with IPv4 and holding back the
+    IPv6 addresses instead.
+
+    If no address could be resolved the resolution error is raised,
+    otherwise the errors of the connection attempts as for
+    start_connection().
+    """
+    current_loop = loop or asyncio.get_running_loop()
+    deadline = None if timeout is None else current_loop.time() + timeout
+    if resolver is None:
+        resolver = functools.partial(_getaddrinfo, current_loop)
+    families: Sequence[int] = (
+        (socket.AF_INET6, socket.AF_INET) if family == socket.AF_UNSPEC else (family,)
+    )
+    if family_health is not None:
+        families = family_health.prefer(families)
+    # The addresses of the family to lead with are not held back
+    preferred = families[0]
+
+    # uvloop can raise RuntimeError instead of OSError
+    exceptions: list[list[OSError | RuntimeError]] = []
+    resolve_errors: list[BaseException] = []
+    trackers = _trackers(history, backoff, family_health)
+    queue = _AddrInfoQueue(
+        _attempt_factory(
+            current_loop,
+            exceptions,
+            local_addr_infos,
+            socket_factory,
+            attempt_timeout,
+            trackers,
+            skip_unreachable,
+        ),
+        interleave,
+        trackers,
+    )
+    lookups: dict[asyncio.Future[Sequence[AddrInfoType]], int] = {
+        asyncio.ensure_future(
+            resolver(host, port, lookup_family), loop=current_loop
+        ): lookup_family
+        for lookup_family in families
+    }
+    # Addresses waiting for the preferred lookup or the resolution delay
+    held_back: list[AddrInfoType] = []
+    release_timer: asyncio.TimerHandle | None = None
+
+    def _release() -> None:
+        nonlocal release_timer
+        release_timer = None
+        queue.add(held_back)
+        held_back.clear()
+
+    def _on_resolved(task: "asyncio.Future[Sequence[AddrInfoType]]") -> None:
+        nonlocal release_timer
+        lookup_family = lookups.pop(task)
+        if task.cancelled():
+            return
+        if (exc := task.exception()) is not None:
+            resolve_errors.append(exc)
+        elif lookup_family != preferred and preferred in lookups.values():
+            held_back.extend(task.result())
+            if release_timer is None:
+                release_timer = current_loop.call_later(resolution_delay, _release)
+        else:
+            queue.add(task.result())
+        if preferred not in lookups.values():
+            if release_timer is not None:
+                release_timer.cancel()
+            _release()
+        if not lookups:
+            queue.close()
+
+    for task in lookups:
+        task.add_done_callback(_on_resolved)
+
+    try:
+        race = _staggered.staggered_race(
+            queue,
+            happy_eyeballs_delay,
+            loop=current_loop,
+            cancel_losers_in_background=cancel_losers_in_background,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            use_timer_wheel=use_timer_wheel,
+            on_late_result=_close_socket,
+        )
+        sock, _, _ = await race
+    finally:
+        if release_timer is not None:
+            release_timer.cancel()
+        if pending := list(lookups):
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending)
 
     if sock is None:
-        all_exceptions = [exc for sub in exceptions for exc in sub]
         try:
-            first_exception = all_exceptions[0]
-            if len(all_exceptions) == 1:
+            if not queue.resolved and (
+                deadline is None or current_loop.time() < deadline
+            ):
+                _raise_resolve_error(current_loop, host, resolve_errors, timeout)
+            _raise_connect_error(current_loop, exceptions, timeout, deadline)
+        finally:
+            exceptions = resolve_errors = None  # type: ignore[assignment]
+
+    return sock
+
+
+def _raise_connect_error(
+    loop: asyncio.AbstractEventLoop,
+    exceptions: list[list[OSError | RuntimeError]],
+    timeout: float | None,
+    deadline: float | None,
+) -> NoReturn:
+    """Raise the error for connection attempts which all failed."""
+    all_exceptions = [exc for sub in exceptions for exc in sub]
+    try:
+        # Attempts cut off by the deadline do not record an error, so
+        # having none at all also means we ran out of time.
+        if (
+            timeout is not None
+            and deadline is not None
+            and (loop.time() >= deadline or not all_exceptions)
+        ):
+            raise StartConnectionTimeoutError(timeout, all_exceptions)
+        first_exception = all_exceptions[0]
+        if len(all_exceptions) == 1:
+            raise first_exception
+        else:
+            # If they all have the same str(), raise one.
+            model = str(first_exception)
+            if all(str(exc) == model for exc in all_exceptions):
                 raise first_exception
-            else:
-                # If they all have the same str(), raise one.
-                model = str(first_exception)
-                if all(str(exc) == model for exc in all_exceptions):
-                    raise first_exception
-                # Raise a combined exception so the user can see all
-                # the various error messages.
-                msg = "Multiple exceptions: {}".format(
-                    ", ".join(str(exc) for exc in all_exceptions)
-                )
-                # If the errno is the same for all exceptions, raise
-                # an OSError with that errno.
-                if isinstance(first_exception, OSError):
-                    first_errno = first_exception.errno
-                    if all(
-                        isinstance(exc, OSError) and exc.errno == first_errno
-                        for exc in all_exceptions
-                    ):
-                        raise OSError(first_errno, msg)
-                elif isinstance(first_exception, RuntimeError) and all(
-                    isinstance(exc, RuntimeError) for exc in all_exceptions
+            # Raise a combined exception so the user can see all
+            # the various error messages.
+            msg = "Multiple exceptions: {}".format(
+                ", ".join(str(exc) for exc in all_exceptions)
+            )
+            # If the errno is the same for all exceptions, raise
+            # an OSError with that errno.
+            if isinstance(first_exception, OSError):
+                first_errno = first_exception.errno
+                if all(
+                    isinstance(exc, OSError) and exc.errno == first_errno
+                    for exc in all_exceptions
                 ):
-                    raise RuntimeError(msg)
-                # We have a mix of OSError and RuntimeError
-                # so we have to pick which one to raise.
-                # and we raise OSError for compatibility
-                raise OSError(msg)
-        finally:
-            all_exceptions = None  # type: ignore[assignment]
-            exceptions = None  # type: ignore[assignment]
+                    raise OSError(first_errno, msg)
+            elif isinstance(first_exception, RuntimeError) and all(
+                isinstance(exc, RuntimeError) for exc in all_exceptions
+            ):
+                raise RuntimeError(msg)
+            # We have a mix of OSError and RuntimeError
+            # so we have to pick which one to raise.
+            # and we raise OSError for compatibility
+            raise OSError(msg)
+    finally:
+        all_exceptions = None  # type: ignore[assignment]
+        exceptions = None  # type: ignore[assignment]
+
+
+def _raise_resolve_error(
+    loop: asyncio.AbstractEventLoop,
+    host: str,
+    errors: list[BaseException],
+    timeout: float | None,
+) -> NoReturn:
+    """Raise the error for a host that did not resolve to any address."""
+    if not errors:
+        raise OSError(f"could not resolve {host!r} to any address")
+    for exc in errors:
+        if not isinstance(exc, (OSError, RuntimeError)):
+            # Not a resolution failure but a bug, do not hide it
+            raise exc
+    _raise_connect_error(loop, [errors], timeout, None)  # type: ignore[list-item]
+
+
+async def _getaddrinfo(
+    loop: asyncio.AbstractEventLoop, host: str, port: int, family: int
+) -> Sequence[AddrInfoType]:
+    """Resolve the TCP addresses of one family with loop.getaddrinfo()."""
+    return await loop.getaddrinfo(
+        host, port, family=family, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP
+    )
+
+
+class _AddrInfoQueue(_staggered.CandidateQueue[socket.socket]):
+    """
+    Connection attempts to the addresses of a host as they are resolved.
+
+    The addresses are kept by family and only picked when the race starts
+    the next attempt, so addresses resolved late are still interleaved
+    with the ones which were resolved first.
+    """
+
+    __slots__ = (
+        "_by_family",
+        "_connect",
+        "_first_left",
+        "_last_family",
+        "_trackers",
+        "resolved",
+    )
+
+    def __init__(
+        self,
+        connect: Callable[[AddrInfoType], Awaitable[socket.socket]],
+        interleave: int,
+        trackers: Sequence["_AttemptTracker"] = (),
+    ) -> None:
+        super().__init__()
+        self._connect = connect
+        self._trackers = trackers
+        self._by_family: dict[int, deque[AddrInfoType]] = {}
+        self._first_left = max(interleave, 1)
+        self._last_family: int | None = None
+        self.resolved = 0
+
+    def __len__(self) -> int:
+        """Return the number of addresses not attempted yet."""
+        return sum(len(addr_infos) for addr_infos in self._by_family.values())
 
+    def add(self, addr_infos: Sequence[AddrInfoType]) -> None:
+        """Add resolved addresses to attempt."""
+        if not addr_infos:
+            return
+        if self._trackers:
+            addr_infos = _sort_addr_infos(addr_infos, self._trackers)
+        for addr_info in addr_infos:
+            self._by_family.setdefault(addr_info[0], deque()).append(addr_info)
+        self.resolved += len(addr_infos)
+        self._wakeup()
+
+    def _take(self) -> Callable[[], Awaitable[socket.socket]] | None:
+        """Return the attempt for the next address, interleaving families."""
+        families = [family for family, left in self._by_family.items() if left]
+        if not families:
+            return None
+        last_family = self._last_family
+        if last_family is None:
+            family = families[0]
+            self._first_left -= 1
+        elif self._first_left and last_family in families:
+            # The first family gets interleave attempts in a row
+            family = last_family
+            self._first_left -= 1
+        else:
+            self._first_left = 0
+            family = next((f for f in families if f != last_family), families[0])
+        self._last_family = family
+        return functools.partial(self._connect, self._by_family[family].popleft())
+
+
+class _AttemptTracker(Protocol):
+    """Orders the addresses by what it learned from past attempts."""
+
+    def sort(self, addr_infos: Iterable[AddrInfoType]) -> list[AddrInfoType]:
+        """Return the addresses, the most promising first."""
+
+    def record_success(self, addr_info: AddrInfoType, rtt: float) -> None:
+        """Record an attempt which connected in rtt seconds."""
+
+    def record_failure(
+        self, addr_info: AddrInfoType, exc: BaseException | None = None
+    ) -> None:
+        """Record an attempt which failed to connect with exc."""
+
+    def record_cancel(self, addr_info: AddrInfoType, elapsed: float) -> None:
+        """Record an attempt cancelled after elapsed seconds."""
+
+
+def _trackers(
+    history: ConnectionHistory | None,
+    backoff: AddressBackoff | None,
+    family_health: FamilyHealth | None,
+) -> list[_AttemptTracker]:
+    """Return the trackers in use, in the order they sort the addresses."""
+    # The backoff sorts after the history, so its demotions override it,
+    # and the family health last, as it only decides the leading family
+    return [
+        tracker for tracker in (history, backoff, family_health) if tracker is not None
+    ]
+
+
+def _sort_addr_infos(
+    addr_infos: Iterable[AddrInfoType], trackers: Sequence[_AttemptTracker]
+) -> list[AddrInfoType]:
+    """Sort the addresses with every tracker, the last one deciding most."""
+    sorted_addr_infos = list(addr_infos)
+    for tracker in trackers:
+        sorted_addr_infos = tracker.sort(sorted_addr_infos)
+    return sorted_addr_infos
+
+
+def _attempt_factory(
+    loop: asyncio.AbstractEventLoop,
+    exceptions: list[list[OSError | RuntimeError]],
+    local_addr_infos: Sequence[AddrInfoType] | None,
+    socket_factory: SocketFactoryType | None,
+    attempt_timeout: float | None,
+    trackers: Sequence[_AttemptTracker],
+    skip_unreachable: bool = False,
+) -> Callable[[AddrInfoType], Awaitable[socket.socket]]:
+    """Return a function making a connection attempt to an address."""
+    connect = functools.partial(
+        _connect_sock,
+        loop,
+        exceptions,
+        local_addr_infos=local_addr_infos,
+        socket_factory=socket_factory,
+        attempt_timeout=attempt_timeout,
+    )
+    if trackers:
+        connect = functools.partial(_record_attempt, loop, trackers, connect)
+    if skip_unreachable:
+        # The skipped attempts are not recorded in the trackers
+        unreachable: dict[int, OSError] = {}
+        connect = functools.partial(_skip_unreachable, exceptions, unreachable, connect)
+    return connect
+
+
+async def _record_attempt(
+    loop: asyncio.AbstractEventLoop,
+    trackers: Sequence[_AttemptTracker],
+    connect: Callable[[AddrInfoType], Awaitable[socket.socket]],
+    addr_info: AddrInfoType,
+) -> socket.socket:
+    """Make a connection attempt, recording its outcome in the trackers."""
+    start = loop.time()
+    try:
+        sock = await connect(addr_info)
+    except (OSError, RuntimeError) as exc:
+        for tracker in trackers:
+            tracker.record_failure(addr_info, exc)
+        raise
+    except asyncio.CancelledError:
+        # Usually because another attempt won the race
+        elapsed = loop.time() - start
+        for tracker in trackers:
+            tracker.record_cancel(addr_info, elapsed)
+        raise
+    rtt = loop.time() - start
+    for tracker in trackers:
+        tracker.record_success(addr_info, rtt)
     return sock
 
 
+async def _skip_unreachable(
+    exceptions: list[list[OSError | RuntimeError]],
+    unreachable: dict[int, OSError],
+    connect: Callable[[AddrInfoType], Awaitable[socket.socket]],
+    addr_info: AddrInfoType,
+) -> socket.socket:
+    """Make a connection attempt, unless its family is unreachable."""
+    family = addr_info[0]
+    if (reason := unreachable.get(family)) is not None:
+        # Failing right away starts the next attempt without a delay
+        exc = OSError(
+            reason.errno,
+            f"skipped connecting to address {addr_info[4]!r}: "
+            f"{(reason.strerror or '').lower()}",
+        )
+        exceptions.append([exc])
+        raise exc
+    try:
+        return await connect(addr_info)
+    except OSError as exc:
+        if exc.errno in _UNREACHABLE_ERRNOS:
+            unreachable.setdefault(family, exc)
+        raise
+
+
+def _close_socket(sock: socket.socket) -> None:
+    """Close a socket which connected after the race was decided."""
+    with contextlib.suppress(OSError):
+        sock.close()
+
+
 async def _connect_sock(
     loop: asyncio.AbstractEventLoop,
     exceptions: list[list[OSError | RuntimeError]],
     addr_info: AddrInfoType,
     local_addr_infos: Sequence[AddrInfoType] | None = None,
-    open_sockets: set[socket.socket] | None = None,
     socket_factory: SocketFactoryType | None = None,
+    attempt_timeout: float | None = None,
 ) -> socket.socket:
     """
     Create, bind and connect one socket.
 
-    If open_sockets is passed, add the socket to the set of open sockets.
-    Any failure caught here will remove the socket from the set and close it.
+    If attempt_timeout is passed, connecting is abandoned with a
+    TimeoutError once it takes longer than attempt_timeout seconds.
 
-    Callers can use this set to close any sockets that are not the winner
-    of all staggered tasks in the result there are runner up sockets aka
-    multiple winners.
+    Any failure caught here closes the socket.
     """
     my_exceptions: list[OSError | RuntimeError] = []
     exceptions.append(my_exceptions)
@@ -183,8 +780,6 @@ async def _connect_sock(
             sock = socket_factory(addr_info)
         else:
             sock = socket.socket(family=family, type=type_, proto=proto)
-        if open_sockets is not None:
-            open_sockets.add(sock)
         sock.setblocking(False)
         if local_addr_infos is not None:
             for lfamily, _, _, _, laddr in local_addr_infos:
@@ -207,14 +802,28 @@ async def _connect_sock(
                     raise my_exceptions.pop()
                 else:
                     raise OSError(f"no matching local address with {family=} found")
-        await loop.sock_connect(sock, address)
+        if attempt_timeout is None:
+            await loop.sock_connect(sock, address)
+        else:
+            try:
+                await asyncio.wait_for(
+                    loop.sock_connect(sock, address), attempt_timeout
+                )
+            except asyncio.TimeoutError as exc:
+                # On Python 3.11+ this also catches an ETIMEDOUT OSError
+                # from the kernel which should be raised unchanged.
+                if getattr(exc, "errno", None) is not None:
+                    raise
+                raise TimeoutError(
+                    errno.ETIMEDOUT,
+                    f"timed out after {attempt_timeout} seconds "
+                    f"connecting to {address!r}",
+                ) from None
         return sock
     except BaseException as exc:
         if isinstance(exc, (RuntimeError, OSError)):
             my_exceptions.append(exc)
         if sock is not None:
-            if open_sockets is not None:
-                open_sockets.remove(sock)
             try:
                 sock.close()
             except OSError as e:
@@ -225,6 +834,18 @@ async def _connect_sock(
         exceptions = my_exceptions = None  # type: ignore[assignment]
 
 
+def _addr_info_delay(
+    delay_fn: Callable[[int, AddrInfoType], float | None],
+    addr_infos: Sequence[AddrInfoType],
+    index: int,
+) -> float | None:
+    """Return the delay before the attempt at index of addr_infos."""
+    if index >= len(addr_infos):
+        # There is no attempt left to delay
+        return None
+    return delay_fn(index, addr_infos[index])
+
+
 def _interleave_addrinfos(
     addrinfos: Sequence[AddrInfoType], first_address_family_count: int = 1
 ) -> list[AddrInfoType]:
@@ -0,0 +1,244 @@
+"""A pool of connected sockets kept warm for each destination."""
+
+import asyncio
+import contextlib
+import socket
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+from .impl import start_connection
+from .types import AddrInfoType
+
+_Key = tuple[tuple[AddrInfoType, ...], tuple[AddrInfoType, ...] | None]
+
+
+class _Destination:
+    """The idle sockets of one destination, the most recent last."""
+
+    __slots__ = (
+        "addr_infos",
+        "error",
+        "filler",
+        "idle",
+        "key",
+        "local_addr_infos",
+        "timer",
+    )
+
+    def __init__(
+        self,
+        key: _Key,
+        addr_infos: Sequence[AddrInfoType],
+        local_addr_infos: Sequence[AddrInfoType] | None,
+    ) -> None:
+        self.key = key
+        self.addr_infos = addr_infos
+        self.local_addr_infos = local_addr_infos
+        # (expires, socket) pairs, in the order they connected
+        self.idle: deque[tuple[float, socket.socket]] = deque()
+        self.filler: asyncio.Task[None] | None = None
+        # Why the filler last gave up, until it runs again
+        self.error: OSError | RuntimeError | None = None
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class WarmPool:
+    """
+    Keep connected sockets ready for each destination.
+
+    A destination is a list of addresses, as passed to start_connection(),
+    together with the local addresses to bind to. ``acquire`` hands out an
+    idle socket of the destination if there is one, which makes getting a
+    socket a pop instead of a happy eyeballs race, and otherwise connects
+    as usual. Every ``acquire`` then connects new sockets in the background
+    until *size* of them are idle again, one race at a time.
+
+    Before a socket is handed out, a non-blocking ``recv()`` with
+    ``MSG_PEEK`` checks that the server did not close it or reset it while
+    it was idle, without consuming what the server sent. A socket idle for
+    *idle_timeout* seconds is closed and not replaced, so a destination only
+    stays warm while it is used, and its sockets are not kept around long
+    enough for the server to drop them as idle. If connecting in the
+    background fails, the pool stops filling the destination until the
+    next ``acquire``, while ``warm`` raises the error if it could not
+    connect any socket.
+
+    The other keyword arguments are passed to start_connection(), e.g.
+    ``happy_eyeballs_delay``::
+
+        pool = WarmPool(size=2, happy_eyeballs_delay=0.25)
+        await pool.warm(addr_infos)
+        sock = await pool.acquire(addr_infos)
+        ...
+        await pool.close()
+    """
+
+    __slots__ = ("_connect_kwargs", "_destinations", "idle_timeout", "size")
+
+    def __init__(
+        self, size: int = 1, *, idle_timeout: float = 30.0, **connect_kwargs: Any
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._connect_kwargs = connect_kwargs
+        self._destinations: dict[_Key, _Destination] = {}
+
+    def __len__(self) -> int:
+        """Return the number of idle sockets of every destination."""
+        return sum(len(dest.idle) for dest in self._destinations.values())
+
+    async def __aenter__(self) -> "WarmPool":
+        """Return the pool."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the pool."""
+        await self.close()
+
+    async def acquire(
+        self,
+        addr_infos: Sequence[AddrInfoType],
+        local_addr_infos: Sequence[AddrInfoType] | None = None,
+    ) -> socket.socket:
+        """
+        Return a connected socket to the destination.
+
+        The socket belongs to the caller, the pool forgets about it.
+        """
+        dest = self._destination(addr_infos, local_addr_infos)
+        loop = asyncio.get_running_loop()
+        sock = None
+        while dest.idle:
+            expires, candidate = dest.idle.pop()
+            if loop.time() < expires and _is_alive(candidate):
+                sock = candidate
+                break
+            _close(candidate)
+        self._fill(loop, dest)
+        if sock is None:
+            sock = await start_connection(
+                addr_infos, local_addr_infos=local_addr_infos, **self._connect_kwargs
+            )
+        return sock
+
+    async def warm(
+        self,
+        addr_infos: Sequence[AddrInfoType],
+        local_addr_infos: Sequence[AddrInfoType] | None = None,
+    ) -> None:
+        """
+        Connect the idle sockets of the destination before it is used.
+
+        The error of connecting is raised if no socket is idle.
+        """
+        dest = self._destination(addr_infos, local_addr_infos)
+        filler = self._fill(asyncio.get_running_loop(), dest)
+        if filler is not None:
+            await asyncio.shield(filler)
+        if not dest.idle and (error := dest.error) is not None:
+            raise error
+
+    async def close(self) -> None:
+        """Close every idle socket and stop connecting new ones."""
+        destinations = list(self._destinations.values())
+        self._destinations.clear()
+        fillers = []
+        for dest in destinations:
+            if dest.timer is not None:
+                dest.timer.cancel()
+            if dest.filler is not None:
+                dest.filler.cancel()
+                fillers.append(dest.filler)
+        # The fillers close the sockets they were connecting
+        await asyncio.gather(*fillers, return_exceptions=True)
+        for dest in destinations:
+            while dest.idle:
+                _close(dest.idle.pop()[1])
+
+    def _destination(
+        self,
+        addr_infos: Sequence[AddrInfoType],
+        local_addr_infos: Sequence[AddrInfoType] | None,
+    ) -> _Destination:
+        """Return the destination, creating it if needed."""
+        if not addr_infos:
+            raise ValueError("addr_infos must not be empty")
+        key = (
+            tuple(addr_infos),
+            None if local_addr_infos is None else tuple(local_addr_infos),
+        )
+        if (dest := self._destinations.get(key)) is None:
+            dest = self._destinations[key] = _Destination(
+                key, addr_infos, local_addr_infos
+            )
+        return dest
+
+    def _fill(
+        self, loop: asyncio.AbstractEventLoop, dest: _Destination
+    ) -> asyncio.Task[None] | None:
+        """Start connecting idle sockets of the destination, if needed."""
+        if dest.filler is None and len(dest.idle) < self.size:
+            dest.filler = loop.create_task(self._run_filler(loop, dest))
+        return dest.filler
+
+    async def _run_filler(
+        self, loop: asyncio.AbstractEventLoop, dest: _Destination
+    ) -> None:
+        """Connect sockets until the destination has enough idle ones."""
+        dest.error = None
+        try:
+            while len(dest.idle) < self.size:
+                try:
+                    sock = await start_connection(
+                        dest.addr_infos,
+                        local_addr_infos=dest.local_addr_infos,
+                        **self._connect_kwargs,
+                    )
+                except (OSError, RuntimeError) as exc:
+                    # Connecting is tried again on the next acquire()
+                    dest.error = exc
+                    return
+                dest.idle.append((loop.time() + self.idle_timeout, sock))
+                if dest.timer is None:
+                    dest.timer = loop.call_at(dest.idle[0][0], self._expire, loop, dest)
+        finally:
+            dest.filler = None
+            self._forget_unused(dest)
+
+    def _expire(self, loop: asyncio.AbstractEventLoop, dest: _Destination) -> None:
+        """Close the sockets of the destination which were idle for too long."""
+        dest.timer = None
+        now = loop.time()
+        while dest.idle and dest.idle[0][0] <= now:
+            _close(dest.idle.popleft()[1])
+        if dest.idle:
+            dest.timer = loop.call_at(dest.idle[0][0], self._expire, loop, dest)
+        self._forget_unused(dest)
+
+    def _forget_unused(self, dest: _Destination) -> None:
+        """Forget the destination once it has nothing idle or pending."""
+        if not dest.idle and dest.filler is None and dest.timer is None:
+            if self._destinations.get(dest.key) is dest:
+                del self._destinations[dest.key]
+
+
+def _is_alive(sock: socket.socket) -> bool:
+    """Return True if the peer did not close or reset the idle socket."""
+    try:
+        # The socket is non-blocking, so this does not wait for data
+        data = sock.recv(1, socket.MSG_PEEK)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    # An empty read is the end of the stream, data is left in the socket
+    return bool(data)
+
+
+def _close(sock: socket.socket) -> None:
+    """Close an idle socket."""
+    with contextlib.suppress(OSError):
+        sock.close()
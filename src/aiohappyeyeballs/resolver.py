@@ -0,0 +1,351 @@
+"""A DNS stub resolver running on the event loop."""
+
+import asyncio
+import secrets
+import socket
+import struct
+from collections.abc import Sequence
+
+from .types import AddrInfoType
+from .utils import _ip_address_family
+
+_HEADER = struct.Struct("!HHHHHH")
+_RR = struct.Struct("!HHIH")
+_QTYPE_A = 1
+_QTYPE_AAAA = 28
+_QCLASS_IN = 1
+_FLAG_QR = 0x8000
+_FLAG_TC = 0x0200
+_FLAG_RD = 0x0100
+_RCODE_NOERROR = 0
+_RCODE_NXDOMAIN = 3
+_MAX_POINTERS = 64
+
+_QTYPES: dict[int, int] = {socket.AF_INET: _QTYPE_A, socket.AF_INET6: _QTYPE_AAAA}
+_EAI_NODATA = getattr(socket, "EAI_NODATA", socket.EAI_NONAME)
+
+
+class _ServerFailure(Exception):
+    """A nameserver did not answer the query, another one may."""
+
+
+class _ResolvConf:
+    """The settings read from resolv.conf, with the defaults of glibc."""
+
+    __slots__ = ("attempts", "nameservers", "ndots", "search", "timeout")
+
+    def __init__(self) -> None:
+        self.nameservers = ["127.0.0.1"]
+        self.search: list[str] = []
+        self.ndots = 1
+        self.timeout = 5.0
+        self.attempts = 2
+
+
+class StubResolver:
+    """
+    Resolve host names with DNS queries made on the event loop.
+
+    Unlike ``loop.getaddrinfo()``, which blocks a thread of the default
+    executor for every lookup, the queries are sent by the event loop
+    itself, so many lookups can run at once without an executor. The
+    queries go over UDP and are retried over TCP when the answer is
+    truncated.
+
+    The nameservers, the search domains and the ``ndots``, ``timeout``
+    and ``attempts`` options are read from *resolv_conf* unless they are
+    passed. Every attempt asks the nameservers in turn and waits *timeout*
+    seconds for each. ``/etc/hosts`` is not consulted, a HostsFile in
+    front of the resolver takes care of it.
+
+    The resolver is a ``ResolverType`` for start_connection_by_host(), and
+    can be cached by a ResolutionCache::
+
+        resolver = StubResolver()
+        sock = await start_connection_by_host("example.org", 80, resolver=resolver)
+        cache = ResolutionCache(resolver)
+    """
+
+    __slots__ = ("attempts", "nameservers", "ndots", "port", "search", "timeout")
+
+    def __init__(
+        self,
+        nameservers: Sequence[str] | None = None,
+        *,
+        port: int = 53,
+        search: Sequence[str] | None = None,
+        ndots: int | None = None,
+        timeout: float | None = None,
+        attempts: int | None = None,
+        resolv_conf: str = "/etc/resolv.conf",
+    ) -> None:
+        if any(
+            value is None for value in (nameservers, search, ndots, timeout, attempts)
+        ):
+            conf = _parse_resolv_conf(resolv_conf)
+        else:
+            conf = _ResolvConf()
+        self.nameservers = list(
+            conf.nameservers if nameservers is None else nameservers
+        )
+        self.port = port
+        self.search = list(conf.search if search is None else search)
+        self.ndots = conf.ndots if ndots is None else ndots
+        self.timeout = conf.timeout if timeout is None else timeout
+        self.attempts = conf.attempts if attempts is None else attempts
+
+    async def __call__(
+        self, host: str, port: int, family: int
+    ) -> Sequence[AddrInfoType]:
+        """Resolve the stream addresses of one family, as a resolver."""
+        return await self.resolve(host, port, family)
+
+    async def resolve(
+        self,
+        host: str,
+        port: int,
+        family: int = socket.AF_UNSPEC,
+        type: int = socket.SOCK_STREAM,
+    ) -> list[AddrInfoType]:
+        """
+        Return the addresses of host in the shape of getaddrinfo().
+
+        With ``AF_UNSPEC`` the AAAA and A records are queried concurrently
+        and the IPv6 addresses come first. ``socket.gaierror`` is raised if
+        the host has no address.
+        """
+        proto = socket.IPPROTO_UDP if type == socket.SOCK_DGRAM else socket.IPPROTO_TCP
+        if (literal := _ip_address_family(host)) is not None:
+            if family not in (socket.AF_UNSPEC, literal):
+                raise socket.gaierror(socket.EAI_FAMILY, "ai_family not supported")
+            families = [literal]
+            answers: list[list[str] | BaseException] = [[host]]
+        else:
+            families = (
+                [socket.AF_INET6, socket.AF_INET]
+                if family == socket.AF_UNSPEC
+                else [family]
+            )
+            if any(fam not in _QTYPES for fam in families):
+                raise socket.gaierror(socket.EAI_FAMILY, "ai_family not supported")
+            answers = await asyncio.gather(
+                *(self._lookup(host, _QTYPES[fam]) for fam in families),
+                return_exceptions=True,
+            )
+        addr_infos: list[AddrInfoType] = []
+        error: BaseException | None = None
+        for fam, answer in zip(families, answers, strict=True):
+            if isinstance(answer, BaseException):
+                if not isinstance(answer, socket.gaierror):
+                    raise answer
+                # Only raised if the other family has no address either
+                error = answer
+                continue
+            for address in answer:
+                sockaddr: tuple[str, int] | tuple[str, int, int, int] = (
+                    (address, port, 0, 0) if fam == socket.AF_INET6 else (address, port)
+                )
+                addr_infos.append((fam, type, proto, "", sockaddr))
+        if error is not None and not addr_infos:
+            raise error
+        return addr_infos
+
+    async def _lookup(self, host: str, qtype: int) -> list[str]:
+        """Query the addresses of host, trying the search domains."""
+        no_data = False
+        for name in self._names(host):
+            try:
+                qname = _encode_name(name)
+            except UnicodeError:
+                continue
+            rcode, addresses = await self._query(qname, qtype)
+            if addresses:
+                return addresses
+            no_data = no_data or rcode != _RCODE_NXDOMAIN
+        if no_data:
+            raise socket.gaierror(_EAI_NODATA, "No address associated with hostname")
+        raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+    def _names(self, host: str) -> list[str]:
+        """Return the names to query for host, in order."""
+        if host.endswith("."):
+            return [host[:-1]]
+        searched = [f"{host}.{domain.strip('.')}" for domain in self.search]
+        if host.count(".") >= self.ndots:
+            return [host, *searched]
+        return [*searched, host]
+
+    async def _query(self, qname: bytes, qtype: int) -> tuple[int, list[str]]:
+        """Send a query to the nameservers until one of them answers."""
+        for _ in range(self.attempts):
+            for nameserver in self.nameservers:
+                qid = secrets.randbits(16)
+                query = _HEADER.pack(qid, _FLAG_RD, 1, 0, 0, 0) + qname
+                query += struct.pack("!HH", qtype, _QCLASS_IN)
+                try:
+                    response = await asyncio.wait_for(
+                        _exchange((nameserver, self.port), query), self.timeout
+                    )
+                    return _parse_response(response, qid, qname, qtype)
+                except (OSError, asyncio.TimeoutError, _ServerFailure):
+                    continue
+        raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """Receive the first response to a query."""
+
+    def __init__(self, query: bytes) -> None:
+        self.response: asyncio.Future[bytes] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._query_id = query[:2]
+
+    def datagram_received(self, data: bytes, addr: tuple[str | int, ...]) -> None:
+        # Drop anything that is not a response to the query
+        if data[:2] == self._query_id and not self.response.done():
+            self.response.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.response.done():
+            self.response.set_exception(exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if not self.response.done():
+            self.response.set_exception(exc or ConnectionError("connection lost"))
+
+
+async def _exchange(server: tuple[str, int], query: bytes) -> bytes:
+    """Send a query over UDP, retrying over TCP if the response is truncated."""
+    response = await _udp_query(server, query)
+    if len(response) >= _HEADER.size and _HEADER.unpack_from(response)[1] & _FLAG_TC:
+        response = await _tcp_query(server, query)
+    return response
+
+
+async def _udp_query(server: tuple[str, int], query: bytes) -> bytes:
+    """Send a query over UDP and return the response."""
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _DatagramProtocol(query), remote_addr=server
+    )
+    try:
+        transport.sendto(query)
+        return await protocol.response
+    finally:
+        transport.close()
+
+
+async def _tcp_query(server: tuple[str, int], query: bytes) -> bytes:
+    """Send a query over TCP and return the response."""
+    reader, writer = await asyncio.open_connection(*server)
+    try:
+        writer.write(struct.pack("!H", len(query)) + query)
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError as exc:
+        raise ConnectionError("incomplete response") from exc
+    finally:
+        writer.close()
+
+
+def _parse_response(
+    response: bytes, qid: int, qname: bytes, qtype: int
+) -> tuple[int, list[str]]:
+    """Return the response code and the addresses answered for qtype."""
+    try:
+        rid, flags, qdcount, ancount, _, _ = _HEADER.unpack_from(response)
+        if rid != qid or not flags & _FLAG_QR or qdcount != 1:
+            raise _ServerFailure("not a response to the query")
+        offset = _HEADER.size
+        name, offset = _read_name(response, offset)
+        if name.lower() != qname.lower() or struct.unpack_from(
+            "!HH", response, offset
+        ) != (qtype, _QCLASS_IN):
+            raise _ServerFailure("response to another question")
+        offset += 4
+        rcode = flags & 0xF
+        if rcode not in (_RCODE_NOERROR, _RCODE_NXDOMAIN):
+            raise _ServerFailure(f"server failure, rcode {rcode}")
+        family = socket.AF_INET6 if qtype == _QTYPE_AAAA else socket.AF_INET
+        size = 16 if qtype == _QTYPE_AAAA else 4
+        addresses = []
+        for _ in range(ancount):
+            _, offset = _read_name(response, offset)
+            rtype, rclass, _, rdlength = _RR.unpack_from(response, offset)
+            offset += _RR.size
+            rdata = response[offset : offset + rdlength]
+            offset += rdlength
+            # The answer may start with the CNAME chain to the address
+            if rtype == qtype and rclass == _QCLASS_IN and len(rdata) == size:
+                addresses.append(socket.inet_ntop(family, rdata))
+    except (struct.error, IndexError) as exc:
+        raise _ServerFailure("malformed response") from exc
+    return rcode, addresses
+
+
+def _read_name(data: bytes, offset: int) -> tuple[bytes, int]:
+    """Read a possibly compressed name, return it and the offset after it."""
+    labels: list[bytes] = []
+    end = None
+    pointers = 0
+    while length := data[offset]:
+        if length & 0xC0 == 0xC0:
+            if (pointers := pointers + 1) > _MAX_POINTERS:
+                raise _ServerFailure("too many compression pointers")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        labels.append(data[offset + 1 : offset + 1 + length])
+        offset += 1 + length
+    name = b"".join(bytes((len(label),)) + label for label in labels) + b"\0"
+    return name, end if end is not None else offset + 1
+
+
+def _encode_name(name: str) -> bytes:
+    """Encode a host name in the wire format of DNS."""
+    encoded = b""
+    for label in name.encode("idna").split(b"."):
+        if not label or len(label) > 63:
+            raise UnicodeError(f"invalid label in {name!r}")
+        encoded += bytes((len(label),)) + label
+    return encoded + b"\0"
+
+
+def _parse_resolv_conf(path: str) -> _ResolvConf:
+    """Read the nameservers, search domains and options of resolv.conf."""
+    conf = _ResolvConf()
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return conf
+    nameservers: list[str] = []
+    for line in lines:
+        fields = line.split("#", 1)[0].split(";", 1)[0].split()
+        if len(fields) < 2:
+            continue
+        keyword, values = fields[0], fields[1:]
+        if keyword == "nameserver":
+            # Scoped addresses like fe80::1%eth0 are not supported
+            if _ip_address_family(values[0]) is not None:
+                nameservers.append(values[0])
+        elif keyword in ("search", "domain"):
+            # The last one of them wins
+            conf.search = values
+        elif keyword == "options":
+            for option in values:
+                name, _, value = option.partition(":")
+                if not value.isdigit():
+                    continue
+                if name == "ndots":
+                    conf.ndots = int(value)
+                elif name == "attempts":
+                    conf.attempts = max(int(value), 1)
+                elif name == "timeout":
+                    conf.timeout = float(value)
+    if nameservers:
+        # Like glibc, only the first three nameservers are used
+        conf.nameservers = nameservers[:3]
+    return conf
@@ -0,0 +1,179 @@
+"""Destination address selection as described in RFC 6724."""
+
+import functools
+import ipaddress
+import socket
+from collections.abc import Callable, Iterable
+
+from .types import AddrInfoType
+
+# The default policy table of RFC 6724 section 2.1, longest prefix first
+_POLICY_TABLE = sorted(
+    (
+        (ipaddress.IPv6Network(prefix), precedence, label)
+        for prefix, precedence, label in (
+            ("::1/128", 50, 0),
+            ("::/0", 40, 1),
+            ("::ffff:0:0/96", 35, 4),
+            ("2002::/16", 30, 2),
+            ("2001::/32", 5, 5),
+            ("fc00::/7", 3, 13),
+            ("::/96", 1, 3),
+            ("fec0::/10", 1, 11),
+            ("3ffe::/16", 1, 12),
+        )
+    ),
+    key=lambda entry: entry[0].prefixlen,
+    reverse=True,
+)
+
+_SCOPE_LINK_LOCAL = 0x2
+_SCOPE_SITE_LOCAL = 0x5
+_SCOPE_GLOBAL = 0xE
+
+
+class _Destination:
+    """What the rules need to know about a destination and its source."""
+
+    __slots__ = (
+        "label_match",
+        "precedence",
+        "prefix_len",
+        "scope",
+        "scope_match",
+        "usable",
+    )
+
+    def __init__(self, addr_info: AddrInfoType, source: str | None) -> None:
+        dest = _ipv6(addr_info[4][0])
+        src = None if source is None else _ipv6(source)
+        self.usable = dest is not None and src is not None
+        self.precedence, label = _policy(dest)
+        self.scope = _scope(dest)
+        self.scope_match = self.usable and _scope(src) == self.scope
+        self.label_match = self.usable and _policy(src)[1] == label
+        self.prefix_len: int | None = None
+        if (
+            dest is not None
+            and src is not None
+            and dest.ipv4_mapped is None
+            and src.ipv4_mapped is None
+        ):
+            # Only compared between IPv6 destinations, like glibc and Go do,
+            # and at most up to the length of the usual IPv6 subnet prefix
+            self.prefix_len = min(_common_prefix_len(src, dest), 64)
+
+
+def sort_by_rfc6724(
+    addr_infos: Iterable[AddrInfoType],
+    source_address: Callable[[AddrInfoType], str | None] | None = None,
+) -> list[AddrInfoType]:
+    """
+    Sort the addresses by the destination address selection of RFC 6724.
+
+    ``getaddrinfo()`` normally returns the addresses in this order, but
+    not for addresses from other sources, e.g. service discovery, or with
+    an unusual ``gai.conf``. The rules of section 6 that apply without
+    knowing the state of the local addresses are used, in order:
+
+    1. Avoid destinations without a source address to reach them.
+    2. Prefer destinations in the same scope as their source address.
+    5. Prefer destinations with the same label as their source address.
+    6. Prefer destinations with a higher precedence, e.g. global IPv6
+       and IPv4 over unique local IPv6 addresses.
+    8. Prefer destinations with a smaller scope.
+    9. Prefer the IPv6 destination sharing the longest prefix with its
+       source address.
+
+    Addresses which are equal by all the rules keep their order.
+
+    ``source_address(addr_info)`` returns the local address the kernel
+    would use to reach the destination, or None if it has no route. By
+    default this connects an unsent UDP socket to the destination, which
+    only looks up the route.
+    """
+    lookup = source_address or udp_source_address
+    destinations = [
+        (_Destination(addr_info, lookup(addr_info)), addr_info)
+        for addr_info in addr_infos
+    ]
+    destinations.sort(key=functools.cmp_to_key(_compare))
+    return [addr_info for _, addr_info in destinations]
+
+
+def udp_source_address(addr_info: AddrInfoType) -> str | None:
+    """Return the source address the kernel picks for the destination."""
+    family, _, _, _, sockaddr = addr_info
+    try:
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            # Connecting a UDP socket looks up the route, it sends nothing
+            sock.connect(sockaddr)
+            source: str = sock.getsockname()[0]
+    except OSError:
+        return None
+    return source
+
+
+def _compare(
+    entry_a: tuple[_Destination, AddrInfoType],
+    entry_b: tuple[_Destination, AddrInfoType],
+) -> int:
+    """Compare two destinations, negative if the first one is preferred."""
+    a, b = entry_a[0], entry_b[0]
+    # Rules 1, 2 and 5: prefer True, so compare b with a
+    for attr in ("usable", "scope_match", "label_match"):
+        if (result := int(getattr(b, attr)) - int(getattr(a, attr))) != 0:
+            return result
+    # Rule 6: prefer the higher precedence
+    if a.precedence != b.precedence:
+        return b.precedence - a.precedence
+    # Rule 8: prefer the smaller scope
+    if a.scope != b.scope:
+        return a.scope - b.scope
+    # Rule 9: prefer the longest matching prefix
+    if a.prefix_len is not None and b.prefix_len is not None:
+        return b.prefix_len - a.prefix_len
+    return 0
+
+
+def _ipv6(address: str) -> ipaddress.IPv6Address | None:
+    """Return the address as IPv6, mapping IPv4 addresses into it."""
+    try:
+        ip = ipaddress.ip_address(address.partition("%")[0])
+    except ValueError:
+        return None
+    if isinstance(ip, ipaddress.IPv4Address):
+        return ipaddress.IPv6Address(b"\0" * 10 + b"\xff\xff" + ip.packed)
+    return ip
+
+
+def _policy(ip: ipaddress.IPv6Address | None) -> tuple[int, int]:
+    """Return the precedence and the label of the address."""
+    if ip is not None:
+        for network, precedence, label in _POLICY_TABLE:
+            if ip in network:
+                return precedence, label
+    return 0, -1
+
+
+def _scope(ip: ipaddress.IPv6Address | None) -> int:
+    """Return the scope of the address as defined in RFC 6724 section 3.1."""
+    if ip is None:
+        return _SCOPE_GLOBAL
+    if (ipv4 := ip.ipv4_mapped) is not None:
+        # RFC 6724 section 3.2
+        if ipv4.is_loopback or ipv4.is_link_local:
+            return _SCOPE_LINK_LOCAL
+        return _SCOPE_GLOBAL
+    if ip.is_multicast:
+        return ip.packed[1] & 0xF
+    if ip.is_loopback or ip.is_link_local:
+        return _SCOPE_LINK_LOCAL
+    if ip.is_site_local:
+        return _SCOPE_SITE_LOCAL
+    return _SCOPE_GLOBAL
+
+
+def _common_prefix_len(a: ipaddress.IPv6Address, b: ipaddress.IPv6Address) -> int:
+    """Return the number of leading bits the addresses have in common."""
+    return 128 - (int(a) ^ int(b)).bit_length()
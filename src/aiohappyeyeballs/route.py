@@ -0,0 +1,113 @@
+"""Probe the routes to the addresses before connecting to them."""
+
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from .rfc6724 import udp_source_address
+from .types import AddrInfoType
+
+
+class RouteProbe:
+    """
+    Skip the addresses the host has no route or no source address for.
+
+    Whether an address can be reached at all is otherwise only known
+    once ``sock_connect()`` fails, after the attempt took its place in
+    the race. ``source_address`` asks the kernel for the route with an
+    unsent, connected UDP socket, which returns the source address it
+    would use, or None without a route. The answer is cached for *ttl*
+    seconds per destination prefix of *ipv4_prefix_len* or
+    *ipv6_prefix_len* bits, as the addresses of a network share a route,
+    for at most *max_size* prefixes.
+
+    ``filter`` drops the addresses without a route. If none of them has
+    one, they are all kept, so the attempts still fail with the error of
+    the kernel.
+
+    Pass the probe as ``route_probe`` to start_connection(), which filters
+    the addresses with it before sorting and interleaving them.
+    """
+
+    __slots__ = (
+        "_clock",
+        "_probe",
+        "_routes",
+        "ipv4_prefix_len",
+        "ipv6_prefix_len",
+        "max_size",
+        "ttl",
+    )
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        ipv4_prefix_len: int = 24,
+        ipv6_prefix_len: int = 64,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        probe: Callable[[AddrInfoType], str | None] = udp_source_address,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.ttl = ttl
+        self.ipv4_prefix_len = ipv4_prefix_len
+        self.ipv6_prefix_len = ipv6_prefix_len
+        self.max_size = max_size
+        self._clock = clock
+        self._probe = probe
+        self._routes: OrderedDict[tuple[Any, ...], tuple[float, str | None]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of cached prefixes."""
+        return len(self._routes)
+
+    def source_address(self, addr_info: AddrInfoType) -> str | None:
+        """Return the source address to reach the address, None if none."""
+        if (key := self._key(addr_info)) is None:
+            return self._probe(addr_info)
+        now = self._clock()
+        if (cached := self._routes.get(key)) is not None and now < cached[0]:
+            self._routes.move_to_end(key)
+            return cached[1]
+        source = self._probe(addr_info)
+        self._routes[key] = (now + self.ttl, source)
+        self._routes.move_to_end(key)
+        if len(self._routes) > self.max_size:
+            self._routes.popitem(last=False)
+        return source
+
+    def is_routable(self, addr_info: AddrInfoType) -> bool:
+        """Return True if the host has a route to the address."""
+        return self.source_address(addr_info) is not None
+
+    def filter(self, addr_infos: Iterable[AddrInfoType]) -> list[AddrInfoType]:
+        """Return the addresses with a route, or all if none has one."""
+        addr_infos = list(addr_infos)
+        return [
+            addr_info for addr_info in addr_infos if self.is_routable(addr_info)
+        ] or addr_infos
+
+    def clear(self) -> None:
+        """Forget every cached route, e.g. after the network changed."""
+        self._routes.clear()
+
+    def _key(self, addr_info: AddrInfoType) -> tuple[Any, ...] | None:
+        """Return the cache key of the prefix of the address."""
+        family, _, _, _, sockaddr = addr_info
+        prefix_len = (
+            self.ipv6_prefix_len if family == socket.AF_INET6 else self.ipv4_prefix_len
+        )
+        try:
+            network = ipaddress.ip_network(
+                (sockaddr[0].partition("%")[0], prefix_len), strict=False
+            )
+        except ValueError:
+            return None
+        # The route to a scoped address depends on its interface
+        return (network, sockaddr[3] if family == socket.AF_INET6 else 0)
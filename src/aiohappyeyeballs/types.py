@@ -1,7 +1,7 @@
 """Types for aiohappyeyeballs."""
 
 import socket
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Sequence
 
 AddrInfoType = tuple[
     int | socket.AddressFamily,
@@ -12,3 +12,10 @@ AddrInfoType = tuple[
 ]
 
 SocketFactoryType = Callable[[AddrInfoType], socket.socket]
+
+HappyEyeballsDelayType = (
+    float | Sequence[float] | Callable[[int, AddrInfoType], float | None]
+)
+
+# Resolve (host, port, family) to the addresses to connect to
+ResolverType = Callable[[str, int, int], Awaitable[Sequence[AddrInfoType]]]
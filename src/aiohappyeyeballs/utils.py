@@ -60,6 +60,17 @@ def _addr_tuple_to_ip_address(
     return (ipaddress.ip_address(addr[0]), *addr[1:])
 
 
+def _ip_address_family(host: str) -> int | None:
+    """Return the family of host if it is an IP address, None otherwise."""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+        except OSError:
+            continue
+        return family
+    return None
+
+
 def remove_addr_infos(
     addr_infos: list[AddrInfoType],
     addr: tuple[str, int] | tuple[str, int, int, int],
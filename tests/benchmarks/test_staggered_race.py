@@ -0,0 +1,118 @@
+"""
+CodSpeed benchmarks for ``_staggered.staggered_race``.
+
+Large anycast/CDN answer sets hand ``start_connection`` 16-64 candidates, so
+the race is measured across growing candidate counts. Each attempt registers
+one done callback for its whole lifetime, so the cost per completed attempt
+should stay flat as the number of candidates grows instead of growing with
+the number of attempts still pending.
+
+With many races running at once most stagger timers are cancelled before
+they fire, which is measured with timers on the loop and on the shared
+timer wheel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+
+from aiohappyeyeballs._staggered import staggered_race
+
+try:
+    from pytest_codspeed import BenchmarkFixture
+except ImportError:  # pragma: no cover - only when pytest-codspeed is absent
+    pytestmark = pytest.mark.skip("pytest-codspeed not installed")
+
+RACE_SIZES = [4, 16, 64]
+RACE_SIZE_IDS = ["4_candidates", "16_candidates", "64_candidates"]
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    try:
+        yield loop
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("n", RACE_SIZES, ids=RACE_SIZE_IDS)
+def test_staggered_race_sequential_failures(
+    benchmark: BenchmarkFixture, loop: asyncio.AbstractEventLoop, n: int
+) -> None:
+    """Every candidate but the last fails, each failure starts the next one."""
+
+    async def fail() -> int:
+        raise OSError("unreachable")
+
+    async def succeed() -> int:
+        return 1
+
+    coro_fns: list[Callable[[], Awaitable[int]]] = [*[fail] * (n - 1), succeed]
+
+    winner, index, excs = loop.run_until_complete(staggered_race(coro_fns, None))
+    assert (winner, index, len(excs)) == (1, n - 1, n)
+
+    @benchmark
+    def run() -> None:
+        loop.run_until_complete(staggered_race(coro_fns, None))
+
+
+@pytest.mark.parametrize("n", RACE_SIZES, ids=RACE_SIZE_IDS)
+def test_staggered_race_pending_then_last_wins(
+    benchmark: BenchmarkFixture, loop: asyncio.AbstractEventLoop, n: int
+) -> None:
+    """All candidates stay pending until the last one started wins."""
+
+    async def hang() -> int:
+        await asyncio.sleep(3600)
+        return 0  # pragma: no cover
+
+    async def succeed() -> int:
+        return 1
+
+    coro_fns: list[Callable[[], Awaitable[int]]] = [*[hang] * (n - 1), succeed]
+
+    winner, index, excs = loop.run_until_complete(staggered_race(coro_fns, 1e-9))
+    assert (winner, index, len(excs)) == (1, n - 1, n)
+
+    @benchmark
+    def run() -> None:
+        loop.run_until_complete(staggered_race(coro_fns, 1e-9))
+
+
+@pytest.mark.parametrize(
+    "use_timer_wheel", [False, True], ids=["loop_timers", "timer_wheel"]
+)
+def test_staggered_race_concurrent_races(
+    benchmark: BenchmarkFixture, loop: asyncio.AbstractEventLoop, use_timer_wheel: bool
+) -> None:
+    """Many races at once, each arming a stagger timer that never fires."""
+
+    async def succeed() -> int:
+        await asyncio.sleep(0)
+        return 1
+
+    async def hang() -> int:
+        await asyncio.sleep(3600)  # pragma: no cover
+        return 0  # pragma: no cover
+
+    coro_fns: list[Callable[[], Awaitable[int]]] = [succeed, hang]
+
+    async def races() -> None:
+        results = await asyncio.gather(
+            *(
+                staggered_race(coro_fns, 0.25, use_timer_wheel=use_timer_wheel)
+                for _ in range(1000)
+            )
+        )
+        assert all(index == 0 for _, index, _ in results)
+
+    loop.run_until_complete(races())
+
+    @benchmark
+    def run() -> None:
+        loop.run_until_complete(races())
@@ -2,6 +2,7 @@
 
 import asyncio
 import reprlib
+import socket
 import threading
 from asyncio.events import AbstractEventLoop, TimerHandle
 from collections.abc import Generator
@@ -9,6 +10,34 @@ from contextlib import contextmanager
 
 import pytest
 
+IPV6_1 = (
+    socket.AF_INET6,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("dead::1", 80, 0, 0),
+)
+IPV6_2 = (
+    socket.AF_INET6,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("dead::2", 80, 0, 0),
+)
+IPV4_1 = (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("10.0.0.1", 80))
+IPV4_2 = (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("10.0.0.2", 80))
+IPV4_3 = (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("10.0.0.3", 80))
+
+
+class FakeClock:
+    """A clock which only moves when the test sets ``now``."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
 
 @pytest.fixture(autouse=True)
 def verify_threads_ended() -> Generator[None, None, None]:
@@ -0,0 +1,68 @@
+import pytest
+
+from aiohappyeyeballs import AddressBackoff
+
+from .conftest import IPV4_1, IPV4_2, IPV4_3, FakeClock
+
+
+def test_failed_addresses_go_last():
+    """Test addresses are demoted while they are backed off from."""
+    clock = FakeClock()
+    backoff = AddressBackoff(initial=1, clock=clock)
+    backoff.record_failure(IPV4_1)
+    assert backoff.is_bad(IPV4_1)
+    assert not backoff.is_bad(IPV4_2)
+    assert backoff.sort([IPV4_1, IPV4_2, IPV4_3]) == [IPV4_2, IPV4_3, IPV4_1]
+    backoff.record_success(IPV4_1, 0.1)
+    assert not backoff.is_bad(IPV4_1)
+    assert backoff.sort([IPV4_1, IPV4_2, IPV4_3]) == [IPV4_1, IPV4_2, IPV4_3]
+    assert len(backoff) == 0
+
+
+def test_exponential_backoff():
+    """Test the backoff doubles with every failure up to the maximum."""
+    clock = FakeClock()
+    backoff = AddressBackoff(initial=1, maximum=5, clock=clock)
+    for expected in (1, 2, 4, 5, 5):
+        backoff.record_failure(IPV4_1)
+        clock.now += expected - 0.01
+        assert backoff.is_bad(IPV4_1)
+        clock.now += 0.01
+        assert not backoff.is_bad(IPV4_1)
+    for _ in range(2000):
+        backoff.record_failure(IPV4_1)
+    assert backoff.is_bad(IPV4_1)
+
+
+def test_single_retry_after_backoff():
+    """Test a single sort retries the address once its backoff expired."""
+    clock = FakeClock()
+    backoff = AddressBackoff(initial=1, clock=clock)
+    backoff.record_failure(IPV4_1)
+    clock.now = 1
+    assert backoff.sort([IPV4_1, IPV4_2]) == [IPV4_1, IPV4_2]
+    assert backoff.sort([IPV4_1, IPV4_2]) == [IPV4_2, IPV4_1]
+    # The retry failed as well, backing off for longer
+    backoff.record_failure(IPV4_1)
+    clock.now = 2.5
+    assert backoff.is_bad(IPV4_1)
+
+
+def test_max_size():
+    """Test the least recently failed addresses are forgotten first."""
+    backoff = AddressBackoff(max_size=2)
+    backoff.record_failure(IPV4_1)
+    backoff.record_failure(IPV4_2)
+    backoff.record_failure(IPV4_1)
+    backoff.record_failure(IPV4_3)
+    assert len(backoff) == 2
+    assert not backoff.is_bad(IPV4_2)
+    assert backoff.is_bad(IPV4_1)
+    backoff.clear()
+    assert len(backoff) == 0
+
+
+def test_validation():
+    """Test max_size must be at least 1."""
+    with pytest.raises(ValueError, match="max_size must be at least 1"):
+        AddressBackoff(max_size=0)
@@ -0,0 +1,222 @@
+import asyncio
+import socket
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from aiohappyeyeballs import HostsFile, ResolutionCache, start_connection_by_host
+
+from .conftest import FakeClock
+
+ADDR_INFO = (
+    socket.AF_INET,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("107.6.106.82", 80),
+)
+OTHER_ADDR_INFO = (
+    socket.AF_INET,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("107.6.106.83", 80),
+)
+
+
+class FakeResolver:
+    def __init__(self, *answers: object) -> None:
+        self.answers = list(answers)
+        self.calls: list[tuple[str, int, int]] = []
+
+    async def __call__(self, host, port, family):
+        self.calls.append((host, port, family))
+        await asyncio.sleep(0)
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, BaseException):
+            raise answer
+        return answer
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss():
+    """Test answers are cached per key and counted."""
+    resolver = FakeResolver([ADDR_INFO])
+    cache = ResolutionCache(resolver)
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+    assert await cache.resolve("example.org", 80, socket.AF_INET) == [ADDR_INFO]
+    assert resolver.calls == [
+        ("example.org", 80, socket.AF_UNSPEC),
+        ("example.org", 80, socket.AF_INET),
+    ]
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_shared():
+    """Test concurrent misses of a key share a single lookup."""
+    resolver = FakeResolver([ADDR_INFO])
+    cache = ResolutionCache(resolver)
+    results = await asyncio.gather(
+        *(cache.resolve("example.org", 80) for _ in range(3))
+    )
+    assert results == [[ADDR_INFO]] * 3
+    assert len(resolver.calls) == 1
+    assert cache.misses == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_fail_others():
+    """Test a cancelled caller leaves the shared lookup running."""
+    resolver = FakeResolver([ADDR_INFO])
+    cache = ResolutionCache(resolver)
+    first = asyncio.create_task(cache.resolve("example.org", 80))
+    second = asyncio.create_task(cache.resolve("example.org", 80))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == [ADDR_INFO]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_expiry_and_stale_while_revalidate():
+    """Test stale answers are returned while they are refreshed."""
+    clock = FakeClock()
+    resolver = FakeResolver([ADDR_INFO], [OTHER_ADDR_INFO])
+    cache = ResolutionCache(resolver, ttl=10, stale_ttl=5, clock=clock)
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+    clock.now = 12
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+    await asyncio.sleep(0.01)
+    assert len(resolver.calls) == 2
+    assert await cache.resolve("example.org", 80) == [OTHER_ADDR_INFO]
+    assert (cache.hits, cache.misses) == (2, 1)
+    # Past the stale window the lookup is waited for
+    clock.now = 40
+    assert await cache.resolve("example.org", 80) == [OTHER_ADDR_INFO]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_answer():
+    """Test a failed refresh keeps the stale answer until it runs out."""
+    clock = FakeClock()
+    error = socket.gaierror(socket.EAI_AGAIN, "Temporary failure")
+    resolver = FakeResolver([ADDR_INFO], error)
+    cache = ResolutionCache(resolver, ttl=10, stale_ttl=5, clock=clock)
+    await cache.resolve("example.org", 80)
+    clock.now = 11
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+    await asyncio.sleep(0.01)
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+    await asyncio.sleep(0.01)
+    clock.now = 16
+    with pytest.raises(socket.gaierror):
+        await cache.resolve("example.org", 80)
+
+
+@pytest.mark.asyncio
+async def test_negative_caching():
+    """Test failed lookups are cached for the negative ttl."""
+    clock = FakeClock()
+    error = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+    resolver = FakeResolver(error, [ADDR_INFO])
+    cache = ResolutionCache(resolver, negative_ttl=5, clock=clock)
+    for _ in range(2):
+        with pytest.raises(socket.gaierror, match="not known"):
+            await cache.resolve("example.org", 80)
+    assert len(resolver.calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    clock.now = 5
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+
+
+@pytest.mark.asyncio
+async def test_unexpected_errors_are_not_cached():
+    """Test errors other than OSError are raised but not cached."""
+    resolver = FakeResolver(ValueError("bug"), [ADDR_INFO])
+    cache = ResolutionCache(resolver)
+    with pytest.raises(ValueError, match="bug"):
+        await cache.resolve("example.org", 80)
+    assert await cache.resolve("example.org", 80) == [ADDR_INFO]
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    """Test the least recently used keys are evicted first."""
+    resolver = FakeResolver([ADDR_INFO])
+    cache = ResolutionCache(resolver, max_size=2)
+    await cache.resolve("a.example.org", 80)
+    await cache.resolve("b.example.org", 80)
+    await cache.resolve("a.example.org", 80)
+    await cache.resolve("c.example.org", 80)
+    assert len(cache) == 2
+    await cache.resolve("a.example.org", 80)
+    assert cache.hits == 2
+    await cache.resolve("b.example.org", 80)
+    assert cache.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_getaddrinfo():
+    """Test the loop getaddrinfo is used by default."""
+    loop = asyncio.get_running_loop()
+    cache = ResolutionCache()
+    with mock.patch.object(
+        loop, "getaddrinfo", mock.AsyncMock(return_value=[ADDR_INFO])
+    ) as getaddrinfo:
+        assert await cache.resolve("example.org", 80, socket.AF_INET) == [ADDR_INFO]
+    getaddrinfo.assert_awaited_once_with(
+        "example.org",
+        80,
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+    )
+
+
+@pytest.mark.asyncio
+async def test_as_resolver():
+    """Test the cache can be the resolver of start_connection_by_host."""
+    loop = asyncio.get_running_loop()
+    resolver = FakeResolver(
+        socket.gaierror(socket.EAI_NONAME, "no address"), [ADDR_INFO]
+    )
+    cache = ResolutionCache(resolver)
+    sock = mock.MagicMock()
+    with mock.patch.object(loop, "sock_connect", mock.AsyncMock()):
+        for _ in range(2):
+            assert (
+                await start_connection_by_host(
+                    "example.org", 80, resolver=cache, socket_factory=lambda _: sock
+                )
+                is sock
+            )
+    assert len(resolver.calls) == 2
+    assert cache.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_wraps_resolvers(tmp_path: Path) -> None:
+    """Test a hosts file and another cache can be cached."""
+    path = tmp_path / "hosts"
+    path.write_text("107.6.106.82 db.internal\n")
+    resolver = FakeResolver([OTHER_ADDR_INFO])
+    cache = ResolutionCache(ResolutionCache(HostsFile(str(path), resolver=resolver)))
+    assert await cache("db.internal", 80, socket.AF_INET) == [ADDR_INFO]
+    assert await cache("example.org", 80, socket.AF_UNSPEC) == [OTHER_ADDR_INFO]
+    assert await cache("example.org", 80, socket.AF_UNSPEC) == [OTHER_ADDR_INFO]
+    assert resolver.calls == [("example.org", 80, socket.AF_UNSPEC)]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_max_size_validation():
+    """Test max_size must be at least 1."""
+    with pytest.raises(ValueError, match="max_size must be at least 1"):
+        ResolutionCache(max_size=0)
@@ -0,0 +1,101 @@
+import errno
+import socket
+
+import pytest
+
+from aiohappyeyeballs import FamilyHealth
+
+from .conftest import IPV4_1, IPV4_2, IPV6_1, IPV6_2, FakeClock
+
+
+def test_unhealthy_family_goes_last():
+    """Test a family is demoted after consecutive failures."""
+    health = FamilyHealth(threshold=2, clock=FakeClock())
+    addr_infos = [IPV6_1, IPV4_1, IPV6_2, IPV4_2]
+    health.record_failure(IPV6_1)
+    assert health.is_healthy(socket.AF_INET6)
+    assert health.sort(addr_infos) == addr_infos
+    health.record_failure(IPV6_2)
+    assert not health.is_healthy(socket.AF_INET6)
+    assert health.is_healthy(socket.AF_INET)
+    assert health.sort(addr_infos) == [IPV4_1, IPV4_2, IPV6_1, IPV6_2]
+    assert health.prefer([socket.AF_INET6, socket.AF_INET]) == [
+        socket.AF_INET,
+        socket.AF_INET6,
+    ]
+    # A success of any address of the family makes it healthy again
+    health.record_success(IPV6_2, 0.1)
+    assert health.is_healthy(socket.AF_INET6)
+    assert health.sort(addr_infos) == addr_infos
+
+
+def test_server_errors_are_not_family_failures():
+    """Test refusals keep the family healthy, network errors do not."""
+    health = FamilyHealth(threshold=2, clock=FakeClock())
+    refused = ConnectionRefusedError(errno.ECONNREFUSED, "Connection refused")
+    for _ in range(3):
+        health.record_failure(IPV6_1, refused)
+    assert health.is_healthy(socket.AF_INET6)
+    health.record_failure(IPV6_1, OSError(errno.ENETUNREACH, "unreachable"))
+    health.record_failure(IPV6_2, TimeoutError(errno.ETIMEDOUT, "timed out"))
+    assert not health.is_healthy(socket.AF_INET6)
+
+
+def test_success_resets_failures():
+    """Test only consecutive failures make a family unhealthy."""
+    health = FamilyHealth(threshold=2, clock=FakeClock())
+    health.record_failure(IPV6_1)
+    health.record_success(IPV6_2, 0.1)
+    health.record_failure(IPV6_1)
+    assert health.is_healthy(socket.AF_INET6)
+
+
+def test_slow_cancelled_attempts_count_as_failures():
+    """Test attempts cancelled after the timeout count as failures."""
+    health = FamilyHealth(threshold=1, timeout=0.25, clock=FakeClock())
+    health.record_cancel(IPV6_1, 0.1)
+    assert health.is_healthy(socket.AF_INET6)
+    health.record_cancel(IPV6_1, 0.25)
+    assert not health.is_healthy(socket.AF_INET6)
+
+
+def test_single_family_is_not_reordered():
+    """Test nothing changes without a healthy family to lead with."""
+    health = FamilyHealth(threshold=1, clock=FakeClock())
+    health.record_failure(IPV6_1)
+    health.record_failure(IPV4_1)
+    assert health.sort([IPV6_1, IPV4_1]) == [IPV6_1, IPV4_1]
+    assert health.sort([IPV6_1, IPV6_2]) == [IPV6_1, IPV6_2]
+    assert health.prefer([socket.AF_INET6]) == [socket.AF_INET6]
+    health.clear()
+    assert health.is_healthy(socket.AF_INET6)
+    assert health.is_healthy(socket.AF_INET)
+
+
+def test_reprobe():
+    """Test an unhealthy family leads once every reprobe interval."""
+    clock = FakeClock()
+    health = FamilyHealth(threshold=1, reprobe_interval=30, clock=clock)
+    health.record_failure(IPV6_1)
+    clock.now = 29.9
+    assert health.sort([IPV6_1, IPV4_1]) == [IPV4_1, IPV6_1]
+    clock.now = 30
+    assert health.is_healthy(socket.AF_INET6)
+    assert health.sort([IPV6_1, IPV4_1]) == [IPV6_1, IPV4_1]
+    # Only the one probe until the next interval
+    assert health.sort([IPV6_1, IPV4_1]) == [IPV4_1, IPV6_1]
+    # The probe failed
+    health.record_failure(IPV6_1)
+    clock.now = 59.9
+    assert not health.is_healthy(socket.AF_INET6)
+    clock.now = 60
+    assert health.sort([IPV6_1, IPV4_1]) == [IPV6_1, IPV4_1]
+    # The probe connected
+    health.record_success(IPV6_1, 0.1)
+    assert health.sort([IPV6_1, IPV4_1]) == [IPV6_1, IPV4_1]
+
+
+def test_invalid_threshold():
+    """Test the threshold must be positive."""
+    with pytest.raises(ValueError, match="threshold must be at least 1"):
+        FamilyHealth(threshold=0)
@@ -0,0 +1,168 @@
+import asyncio
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from aiohappyeyeballs import HedgeBudget, HedgedCallError, hedged_call
+
+from .conftest import FakeClock
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_first_wins():
+    """Test no hedge is started when the first attempt is fast."""
+    started = []
+
+    async def call(idx):
+        started.append(idx)
+        await asyncio.sleep(0)
+        return idx
+
+    assert await hedged_call([partial(call, i) for i in range(3)], 1) == 0
+    assert started == [0]
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_hedge_wins():
+    """Test a hedge started after the delay wins over a slow attempt."""
+    cancelled = []
+
+    async def call(idx):
+        if idx == 0:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(idx)
+                raise
+        return idx
+
+    assert await hedged_call([partial(call, i) for i in range(2)], 0.01) == 1
+    assert cancelled == [0]
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_late_result():
+    """Test results of attempts finishing after the winner are disposed."""
+    loop = asyncio.get_running_loop()
+    gate = loop.create_future()
+    late: list[object] = []
+
+    async def call(idx):
+        await gate
+        return idx
+
+    task = asyncio.create_task(
+        hedged_call(
+            [partial(call, i) for i in range(3)], 0.001, on_late_result=late.append
+        )
+    )
+    await asyncio.sleep(0.05)
+    gate.set_result(None)
+    assert await task == 0
+    assert late == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_late_result_error():
+    """Test an error from on_late_result is reported to the loop."""
+    loop = asyncio.get_running_loop()
+    gate = loop.create_future()
+
+    async def call(idx):
+        await gate
+        return idx
+
+    def _fail(result):
+        raise ValueError("boom")
+
+    task = asyncio.create_task(
+        hedged_call([partial(call, i) for i in range(2)], 0.001, on_late_result=_fail)
+    )
+    await asyncio.sleep(0.05)
+    with mock.patch.object(loop, "call_exception_handler") as handler:
+        gate.set_result(None)
+        assert await task == 0
+    assert isinstance(handler.call_args[0][0]["exception"], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_errors():
+    """Test the errors raised when every attempt fails."""
+
+    async def call(idx):
+        raise OSError(idx)
+
+    with pytest.raises(OSError, match="0"):
+        await hedged_call([partial(call, 0)], 1)
+    with pytest.raises(HedgedCallError, match="all 2 attempts failed") as exc_info:
+        await hedged_call([partial(call, i) for i in range(2)], 1)
+    assert [exc.args for exc in exc_info.value.exceptions] == [(0,), (1,)]
+    with pytest.raises(ValueError, match="coro_fns must not be empty"):
+        await hedged_call([], 1)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_timeout():
+    """Test the call times out once no attempt finished in time."""
+
+    async def call():
+        await asyncio.sleep(10)
+
+    with pytest.raises(TimeoutError, match=r"timed out after 0\.01 seconds"):
+        await hedged_call([call, call], [0.001, 10], timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_budget():
+    """Test no hedges are started once the budget runs out."""
+    clock = FakeClock()
+    budget = HedgeBudget(ratio=0, min_hedges=1, clock=clock)
+    started = []
+
+    async def call(idx):
+        started.append(idx)
+        if idx == 0:
+            await asyncio.sleep(0.03)
+        return idx
+
+    assert (
+        await hedged_call([partial(call, i) for i in range(2)], 0.001, budget=budget)
+        == 1
+    )
+    started.clear()
+    assert (
+        await hedged_call([partial(call, i) for i in range(2)], 0.001, budget=budget)
+        == 0
+    )
+    assert started == [0]
+    # The hedge is available again once the window passed
+    clock.now += 20
+    assert budget.try_hedge()
+
+
+def test_budget_ratio():
+    """Test the budget allows a share of the calls as hedges."""
+    clock = FakeClock()
+    budget = HedgeBudget(ratio=0.1, window=10, min_hedges=0, clock=clock)
+    assert not budget.try_hedge()
+    for _ in range(20):
+        budget.record_call()
+    assert budget.try_hedge()
+    assert budget.try_hedge()
+    assert not budget.try_hedge()
+    # Half of the previous window still counts
+    clock.now = 15
+    assert not budget.try_hedge()
+    for _ in range(10):
+        budget.record_call()
+    assert budget.try_hedge()
+    assert not budget.try_hedge()
+
+
+def test_budget_validation():
+    """Test the budget arguments are validated."""
+    with pytest.raises(ValueError, match="ratio must not be negative"):
+        HedgeBudget(ratio=-1)
+    with pytest.raises(ValueError, match="window must be positive"):
+        HedgeBudget(window=0)
@@ -0,0 +1,63 @@
+import pytest
+
+from aiohappyeyeballs import ConnectionHistory
+
+from .conftest import IPV4_1, IPV4_2, IPV4_3, IPV6_1
+
+
+def test_sort():
+    """Test connected addresses go first by rtt and failed ones last."""
+    history = ConnectionHistory()
+    assert history.sort([IPV6_1, IPV4_1, IPV4_2, IPV4_3]) == [
+        IPV6_1,
+        IPV4_1,
+        IPV4_2,
+        IPV4_3,
+    ]
+    history.record_failure(IPV6_1)
+    history.record_success(IPV4_3, 0.2)
+    history.record_success(IPV4_2, 0.1)
+    assert history.sort([IPV6_1, IPV4_1, IPV4_2, IPV4_3]) == [
+        IPV4_2,
+        IPV4_3,
+        IPV4_1,
+        IPV6_1,
+    ]
+    # A success after a failure moves the address up again
+    history.record_success(IPV6_1, 0.3)
+    assert history.sort([IPV6_1, IPV4_1]) == [IPV6_1, IPV4_1]
+    history.record_failure(IPV6_1)
+    assert history.rtt(IPV6_1) == 0.3
+    assert history.sort([IPV6_1, IPV4_1]) == [IPV4_1, IPV6_1]
+
+
+def test_smoothed_rtt():
+    """Test the rtt is smoothed over the attempts."""
+    history = ConnectionHistory(alpha=0.5)
+    assert history.rtt(IPV4_1) is None
+    history.record_success(IPV4_1, 0.1)
+    assert history.rtt(IPV4_1) == pytest.approx(0.1)
+    history.record_success(IPV4_1, 0.3)
+    assert history.rtt(IPV4_1) == pytest.approx(0.2)
+
+
+def test_max_size():
+    """Test the least recently used addresses are forgotten first."""
+    history = ConnectionHistory(max_size=2)
+    history.record_success(IPV4_1, 0.1)
+    history.record_success(IPV4_2, 0.1)
+    history.record_success(IPV4_1, 0.1)
+    history.record_success(IPV4_3, 0.1)
+    assert len(history) == 2
+    assert history.rtt(IPV4_2) is None
+    assert history.rtt(IPV4_1) is not None
+    history.clear()
+    assert len(history) == 0
+
+
+def test_validation():
+    """Test the arguments are validated."""
+    with pytest.raises(ValueError, match="max_size must be at least 1"):
+        ConnectionHistory(max_size=0)
+    with pytest.raises(ValueError, match=r"alpha must be in \(0, 1\]"):
+        ConnectionHistory(alpha=0)
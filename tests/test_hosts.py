@@ -0,0 +1,138 @@
+import asyncio
+import os
+import socket
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from aiohappyeyeballs import HostsFile, addr_to_addr_infos, start_connection_by_host
+
+HOSTS = """\
+# comment
+127.0.0.1   localhost
+::1         localhost ip6-localhost
+10.0.0.1    db.internal DB  # primary
+10.0.0.2    db.internal
+10.0.0.1    db.internal
+fe80::1%1   link.internal
+fe80::2%no-such-interface link.internal
+10.0.0.3%1  link.internal
+not-an-ip   broken.internal
+10.0.0.4
+"""
+
+
+@pytest.fixture
+def hosts_path(tmp_path: Path) -> Path:
+    path = tmp_path / "hosts"
+    path.write_text(HOSTS)
+    return path
+
+
+def test_lookup(hosts_path: Path) -> None:
+    """Test the addresses of a name, in file order and deduplicated."""
+    hosts = HostsFile(str(hosts_path))
+    assert hosts.lookup("db.internal", 80) == [
+        *addr_to_addr_infos(("10.0.0.1", 80)),  # type: ignore[misc]
+        *addr_to_addr_infos(("10.0.0.2", 80)),
+    ]
+    assert hosts.lookup("DB.", 80) == addr_to_addr_infos(("10.0.0.1", 80))
+    assert hosts.lookup("localhost", 443) == [
+        *addr_to_addr_infos(("127.0.0.1", 443)),  # type: ignore[misc]
+        *addr_to_addr_infos(("::1", 443, 0, 0)),
+    ]
+    assert hosts.lookup("localhost", 443, socket.AF_INET6) == addr_to_addr_infos(
+        ("::1", 443, 0, 0)
+    )
+    assert hosts.lookup("link.internal", 80) == addr_to_addr_infos(
+        ("fe80::1", 80, 0, 1)
+    )
+    assert hosts.lookup("broken.internal", 80) == []
+    assert hosts.lookup("example.org", 80) == []
+
+
+def test_reload_on_mtime_change(hosts_path: Path) -> None:
+    """Test the file is only parsed again once its mtime changes."""
+    hosts = HostsFile(str(hosts_path))
+    assert hosts.lookup("db.internal", 80)
+    stat = os.stat(hosts_path)
+    hosts_path.write_text("10.0.0.9 new.internal\n")
+    os.utime(hosts_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    with mock.patch("aiohappyeyeballs.hosts._parse_hosts") as parse:
+        assert hosts.lookup("db.internal", 80)
+    parse.assert_not_called()
+
+    os.utime(hosts_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert hosts.lookup("db.internal", 80) == []
+    assert hosts.lookup("new.internal", 80) == addr_to_addr_infos(("10.0.0.9", 80))
+
+    hosts_path.unlink()
+    assert hosts.lookup("new.internal", 80) == []
+
+
+@pytest.mark.asyncio
+async def test_resolver(hosts_path: Path) -> None:
+    """Test names missing from the file are passed to the resolver."""
+    resolver = mock.AsyncMock(return_value=addr_to_addr_infos(("192.0.2.1", 80)))
+    hosts = HostsFile(str(hosts_path), resolver=resolver)
+    assert await hosts("db.internal", 80, socket.AF_INET) == hosts.lookup(
+        "db.internal", 80
+    )
+    resolver.assert_not_awaited()
+    assert await hosts("localhost", 80, socket.AF_INET6) == addr_to_addr_infos(
+        ("::1", 80, 0, 0)
+    )
+    assert await hosts("example.org", 80, socket.AF_UNSPEC) == addr_to_addr_infos(
+        ("192.0.2.1", 80)
+    )
+    resolver.assert_awaited_once_with("example.org", 80, socket.AF_UNSPEC)
+    # A pinned name has no addresses of the other families
+    assert await hosts("db.internal", 80, socket.AF_INET6) == []
+    resolver.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_single_family_name_by_host(hosts_path: Path) -> None:
+    """Test a name pinned for IPv4 only is not held back for an AAAA lookup."""
+    loop = asyncio.get_running_loop()
+    resolver = mock.AsyncMock(return_value=[])
+    hosts = HostsFile(str(hosts_path), resolver=resolver)
+    connected = []
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        connected.append(address)
+
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        sock = await asyncio.wait_for(
+            start_connection_by_host(
+                "db.internal",
+                80,
+                resolver=hosts,
+                resolution_delay=10,
+                socket_factory=lambda addr_info: mock.MagicMock(),
+            ),
+            1,
+        )
+    assert connected == [("10.0.0.1", 80)]
+    assert sock is not None
+    resolver.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_getaddrinfo(hosts_path: Path) -> None:
+    """Test the loop getaddrinfo is the default resolver."""
+    loop = asyncio.get_running_loop()
+    hosts = HostsFile(str(hosts_path))
+    addr_infos = addr_to_addr_infos(("192.0.2.1", 80))
+    with mock.patch.object(
+        loop, "getaddrinfo", mock.AsyncMock(return_value=addr_infos)
+    ) as getaddrinfo:
+        assert await hosts("example.org", 80, socket.AF_INET) == addr_infos
+    getaddrinfo.assert_awaited_once_with(
+        "example.org",
+        80,
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+    )
@@ -1,5 +1,7 @@
 import asyncio
+import errno
 import socket
+import sys
 from collections.abc import Sequence
 from types import ModuleType
 from unittest import mock
@@ -7,11 +9,18 @@ from unittest import mock
 import pytest
 
 from aiohappyeyeballs import (
+    AddressBackoff,
     AddrInfoType,
+    ConnectionHistory,
+    FamilyHealth,
+    RouteProbe,
     SocketFactoryType,
+    StartConnectionTimeoutError,
     _staggered,
     impl,
     start_connection,
+    start_connection_by_host,
+    start_connections,
 )
 
 
@@ -226,6 +235,7 @@ async def test_multiple_winners_cleaned_up(
 ) -> None:
     loop = asyncio.get_running_loop()
     finish = loop.create_future()
+    sockets = []
 
     def _socket(*args, **kw):
         return mock.MagicMock(
@@ -240,13 +250,12 @@ async def test_multiple_winners_cleaned_up(
         exceptions: list[list[OSError | RuntimeError]],
         addr_info: AddrInfoType,
         local_addr_infos: Sequence[AddrInfoType] | None = None,
-        sockets: set[socket.socket] | None = None,
         socket_factory: SocketFactoryType | None = None,
+        attempt_timeout: float | None = None,
     ) -> socket.socket:
         await finish
         sock = _socket()
-        assert sockets is not None
-        sockets.add(sock)
+        sockets.append(sock)
         return sock
 
     m_socket.socket = _socket  # type: ignore
@@ -286,29 +295,44 @@ async def test_multiple_winners_cleaned_up(
         )
         await asyncio.sleep(0.1)
         loop.call_soon(finish.set_result, None)
-        await task
+        sock = await task
+
+    # The runner up sockets are closed
+    assert len(sockets) == 4
+    assert sock is sockets[0]
+    sock.close.assert_not_called()
+    for runner_up in sockets[1:]:
+        runner_up.close.assert_called_once()
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_multiple_addr_success_second_one_happy_eyeballs(
+async def test_cancel_losers_in_background(
     m_socket: ModuleType,
 ) -> None:
-    mock_socket = mock.MagicMock(
-        family=socket.AF_INET,
-        type=socket.SOCK_STREAM,
-        proto=socket.IPPROTO_TCP,
-        fileno=mock.MagicMock(return_value=1),
-    )
-    idx = -1
-    errors = ["err1", "err2"]
+    loop = asyncio.get_running_loop()
+    sockets = []
+    loser_cancelled = loop.create_future()
 
     def _socket(*args, **kw):
-        nonlocal idx, errors
-        idx += 1
-        if idx == 1:
-            raise OSError(5, errors[idx])
-        return mock_socket
+        sock = mock.MagicMock(
+            family=socket.AF_INET,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            fileno=mock.MagicMock(return_value=1),
+        )
+        sockets.append(sock)
+        return sock
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        if address[0] == "107.6.106.83":
+            return
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Slow cleanup on cancellation
+            await asyncio.sleep(0.01)
+            loser_cancelled.set_result(None)
 
     m_socket.socket = _socket  # type: ignore
     addr_info = [
@@ -327,18 +351,27 @@ async def test_multiple_addr_success_second_one_happy_eyeballs(
             ("107.6.106.83", 80),
         ),
     ]
-    loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", return_value=None):
-        assert (
-            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        sock = await start_connection(
+            addr_info, happy_eyeballs_delay=0.01, cancel_losers_in_background=True
         )
+        assert sock is sockets[1]
+        assert not loser_cancelled.done()
+        sockets[0].close.assert_not_called()
+        await loser_cancelled
+
+    sockets[0].close.assert_called_once()
+    sockets[1].close.assert_not_called()
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_happy_eyeballs_socket_factory(
+async def test_happy_eyeballs_max_in_flight(
     m_socket: ModuleType,
 ) -> None:
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    first_fails = loop.create_future()
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -346,60 +379,14 @@ async def test_happy_eyeballs_socket_factory(
         fileno=mock.MagicMock(return_value=1),
     )
 
-    idx = -1
-    errors = ["err1", "err2"]
-
-    def factory(addr_info: AddrInfoType) -> socket.socket:
-        nonlocal idx, errors
-        idx += 1
-        if idx == 1:
-            raise OSError(5, errors[idx])
+    def _socket(*args, **kw):
         return mock_socket
 
-    addr_info = [
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("107.6.106.82", 80),
-        ),
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("107.6.106.83", 80),
-        ),
-    ]
-    loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", return_value=None):
-        assert (
-            await start_connection(
-                addr_info, happy_eyeballs_delay=0.3, socket_factory=factory
-            )
-            == mock_socket
-        )
-
-
-@pytest.mark.asyncio
-@patch_socket
-async def test_multiple_addr_all_fail_happy_eyeballs(
-    m_socket: ModuleType,
-) -> None:
-    mock.MagicMock(
-        family=socket.AF_INET,
-        type=socket.SOCK_STREAM,
-        proto=socket.IPPROTO_TCP,
-        fileno=mock.MagicMock(return_value=1),
-    )
-    idx = -1
-    errors = ["err1", "err2"]
-
-    def _socket(*args, **kw):
-        nonlocal idx, errors
-        idx += 1
-        raise OSError(5, errors[idx])
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address)
+        if address[0] == "107.6.106.82":
+            await first_fails
+            raise OSError(5, "blackholed")
 
     m_socket.socket = _socket  # type: ignore
     addr_info = [
@@ -418,16 +405,27 @@ async def test_multiple_addr_all_fail_happy_eyeballs(
             ("107.6.106.83", 80),
         ),
     ]
-    asyncio.get_running_loop()
-    with pytest.raises(OSError, match=errors[0]):
-        await start_connection(addr_info, happy_eyeballs_delay=0.3)
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        task = loop.create_task(
+            start_connection(addr_info, happy_eyeballs_delay=0.001, max_in_flight=1)
+        )
+        await asyncio.sleep(0.05)
+        # The stagger delay passed but the only slot is still taken
+        assert create_calls == [("107.6.106.82", 80)]
+        first_fails.set_result(None)
+        assert await task == mock_socket
+
+    assert create_calls == [("107.6.106.82", 80), ("107.6.106.83", 80)]
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv6_and_ipv4_happy_eyeballs_ipv6_fails(
+async def test_happy_eyeballs_delay_callable(
     m_socket: ModuleType,
 ) -> None:
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    delay_calls = []
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -436,12 +434,17 @@ async def test_ipv6_and_ipv4_happy_eyeballs_ipv6_fails(
     )
 
     def _socket(*args, **kw):
-        if kw["family"] == socket.AF_INET6:
-            raise OSError(5, "ipv6 fail")
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
         return mock_socket
 
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address)
+        if address[0] != "107.6.106.83":
+            await asyncio.sleep(10)
+
+    def _delay(index: int, addr_info: AddrInfoType) -> float:
+        delay_calls.append((index, addr_info[4]))
+        return 0.001 if index == 1 else 10
+
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
         socket.AF_INET6,
@@ -450,6 +453,13 @@ async def test_ipv6_and_ipv4_happy_eyeballs_ipv6_fails(
         "",
         ("dead:beef::", 80, 0, 0),
     )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
     ipv4_addr_info = (
         socket.AF_INET,
         socket.SOCK_STREAM,
@@ -457,20 +467,25 @@ async def test_ipv6_and_ipv4_happy_eyeballs_ipv6_fails(
         "",
         ("107.6.106.83", 80),
     )
-    addr_info = [ipv6_addr_info, ipv4_addr_info]
-    loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", return_value=None):
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
         assert (
-            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
+            await start_connection(addr_info, happy_eyeballs_delay=_delay)
+            == mock_socket
         )
-    assert mock_socket.family == socket.AF_INET
+
+    # The callable sees the interleaved order of the addresses
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("107.6.106.83", 80)]
+    assert delay_calls == [(1, ("107.6.106.83", 80)), (2, ("dead:aaaa::", 80, 0, 0))]
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv6_and_ipv4_happy_eyeballs_ipv4_fails(
+async def test_happy_eyeballs_delay_callable_last_attempt(
     m_socket: ModuleType,
 ) -> None:
+    delay_calls = []
+
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -479,466 +494,362 @@ async def test_ipv6_and_ipv4_happy_eyeballs_ipv4_fails(
     )
 
     def _socket(*args, **kw):
-        if kw["family"] == socket.AF_INET:
-            raise OSError(5, "ipv4 fail")
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
         return mock_socket
 
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        await asyncio.sleep(0)
+        raise OSError(5, "no good")
+
+    def _delay(index: int, addr_info: AddrInfoType) -> float:
+        delay_calls.append(index)
+        return 0.001
+
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr: tuple[str, int, int, int] = ("dead:beef::", 80, 0, 0)
-    ipv6_addr_info: tuple[int, int, int, str, tuple[str, int, int, int]] = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ipv6_addr,
-    )
-    ipv4_addr: tuple[str, int] = ("107.6.106.83", 80)
-    ipv4_addr_info: tuple[int, int, int, str, tuple[str, int]] = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ipv4_addr,
-    )
-    addr_info = [ipv6_addr_info, ipv4_addr_info]
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.83", 80),
+        ),
+    ]
     loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", return_value=None):
-        assert (
-            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
-        )
-    assert mock_socket.family == socket.AF_INET6
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="no good"),
+    ):
+        await start_connection(addr_info, happy_eyeballs_delay=_delay)
+    # There is no third address, so the callable is not asked for its delay
+    assert delay_calls == [1]
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv6_and_ipv4_happy_eyeballs_first_ipv6_fails(
-    m_socket: ModuleType,
-) -> None:
+async def test_happy_eyeballs_delay_callable_raises(m_socket: ModuleType) -> None:
+    """Test an error of the delay callable is raised from start_connection."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
         proto=socket.IPPROTO_TCP,
         fileno=mock.MagicMock(return_value=1),
     )
-    create_calls = []
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
         return mock_socket
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        await asyncio.sleep(10)
 
-        return None
+    def _delay(index: int, addr_info: AddrInfoType) -> float:
+        if index == 2:
+            raise RuntimeError("no delay")
+        return 0.001
 
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            (f"107.6.106.{i}", 80),
+        )
+        for i in range(82, 85)
+    ]
     loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", _sock_connect):
-        assert (
-            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(RuntimeError, match="no delay"),
+    ):
+        await asyncio.wait_for(
+            start_connection(addr_info, happy_eyeballs_delay=_delay), 1
         )
 
-    # IPv6 addresses are tried first, but the first one fails so IPv4 wins
-    assert mock_socket.family == socket.AF_INET
-    assert create_calls == [("dead:beef::", 80, 0, 0), ("107.6.106.83", 80)]
-
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize("happy_eyeballs_delay", [None, [0.001, 0.001, 10]])
 @patch_socket
-async def test_ipv64_happy_eyeballs_interleave_2_first_ipv6_fails(
-    m_socket: ModuleType,
+async def test_timeout(
+    m_socket: ModuleType, happy_eyeballs_delay: list[float] | None
 ) -> None:
-    mock_socket = mock.MagicMock(
-        family=socket.AF_INET,
-        type=socket.SOCK_STREAM,
-        proto=socket.IPPROTO_TCP,
-        fileno=mock.MagicMock(return_value=1),
-    )
+    loop = asyncio.get_running_loop()
     create_calls = []
+    sockets = []
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        return mock_socket
+        sock = mock.MagicMock(
+            family=socket.AF_INET,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            fileno=mock.MagicMock(return_value=1),
+        )
+        sockets.append(sock)
+        return sock
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
         create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
+        if address[0] == "107.6.106.82":
+            raise OSError(5, "refused")
+        await asyncio.sleep(10)
 
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", _sock_connect):
-        assert (
-            await start_connection(addr_info, happy_eyeballs_delay=0.3, interleave=2)
-            == mock_socket
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            (f"107.6.106.{i}", 80),
+        )
+        for i in range(82, 86)
+    ]
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(StartConnectionTimeoutError) as exc_info,
+    ):
+        await start_connection(
+            addr_info, happy_eyeballs_delay=happy_eyeballs_delay, timeout=0.05
         )
 
-    # IPv6 addresses are tried first, but the first one fails so second IPv6 wins
-    # because interleave is 2
-    assert mock_socket.family == socket.AF_INET6
-    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
+    assert isinstance(exc_info.value, TimeoutError)
+    assert str(exc_info.value) == (
+        "[Errno 110] timed out after 0.05 seconds while connecting: [Errno 5] refused"
+    )
+    assert [str(exc) for exc in exc_info.value.exceptions] == ["[Errno 5] refused"]
+    if happy_eyeballs_delay is None:
+        # The second address used up the whole budget
+        assert create_calls == [("107.6.106.82", 80), ("107.6.106.83", 80)]
+    else:
+        # The fourth address would only start after the deadline
+        assert create_calls == [
+            ("107.6.106.82", 80),
+            ("107.6.106.83", 80),
+            ("107.6.106.84", 80),
+        ]
+    for sock in sockets:
+        sock.close.assert_called_once()
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv6_only_happy_eyeballs_first_ipv6_fails(
-    m_socket: ModuleType,
-) -> None:
-    mock_socket = mock.MagicMock(
-        family=socket.AF_INET,
-        type=socket.SOCK_STREAM,
-        proto=socket.IPPROTO_TCP,
-        fileno=mock.MagicMock(return_value=1),
-    )
-    create_calls = []
+async def test_timeout_without_errors(m_socket: ModuleType) -> None:
+    loop = asyncio.get_running_loop()
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        return mock_socket
-
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
+        return mock.MagicMock(
+            family=socket.AF_INET,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            fileno=mock.MagicMock(return_value=1),
+        )
 
-        return None
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        await asyncio.sleep(10)
 
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2]
-    loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", _sock_connect):
-        assert (
-            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
         )
-
-    # IPv6 address are tried first, but the first one fails so second IPv6 wins
-    assert mock_socket.family == socket.AF_INET6
-    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
+    ]
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(
+            StartConnectionTimeoutError,
+            match=r"timed out after 0\.01 seconds while connecting$",
+        ) as exc_info,
+    ):
+        await start_connection(addr_info, timeout=0.01)
+    assert exc_info.value.exceptions == []
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv64_laddr_eyeballs_interleave_2_first_ipv6_fails(
-    m_socket: ModuleType,
-) -> None:
+async def test_timeout_not_reached(m_socket: ModuleType) -> None:
+    loop = asyncio.get_running_loop()
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
         proto=socket.IPPROTO_TCP,
         fileno=mock.MagicMock(return_value=1),
     )
-    create_calls = []
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
         return mock_socket
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
-
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
+    addr_info = [
         (
-            socket.AF_INET6,
+            socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("::1", 0, 0, 0),
+            ("107.6.106.82", 80),
         )
     ]
-    loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", _sock_connect):
-        assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=2,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
-        )
-
-    # IPv6 addresses are tried first, but the first one fails so second IPv6 wins
-    # because interleave is 2
-    assert mock_socket.family == socket.AF_INET6
-    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
+    with mock.patch.object(loop, "sock_connect", return_value=None):
+        assert await start_connection(addr_info, timeout=10) == mock_socket
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize("happy_eyeballs_delay", [None, 10])
 @patch_socket
-async def test_ipv64_laddr_both__eyeballs_first_ipv6_fails(
-    m_socket: ModuleType,
+async def test_attempt_timeout(
+    m_socket: ModuleType, happy_eyeballs_delay: float | None
 ) -> None:
-    mock_socket = mock.MagicMock(
-        family=socket.AF_INET,
-        type=socket.SOCK_STREAM,
-        proto=socket.IPPROTO_TCP,
-        fileno=mock.MagicMock(return_value=1),
-    )
+    loop = asyncio.get_running_loop()
     create_calls = []
+    sockets = []
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        return mock_socket
+        sock = mock.MagicMock(
+            family=socket.AF_INET,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            fileno=mock.MagicMock(return_value=1),
+        )
+        sockets.append(sock)
+        return sock
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
         create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
+        if address[0] == "107.6.106.82":
+            # Blackholed
+            await asyncio.sleep(10)
 
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
+    addr_info = [
         (
-            socket.AF_INET6,
+            socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("::1", 0, 0, 0),
+            ("107.6.106.82", 80),
         ),
         (
             socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("127.0.0.1", 0),
+            ("107.6.106.83", 80),
         ),
     ]
-    loop = asyncio.get_running_loop()
     with mock.patch.object(loop, "sock_connect", _sock_connect):
-        assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
+        sock = await start_connection(
+            addr_info,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            attempt_timeout=0.01,
         )
 
-    # IPv6 is tried first and fails, which means IPv4 is tried next and succeeds
-    assert mock_socket.family == socket.AF_INET
-    assert create_calls == [("dead:beef::", 80, 0, 0), ("107.6.106.83", 80)]
+    # The stuck attempt was abandoned long before the stagger delay
+    assert sock is sockets[1]
+    assert create_calls == [("107.6.106.82", 80), ("107.6.106.83", 80)]
+    sockets[0].close.assert_called_once()
+    sockets[1].close.assert_not_called()
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv64_laddr_bind_fails_eyeballs_first_ipv6_fails(
-    m_socket: ModuleType,
-) -> None:
-    mock_socket = mock.MagicMock(
-        family=socket.AF_INET,
-        type=socket.SOCK_STREAM,
-        proto=socket.IPPROTO_TCP,
-        fileno=mock.MagicMock(return_value=1),
-    )
-    create_calls = []
+async def test_attempt_timeout_all_fail(m_socket: ModuleType) -> None:
+    loop = asyncio.get_running_loop()
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        if kw["family"] == socket.AF_INET:
-            mock_socket.bind.side_effect = OSError(5, "bind fail")
+        return mock.MagicMock(
+            family=socket.AF_INET,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            fileno=mock.MagicMock(return_value=1),
+        )
 
-        return mock_socket
-
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        await asyncio.sleep(10)
 
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
+    addr_info = [
         (
-            socket.AF_INET6,
+            socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("::1", 0, 0, 0),
+            ("107.6.106.82", 80),
         ),
         (
             socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("127.0.0.1", 0),
+            ("107.6.106.83", 80),
         ),
     ]
-    loop = asyncio.get_running_loop()
     with (
         mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(OSError, match="ipv6 fail"),
+        pytest.raises(OSError) as exc_info,
     ):
-        assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=1,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
+        await start_connection(
+            addr_info, happy_eyeballs_delay=0.001, attempt_timeout=0.01
         )
 
-    # We only tried IPv6 since bind to IPv4 failed
-    assert create_calls == [("dead:beef::", 80, 0, 0)]
+    assert exc_info.value.errno == errno.ETIMEDOUT
+    assert str(exc_info.value) == (
+        "[Errno 110] Multiple exceptions: "
+        "[Errno 110] timed out after 0.01 seconds connecting to "
+        "('107.6.106.82', 80), "
+        "[Errno 110] timed out after 0.01 seconds connecting to "
+        "('107.6.106.83', 80)"
+    )
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv64_laddr_bind_fails_eyeballs_interleave_first__ipv6_fails(
+async def test_attempt_timeout_kernel_timeout(m_socket: ModuleType) -> None:
+    loop = asyncio.get_running_loop()
+
+    def _socket(*args, **kw):
+        return mock.MagicMock(
+            family=socket.AF_INET,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            fileno=mock.MagicMock(return_value=1),
+        )
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        raise OSError(errno.ETIMEDOUT, f"Connect call failed {address}")
+
+    m_socket.socket = _socket  # type: ignore
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
+        )
+    ]
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(
+            TimeoutError,
+            match=r"Connect call failed \('107\.6\.106\.82', 80\)",
+        ),
+    ):
+        await start_connection(addr_info, attempt_timeout=10)
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_multiple_addr_success_second_one_happy_eyeballs(
     m_socket: ModuleType,
 ) -> None:
     mock_socket = mock.MagicMock(
@@ -947,87 +858,47 @@ async def test_ipv64_laddr_bind_fails_eyeballs_interleave_first__ipv6_fails(
         proto=socket.IPPROTO_TCP,
         fileno=mock.MagicMock(return_value=1),
     )
-    create_calls = []
+    idx = -1
+    errors = ["err1", "err2"]
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        if kw["family"] == socket.AF_INET:
-            mock_socket.bind.side_effect = OSError(5, "bind fail")
-
+        nonlocal idx, errors
+        idx += 1
+        if idx == 1:
+            raise OSError(5, errors[idx])
         return mock_socket
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
-
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
+    addr_info = [
         (
-            socket.AF_INET6,
+            socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("::1", 0, 0, 0),
+            ("107.6.106.82", 80),
         ),
         (
             socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("127.0.0.1", 0),
+            ("107.6.106.83", 80),
         ),
     ]
     loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", _sock_connect):
+    with mock.patch.object(loop, "sock_connect", return_value=None):
         assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=2,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
+            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
         )
 
-    # IPv6 is tried first and fails, which means IPv4 is tried next but the laddr
-    # build fails so we move on to the next IPv6 and it succeeds
-    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
-    assert mock_socket.family == socket.AF_INET6
-
 
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires python3.12 or higher")
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv64_laddr_socket_fails(
+async def test_happy_eyeballs_first_connect_completes_immediately(
     m_socket: ModuleType,
 ) -> None:
+    """The first attempt connecting without suspending returns right away."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1037,76 +908,42 @@ async def test_ipv64_laddr_socket_fails(
     create_calls = []
 
     def _socket(*args, **kw):
-        raise Exception("Something really went wrong")
-
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
+        create_calls.append(kw)
+        return mock_socket
 
     m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
+    addr_info = [
         (
-            socket.AF_INET6,
+            socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("::1", 0, 0, 0),
+            ("107.6.106.82", 80),
         ),
         (
             socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("127.0.0.1", 0),
+            ("107.6.106.83", 80),
         ),
     ]
     loop = asyncio.get_running_loop()
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(Exception, match="Something really went wrong"),
-    ):
+    ran: list[bool] = []
+    handle = loop.call_soon(ran.append, True)
+    with mock.patch.object(loop, "sock_connect", return_value=None):
         assert (
-            await start_connection(
-                addr_info,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
+            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
         )
-
-    # All binds failed
-    assert create_calls == []
+    # No loop iteration was needed and no other attempt was started
+    assert ran == []
+    handle.cancel()
+    assert len(create_calls) == 1
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv64_laddr_socket_blocking_fails(
+async def test_happy_eyeballs_socket_factory(
     m_socket: ModuleType,
 ) -> None:
     mock_socket = mock.MagicMock(
@@ -1115,82 +952,87 @@ async def test_ipv64_laddr_socket_blocking_fails(
         proto=socket.IPPROTO_TCP,
         fileno=mock.MagicMock(return_value=1),
     )
-    create_calls = []
-
-    def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        mock_socket.setblocking.side_effect = Exception("Something really went wrong")
-        return mock_socket
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
+    idx = -1
+    errors = ["err1", "err2"]
 
-        return None
+    def factory(addr_info: AddrInfoType) -> socket.socket:
+        nonlocal idx, errors
+        idx += 1
+        if idx == 1:
+            raise OSError(5, errors[idx])
+        return mock_socket
 
-    m_socket.socket = _socket  # type: ignore
-    ipv6_addr_info = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::", 80, 0, 0),
-    )
-    ipv6_addr_info_2 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:aaaa::", 80, 0, 0),
-    )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
+    addr_info = [
         (
-            socket.AF_INET6,
+            socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("::1", 0, 0, 0),
+            ("107.6.106.82", 80),
         ),
         (
             socket.AF_INET,
             socket.SOCK_STREAM,
             socket.IPPROTO_TCP,
             "",
-            ("127.0.0.1", 0),
+            ("107.6.106.83", 80),
         ),
     ]
     loop = asyncio.get_running_loop()
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(Exception, match="Something really went wrong"),
-    ):
+    with mock.patch.object(loop, "sock_connect", return_value=None):
         assert (
             await start_connection(
-                addr_info,
-                local_addr_infos=local_addr_infos,
+                addr_info, happy_eyeballs_delay=0.3, socket_factory=factory
             )
             == mock_socket
         )
 
-    # All binds failed
-    assert create_calls == []
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_multiple_addr_all_fail_happy_eyeballs(
+    m_socket: ModuleType,
+) -> None:
+    mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    idx = -1
+    errors = ["err1", "err2"]
+
+    def _socket(*args, **kw):
+        nonlocal idx, errors
+        idx += 1
+        raise OSError(5, errors[idx])
+
+    m_socket.socket = _socket  # type: ignore
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.83", 80),
+        ),
+    ]
+    asyncio.get_running_loop()
+    with pytest.raises(OSError, match=errors[0]):
+        await start_connection(addr_info, happy_eyeballs_delay=0.3)
 
 
 @pytest.mark.asyncio
 @patch_socket
-async def test_ipv64_laddr_eyeballs_ipv4_only_tried(
+async def test_ipv6_and_ipv4_happy_eyeballs_ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
     mock_socket = mock.MagicMock(
@@ -1199,22 +1041,14 @@ async def test_ipv64_laddr_eyeballs_ipv4_only_tried(
         proto=socket.IPPROTO_TCP,
         fileno=mock.MagicMock(return_value=1),
     )
-    create_calls = []
 
     def _socket(*args, **kw):
+        if kw["family"] == socket.AF_INET6:
+            raise OSError(5, "ipv6 fail")
         for attr in kw:
             setattr(mock_socket, attr, kw[attr])
         return mock_socket
 
-    async def _sock_connect(
-        sock: socket.socket, address: tuple[str, int, int, int]
-    ) -> None:
-        create_calls.append(address)
-        if address[0] == "dead:beef::":
-            raise OSError(5, "ipv6 fail")
-
-        return None
-
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
         socket.AF_INET6,
@@ -1223,50 +1057,70 @@ async def test_ipv64_laddr_eyeballs_ipv4_only_tried(
         "",
         ("dead:beef::", 80, 0, 0),
     )
-    ipv6_addr_info_2 = (
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv4_addr_info]
+    loop = asyncio.get_running_loop()
+    with mock.patch.object(loop, "sock_connect", return_value=None):
+        assert (
+            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
+        )
+    assert mock_socket.family == socket.AF_INET
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_ipv6_and_ipv4_happy_eyeballs_ipv4_fails(
+    m_socket: ModuleType,
+) -> None:
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+
+    def _socket(*args, **kw):
+        if kw["family"] == socket.AF_INET:
+            raise OSError(5, "ipv4 fail")
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr: tuple[str, int, int, int] = ("dead:beef::", 80, 0, 0)
+    ipv6_addr_info: tuple[int, int, int, str, tuple[str, int, int, int]] = (
         socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("dead:aaaa::", 80, 0, 0),
+        ipv6_addr,
     )
-    ipv4_addr_info = (
+    ipv4_addr: tuple[str, int] = ("107.6.106.83", 80)
+    ipv4_addr_info: tuple[int, int, int, str, tuple[str, int]] = (
         socket.AF_INET,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("107.6.106.83", 80),
+        ipv4_addr,
     )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("127.0.0.1", 0),
-        )
-    ]
+    addr_info = [ipv6_addr_info, ipv4_addr_info]
     loop = asyncio.get_running_loop()
-    with mock.patch.object(loop, "sock_connect", _sock_connect):
+    with mock.patch.object(loop, "sock_connect", return_value=None):
         assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=2,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
+            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
         )
-
-    # Only IPv4 addresses are tried because local_addr_infos is IPv4
-    assert mock_socket.family == socket.AF_INET
-    assert create_calls == [("107.6.106.83", 80)]
+    assert mock_socket.family == socket.AF_INET6
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_ipv64_laddr_bind_fails_all_eyeballs_interleave_first__ipv6_fails(
+@patch_socket
+async def test_ipv6_and_ipv4_happy_eyeballs_first_ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
     mock_socket = mock.MagicMock(
@@ -1280,7 +1134,6 @@ async def test_ipv64_laddr_bind_fails_all_eyeballs_interleave_first__ipv6_fails(
     def _socket(*args, **kw):
         for attr in kw:
             setattr(mock_socket, attr, kw[attr])
-        mock_socket.bind.side_effect = OSError(4, "bind fail")
         return mock_socket
 
     async def _sock_connect(
@@ -1315,47 +1168,22 @@ async def test_ipv64_laddr_bind_fails_all_eyeballs_interleave_first__ipv6_fails(
         ("107.6.106.83", 80),
     )
     addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
-        (
-            socket.AF_INET6,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("::1", 0, 0, 0),
-        ),
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("127.0.0.1", 0),
-        ),
-    ]
     loop = asyncio.get_running_loop()
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(OSError, match="Multiple exceptions"),
-    ):
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
         assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=2,
-                local_addr_infos=local_addr_infos,
-            )
-            == mock_socket
+            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
         )
 
-    # All binds failed
-    assert create_calls == []
+    # IPv6 addresses are tried first, but the first one fails so IPv4 wins
+    assert mock_socket.family == socket.AF_INET
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("107.6.106.83", 80)]
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_all_same_exception_and_same_errno(
+@patch_socket
+async def test_ipv64_happy_eyeballs_interleave_2_first_ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
-    """Test that all exceptions are the same and have the same errno."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1373,7 +1201,10 @@ async def test_all_same_exception_and_same_errno(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        raise OSError(5, "all fail")
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1398,54 +1229,24 @@ async def test_all_same_exception_and_same_errno(
         ("107.6.106.83", 80),
     )
     addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
-        (
-            socket.AF_INET6,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("::1", 0, 0, 0),
-        ),
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("127.0.0.1", 0),
-        ),
-    ]
     loop = asyncio.get_running_loop()
-    # We should get the same exception raised if they are all the same
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(OSError, match="all fail") as exc_info,
-    ):
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
         assert (
-            await start_connection(
-                addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=2,
-                local_addr_infos=local_addr_infos,
-            )
+            await start_connection(addr_info, happy_eyeballs_delay=0.3, interleave=2)
             == mock_socket
         )
 
-    assert exc_info.value.errno == 5
-
-    # All calls failed
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-        ("dead:aaaa::", 80, 0, 0),
-        ("107.6.106.83", 80),
-    ]
+    # IPv6 addresses are tried first, but the first one fails so second IPv6 wins
+    # because interleave is 2
+    assert mock_socket.family == socket.AF_INET6
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_all_same_exception_and_with_different_errno(
+@patch_socket
+async def test_ipv6_only_happy_eyeballs_first_ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
-    """Test no errno is set if all OSError have different errno."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1463,7 +1264,10 @@ async def test_all_same_exception_and_with_different_errno(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        raise OSError(len(create_calls), "all fail")
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1480,36 +1284,79 @@ async def test_all_same_exception_and_with_different_errno(
         "",
         ("dead:aaaa::", 80, 0, 0),
     )
-    ipv4_addr_info = (
-        socket.AF_INET,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("107.6.106.83", 80),
-    )
-    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
-    local_addr_infos = [
-        (
-            socket.AF_INET6,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("::1", 0, 0, 0),
-        ),
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2]
+    loop = asyncio.get_running_loop()
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        assert (
+            await start_connection(addr_info, happy_eyeballs_delay=0.3) == mock_socket
+        )
+
+    # IPv6 address are tried first, but the first one fails so second IPv6 wins
+    assert mock_socket.family == socket.AF_INET6
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_ipv64_laddr_eyeballs_interleave_2_first_ipv6_fails(
+    m_socket: ModuleType,
+) -> None:
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
             "",
-            ("127.0.0.1", 0),
-        ),
+            ("::1", 0, 0, 0),
+        )
     ]
     loop = asyncio.get_running_loop()
-    # We should get the same exception raised if they are all the same
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(OSError, match="all fail") as exc_info,
-    ):
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
         assert (
             await start_connection(
                 addr_info,
@@ -1520,37 +1367,17 @@ async def test_all_same_exception_and_with_different_errno(
             == mock_socket
         )
 
-    # No errno is set if they are all different
-    assert exc_info.value.errno is None
-
-    # All calls failed
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-        ("dead:aaaa::", 80, 0, 0),
-        ("107.6.106.83", 80),
-    ]
+    # IPv6 addresses are tried first, but the first one fails so second IPv6 wins
+    # because interleave is 2
+    assert mock_socket.family == socket.AF_INET6
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_uvloop_runtime_error(
+@patch_socket
+async def test_ipv64_laddr_both__eyeballs_first_ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
-    """
-    Test RuntimeError is handled when connecting a socket with uvloop.
-
-    Connecting a socket can raise a RuntimeError, OSError or ValueError.
-
-    - OSError: If the address is invalid or the connection fails.
-    - ValueError: if a non-sock it passed (this should never happen).
-    https://github.com/python/cpython/blob/e44eebfc1eccdaaebc219accbfc705c9a9de068d/Lib/asyncio/selector_events.py#L271
-    - RuntimeError: If the file descriptor is already in use by a transport.
-
-    We should never get ValueError since we are using the correct types.
-
-    selector_events.py never seems to raise a RuntimeError, but it is possible
-    with uvloop. This test is to ensure that we handle it correctly.
-    """
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1568,7 +1395,10 @@ async def test_uvloop_runtime_error(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        raise RuntimeError("all fail")
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1610,35 +1440,26 @@ async def test_uvloop_runtime_error(
         ),
     ]
     loop = asyncio.get_running_loop()
-    # We should get the same exception raised if they are all the same
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(RuntimeError, match="all fail"),
-    ):
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
         assert (
             await start_connection(
                 addr_info,
                 happy_eyeballs_delay=0.3,
-                interleave=2,
                 local_addr_infos=local_addr_infos,
             )
             == mock_socket
         )
 
-    # All calls failed
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-        ("dead:aaaa::", 80, 0, 0),
-        ("107.6.106.83", 80),
-    ]
+    # IPv6 is tried first and fails, which means IPv4 is tried next and succeeds
+    assert mock_socket.family == socket.AF_INET
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("107.6.106.83", 80)]
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_uvloop_different_runtime_error(
+@patch_socket
+async def test_ipv64_laddr_bind_fails_eyeballs_first_ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
-    """Test different RuntimeErrors are handled when connecting a socket with uvloop."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1646,20 +1467,23 @@ async def test_uvloop_different_runtime_error(
         fileno=mock.MagicMock(return_value=1),
     )
     create_calls = []
-    counter = 0
 
     def _socket(*args, **kw):
         for attr in kw:
             setattr(mock_socket, attr, kw[attr])
+        if kw["family"] == socket.AF_INET:
+            mock_socket.bind.side_effect = OSError(5, "bind fail")
+
         return mock_socket
 
     async def _sock_connect(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        nonlocal counter
-        counter += 1
-        raise RuntimeError(counter)
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1701,35 +1525,29 @@ async def test_uvloop_different_runtime_error(
         ),
     ]
     loop = asyncio.get_running_loop()
-    # We should get the same exception raised if they are all the same
     with (
         mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(RuntimeError, match="Multiple exceptions: 1, 2, 3"),
+        pytest.raises(OSError, match="ipv6 fail"),
     ):
         assert (
             await start_connection(
                 addr_info,
                 happy_eyeballs_delay=0.3,
-                interleave=2,
+                interleave=1,
                 local_addr_infos=local_addr_infos,
             )
             == mock_socket
         )
 
-    # All calls failed
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-        ("dead:aaaa::", 80, 0, 0),
-        ("107.6.106.83", 80),
-    ]
+    # We only tried IPv6 since bind to IPv4 failed
+    assert create_calls == [("dead:beef::", 80, 0, 0)]
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_uvloop_mixing_os_and_runtime_error(
+@patch_socket
+async def test_ipv64_laddr_bind_fails_eyeballs_interleave_first__ipv6_fails(
     m_socket: ModuleType,
 ) -> None:
-    """Test uvloop raising OSError and RuntimeError."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1737,22 +1555,23 @@ async def test_uvloop_mixing_os_and_runtime_error(
         fileno=mock.MagicMock(return_value=1),
     )
     create_calls = []
-    counter = 0
 
     def _socket(*args, **kw):
         for attr in kw:
             setattr(mock_socket, attr, kw[attr])
+        if kw["family"] == socket.AF_INET:
+            mock_socket.bind.side_effect = OSError(5, "bind fail")
+
         return mock_socket
 
     async def _sock_connect(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        nonlocal counter
-        counter += 1
-        if counter == 1:
-            raise RuntimeError(counter)
-        raise OSError(counter, f"all fail {counter}")
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1794,11 +1613,7 @@ async def test_uvloop_mixing_os_and_runtime_error(
         ),
     ]
     loop = asyncio.get_running_loop()
-    # We should get the same exception raised if they are all the same
-    with (
-        mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(OSError, match="Multiple exceptions: 1"),
-    ):
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
         assert (
             await start_connection(
                 addr_info,
@@ -1809,24 +1624,17 @@ async def test_uvloop_mixing_os_and_runtime_error(
             == mock_socket
         )
 
-    # All calls failed
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-        ("dead:aaaa::", 80, 0, 0),
-        ("107.6.106.83", 80),
-    ]
+    # IPv6 is tried first and fails, which means IPv4 is tried next but the laddr
+    # build fails so we move on to the next IPv6 and it succeeds
+    assert create_calls == [("dead:beef::", 80, 0, 0), ("dead:aaaa::", 80, 0, 0)]
+    assert mock_socket.family == socket.AF_INET6
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_handling_system_exit(
+@patch_socket
+async def test_ipv64_laddr_socket_fails(
     m_socket: ModuleType,
 ) -> None:
-    """Test handling SystemExit."""
-
-    class MockSystemExit(BaseException):
-        """Mock SystemExit."""
-
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1836,15 +1644,16 @@ async def test_handling_system_exit(
     create_calls = []
 
     def _socket(*args, **kw):
-        for attr in kw:
-            setattr(mock_socket, attr, kw[attr])
-        return mock_socket
+        raise Exception("Something really went wrong")
 
     async def _sock_connect(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        raise MockSystemExit
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1887,29 +1696,26 @@ async def test_handling_system_exit(
     ]
     loop = asyncio.get_running_loop()
     with (
-        pytest.raises(MockSystemExit),
         mock.patch.object(loop, "sock_connect", _sock_connect),
-        mock.patch.object(_staggered, "RE_RAISE_EXCEPTIONS", (MockSystemExit,)),
+        pytest.raises(Exception, match="Something really went wrong"),
     ):
-        await start_connection(
-            addr_info,
-            happy_eyeballs_delay=0.3,
-            interleave=2,
-            local_addr_infos=local_addr_infos,
+        assert (
+            await start_connection(
+                addr_info,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
         )
 
-    # Stopped after the first call
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-    ]
+    # All binds failed
+    assert create_calls == []
 
 
-@patch_socket
 @pytest.mark.asyncio
-async def test_cancellation_is_not_swallowed(
+@patch_socket
+async def test_ipv64_laddr_socket_blocking_fails(
     m_socket: ModuleType,
 ) -> None:
-    """Test that cancellation is not swallowed."""
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
         type=socket.SOCK_STREAM,
@@ -1921,13 +1727,17 @@ async def test_cancellation_is_not_swallowed(
     def _socket(*args, **kw):
         for attr in kw:
             setattr(mock_socket, attr, kw[attr])
+        mock_socket.setblocking.side_effect = Exception("Something really went wrong")
         return mock_socket
 
     async def _sock_connect(
         sock: socket.socket, address: tuple[str, int, int, int]
     ) -> None:
         create_calls.append(address)
-        await asyncio.sleep(1000)
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
 
     m_socket.socket = _socket  # type: ignore
     ipv6_addr_info = (
@@ -1969,40 +1779,26 @@ async def test_cancellation_is_not_swallowed(
         ),
     ]
     loop = asyncio.get_running_loop()
-    # We should get the same exception raised if they are all the same
     with (
         mock.patch.object(loop, "sock_connect", _sock_connect),
-        pytest.raises(asyncio.CancelledError),
+        pytest.raises(Exception, match="Something really went wrong"),
     ):
-        task = asyncio.create_task(
-            start_connection(
+        assert (
+            await start_connection(
                 addr_info,
-                happy_eyeballs_delay=0.3,
-                interleave=2,
                 local_addr_infos=local_addr_infos,
             )
+            == mock_socket
         )
-        await asyncio.sleep(0)
-        task.cancel()
-        await task
 
-    # After calls are cancelled now more are made
-    assert create_calls == [
-        ("dead:beef::", 80, 0, 0),
-    ]
+    # All binds failed
+    assert create_calls == []
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "connect_side_effect",
-    [
-        OSError("during connect"),
-        asyncio.CancelledError("during connect"),
-    ],
-)
 @patch_socket
-async def test_single_addr_info_close_errors(
-    m_socket: ModuleType, connect_side_effect: BaseException
+async def test_ipv64_laddr_eyeballs_ipv4_only_tried(
+    m_socket: ModuleType,
 ) -> None:
     mock_socket = mock.MagicMock(
         family=socket.AF_INET,
@@ -2010,135 +1806,1735 @@ async def test_single_addr_info_close_errors(
         proto=socket.IPPROTO_TCP,
         fileno=mock.MagicMock(return_value=1),
     )
-    mock_socket.configure_mock(
-        **{
-            "connect.side_effect": connect_side_effect,
-            "close.side_effect": OSError("during close"),
-        }
-    )
+    create_calls = []
 
     def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
         return mock_socket
 
-    m_socket.socket = _socket  # type: ignore
-
-    addr_info = [
-        (
-            socket.AF_INET,
-            socket.SOCK_STREAM,
-            socket.IPPROTO_TCP,
-            "",
-            ("107.6.106.82", 80),
-        )
-    ]
-    with pytest.raises(OSError, match="during close"):
-        await start_connection(addr_info)
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
 
+        return None
 
-def test_interleave_addrinfos():
-    """_interleave_addrinfos groups by family and round-robins across families."""
-    ipv6_1 = (
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
         socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("dead:beef::1", 80, 0, 0),
+        ("dead:beef::", 80, 0, 0),
     )
-    ipv6_2 = (
+    ipv6_addr_info_2 = (
         socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("dead:beef::2", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
     )
-    ipv6_3 = (
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        )
+    ]
+    loop = asyncio.get_running_loop()
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
+
+    # Only IPv4 addresses are tried because local_addr_infos is IPv4
+    assert mock_socket.family == socket.AF_INET
+    assert create_calls == [("107.6.106.83", 80)]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_ipv64_laddr_bind_fails_all_eyeballs_interleave_first__ipv6_fails(
+    m_socket: ModuleType,
+) -> None:
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        mock_socket.bind.side_effect = OSError(4, "bind fail")
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        if address[0] == "dead:beef::":
+            raise OSError(5, "ipv6 fail")
+
+        return None
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
         socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("dead:beef::3", 80, 0, 0),
+        ("dead:beef::", 80, 0, 0),
     )
-    ipv4_1 = (
-        socket.AF_INET,
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("107.6.106.1", 80),
+        ("dead:aaaa::", 80, 0, 0),
     )
-    ipv4_2 = (
+    ipv4_addr_info = (
         socket.AF_INET,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("107.6.106.2", 80),
+        ("107.6.106.83", 80),
     )
-
-    # Even split: strict round-robin, IPv6 first because it appears first.
-    assert impl._interleave_addrinfos([ipv6_1, ipv6_2, ipv4_1, ipv4_2]) == [
-        ipv6_1,
-        ipv4_1,
-        ipv6_2,
-        ipv4_2,
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
     ]
+    loop = asyncio.get_running_loop()
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="Multiple exceptions"),
+    ):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
 
-    # Uneven split: leftover IPv6 entries trail once IPv4 is exhausted.
-    assert impl._interleave_addrinfos([ipv6_1, ipv6_2, ipv6_3, ipv4_1]) == [
-        ipv6_1,
-        ipv4_1,
-        ipv6_2,
-        ipv6_3,
-    ]
+    # All binds failed
+    assert create_calls == []
 
-    # Family order follows first appearance: IPv4 leads here.
-    assert impl._interleave_addrinfos([ipv4_1, ipv6_1, ipv4_2]) == [
-        ipv4_1,
-        ipv6_1,
-        ipv4_2,
-    ]
 
-    # A single family keeps its original order.
-    assert impl._interleave_addrinfos([ipv4_1, ipv4_2]) == [ipv4_1, ipv4_2]
+@patch_socket
+@pytest.mark.asyncio
+async def test_all_same_exception_and_same_errno(
+    m_socket: ModuleType,
+) -> None:
+    """Test that all exceptions are the same and have the same errno."""
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
 
-    # No input, no output.
-    assert impl._interleave_addrinfos([]) == []
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
 
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        raise OSError(5, "all fail")
 
-def test_interleave_addrinfos_first_address_family_count():
-    """first_address_family_count keeps N of the first family up front."""
-    ipv6_1 = (
-        socket.AF_INET6,
-        socket.SOCK_STREAM,
-        socket.IPPROTO_TCP,
-        "",
-        ("dead:beef::1", 80, 0, 0),
-    )
-    ipv6_2 = (
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
         socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("dead:beef::2", 80, 0, 0),
+        ("dead:beef::", 80, 0, 0),
     )
-    ipv6_3 = (
+    ipv6_addr_info_2 = (
         socket.AF_INET6,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("dead:beef::3", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
     )
-    ipv4_1 = (
+    ipv4_addr_info = (
         socket.AF_INET,
         socket.SOCK_STREAM,
         socket.IPPROTO_TCP,
         "",
-        ("107.6.106.1", 80),
-    )
-
-    result = impl._interleave_addrinfos(
-        [ipv6_1, ipv6_2, ipv6_3, ipv4_1], first_address_family_count=2
+        ("107.6.106.83", 80),
     )
-    # The first two IPv6 entries stay ahead of the interleaved remainder.
-    assert result == [ipv6_1, ipv6_2, ipv4_1, ipv6_3]
-    # Nothing is dropped or duplicated by the reshuffle.
-    assert set(result) == {ipv6_1, ipv6_2, ipv6_3, ipv4_1}
-    assert len(result) == 4
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    # We should get the same exception raised if they are all the same
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="all fail") as exc_info,
+    ):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
+
+    assert exc_info.value.errno == 5
+
+    # All calls failed
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
+        ("107.6.106.83", 80),
+    ]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_all_same_exception_and_with_different_errno(
+    m_socket: ModuleType,
+) -> None:
+    """Test no errno is set if all OSError have different errno."""
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        raise OSError(len(create_calls), "all fail")
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    # We should get the same exception raised if they are all the same
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="all fail") as exc_info,
+    ):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
+
+    # No errno is set if they are all different
+    assert exc_info.value.errno is None
+
+    # All calls failed
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
+        ("107.6.106.83", 80),
+    ]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_uvloop_runtime_error(
+    m_socket: ModuleType,
+) -> None:
+    """
+    Test RuntimeError is handled when connecting a socket with uvloop.
+
+    Connecting a socket can raise a RuntimeError, OSError or ValueError.
+
+    - OSError: If the address is invalid or the connection fails.
+    - ValueError: if a non-sock it passed (this should never happen).
+    https://github.com/python/cpython/blob/e44eebfc1eccdaaebc219accbfc705c9a9de068d/Lib/asyncio/selector_events.py#L271
+    - RuntimeError: If the file descriptor is already in use by a transport.
+
+    We should never get ValueError since we are using the correct types.
+
+    selector_events.py never seems to raise a RuntimeError, but it is possible
+    with uvloop. This test is to ensure that we handle it correctly.
+    """
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        raise RuntimeError("all fail")
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    # We should get the same exception raised if they are all the same
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(RuntimeError, match="all fail"),
+    ):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
+
+    # All calls failed
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
+        ("107.6.106.83", 80),
+    ]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_uvloop_different_runtime_error(
+    m_socket: ModuleType,
+) -> None:
+    """Test different RuntimeErrors are handled when connecting a socket with uvloop."""
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+    counter = 0
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        nonlocal counter
+        counter += 1
+        raise RuntimeError(counter)
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    # We should get the same exception raised if they are all the same
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(RuntimeError, match="Multiple exceptions: 1, 2, 3"),
+    ):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
+
+    # All calls failed
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
+        ("107.6.106.83", 80),
+    ]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_uvloop_mixing_os_and_runtime_error(
+    m_socket: ModuleType,
+) -> None:
+    """Test uvloop raising OSError and RuntimeError."""
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+    counter = 0
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        nonlocal counter
+        counter += 1
+        if counter == 1:
+            raise RuntimeError(counter)
+        raise OSError(counter, f"all fail {counter}")
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    # We should get the same exception raised if they are all the same
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="Multiple exceptions: 1"),
+    ):
+        assert (
+            await start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+            == mock_socket
+        )
+
+    # All calls failed
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+        ("dead:aaaa::", 80, 0, 0),
+        ("107.6.106.83", 80),
+    ]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_handling_system_exit(
+    m_socket: ModuleType,
+) -> None:
+    """Test handling SystemExit."""
+
+    class MockSystemExit(BaseException):
+        """Mock SystemExit."""
+
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        raise MockSystemExit
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    with (
+        pytest.raises(MockSystemExit),
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        mock.patch.object(_staggered, "RE_RAISE_EXCEPTIONS", (MockSystemExit,)),
+    ):
+        await start_connection(
+            addr_info,
+            happy_eyeballs_delay=0.3,
+            interleave=2,
+            local_addr_infos=local_addr_infos,
+        )
+
+    # Stopped after the first call
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+    ]
+
+
+@patch_socket
+@pytest.mark.asyncio
+async def test_cancellation_is_not_swallowed(
+    m_socket: ModuleType,
+) -> None:
+    """Test that cancellation is not swallowed."""
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        for attr in kw:
+            setattr(mock_socket, attr, kw[attr])
+        return mock_socket
+
+    async def _sock_connect(
+        sock: socket.socket, address: tuple[str, int, int, int]
+    ) -> None:
+        create_calls.append(address)
+        await asyncio.sleep(1000)
+
+    m_socket.socket = _socket  # type: ignore
+    ipv6_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::", 80, 0, 0),
+    )
+    ipv6_addr_info_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:aaaa::", 80, 0, 0),
+    )
+    ipv4_addr_info = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.83", 80),
+    )
+    addr_info = [ipv6_addr_info, ipv6_addr_info_2, ipv4_addr_info]
+    local_addr_infos = [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("::1", 0, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("127.0.0.1", 0),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    # We should get the same exception raised if they are all the same
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        task = asyncio.create_task(
+            start_connection(
+                addr_info,
+                happy_eyeballs_delay=0.3,
+                interleave=2,
+                local_addr_infos=local_addr_infos,
+            )
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    # After calls are cancelled now more are made
+    assert create_calls == [
+        ("dead:beef::", 80, 0, 0),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "connect_side_effect",
+    [
+        OSError("during connect"),
+        asyncio.CancelledError("during connect"),
+    ],
+)
+@patch_socket
+async def test_single_addr_info_close_errors(
+    m_socket: ModuleType, connect_side_effect: BaseException
+) -> None:
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    mock_socket.configure_mock(
+        **{
+            "connect.side_effect": connect_side_effect,
+            "close.side_effect": OSError("during close"),
+        }
+    )
+
+    def _socket(*args, **kw):
+        return mock_socket
+
+    m_socket.socket = _socket  # type: ignore
+
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
+        )
+    ]
+    with pytest.raises(OSError, match="during close"):
+        await start_connection(addr_info)
+
+
+def test_interleave_addrinfos():
+    """_interleave_addrinfos groups by family and round-robins across families."""
+    ipv6_1 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::1", 80, 0, 0),
+    )
+    ipv6_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::2", 80, 0, 0),
+    )
+    ipv6_3 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::3", 80, 0, 0),
+    )
+    ipv4_1 = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.1", 80),
+    )
+    ipv4_2 = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.2", 80),
+    )
+
+    # Even split: strict round-robin, IPv6 first because it appears first.
+    assert impl._interleave_addrinfos([ipv6_1, ipv6_2, ipv4_1, ipv4_2]) == [
+        ipv6_1,
+        ipv4_1,
+        ipv6_2,
+        ipv4_2,
+    ]
+
+    # Uneven split: leftover IPv6 entries trail once IPv4 is exhausted.
+    assert impl._interleave_addrinfos([ipv6_1, ipv6_2, ipv6_3, ipv4_1]) == [
+        ipv6_1,
+        ipv4_1,
+        ipv6_2,
+        ipv6_3,
+    ]
+
+    # Family order follows first appearance: IPv4 leads here.
+    assert impl._interleave_addrinfos([ipv4_1, ipv6_1, ipv4_2]) == [
+        ipv4_1,
+        ipv6_1,
+        ipv4_2,
+    ]
+
+    # A single family keeps its original order.
+    assert impl._interleave_addrinfos([ipv4_1, ipv4_2]) == [ipv4_1, ipv4_2]
+
+    # No input, no output.
+    assert impl._interleave_addrinfos([]) == []
+
+
+def test_interleave_addrinfos_first_address_family_count():
+    """first_address_family_count keeps N of the first family up front."""
+    ipv6_1 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::1", 80, 0, 0),
+    )
+    ipv6_2 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::2", 80, 0, 0),
+    )
+    ipv6_3 = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("dead:beef::3", 80, 0, 0),
+    )
+    ipv4_1 = (
+        socket.AF_INET,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("107.6.106.1", 80),
+    )
+
+    result = impl._interleave_addrinfos(
+        [ipv6_1, ipv6_2, ipv6_3, ipv4_1], first_address_family_count=2
+    )
+    # The first two IPv6 entries stay ahead of the interleaved remainder.
+    assert result == [ipv6_1, ipv6_2, ipv4_1, ipv6_3]
+    # Nothing is dropped or duplicated by the reshuffle.
+    assert set(result) == {ipv6_1, ipv6_2, ipv6_3, ipv4_1}
+    assert len(result) == 4
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_happy_eyeballs_use_timer_wheel(
+    m_socket: ModuleType,
+) -> None:
+    mock_socket = mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+    create_calls = []
+
+    def _socket(*args, **kw):
+        return mock_socket
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address)
+        if address[0] == "107.6.106.82":
+            await asyncio.sleep(10)
+
+    m_socket.socket = _socket  # type: ignore
+    addr_info = [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.83", 80),
+        ),
+    ]
+    loop = asyncio.get_running_loop()
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        assert (
+            await start_connection(
+                addr_info, happy_eyeballs_delay=0.01, use_timer_wheel=True
+            )
+            == mock_socket
+        )
+
+    assert create_calls == [("107.6.106.82", 80), ("107.6.106.83", 80)]
+
+
+IPV6_ADDR_INFO = (
+    socket.AF_INET6,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("dead:beef::", 80, 0, 0),
+)
+IPV4_ADDR_INFO = (
+    socket.AF_INET,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("107.6.106.82", 80),
+)
+
+
+def _new_mock_socket(*args, **kw):
+    return mock.MagicMock(
+        family=socket.AF_INET,
+        type=socket.SOCK_STREAM,
+        proto=socket.IPPROTO_TCP,
+        fileno=mock.MagicMock(return_value=1),
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_connections_empty_addr_infos() -> None:
+    with pytest.raises(ValueError, match="addr_infos must not be empty"):
+        await start_connections([], 2)
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connections(m_socket: ModuleType) -> None:
+    """All sockets connect to the first address that works."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    sockets: list[mock.MagicMock] = []
+
+    def _socket(*args, **kw):
+        sock = _new_mock_socket()
+        sockets.append(sock)
+        return sock
+
+    m_socket.socket = _socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if address[0] == "dead:beef::":
+            await asyncio.sleep(10)
+
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        socks = await start_connections(
+            [IPV6_ADDR_INFO, IPV4_ADDR_INFO], 3, happy_eyeballs_delay=0.01
+        )
+
+    assert len(socks) == 3
+    assert len(set(socks)) == 3
+    assert create_calls == ["dead:beef::"] * 3 + ["107.6.106.82"] * 3
+    assert socks == sockets[3:]
+    for sock in sockets[3:]:
+        sock.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connections_closes_extras(m_socket: ModuleType) -> None:
+    """Sockets connecting after enough others did are closed."""
+    loop = asyncio.get_running_loop()
+    sockets = []
+    gate = loop.create_future()
+
+    def _socket(*args, **kw):
+        sock = _new_mock_socket()
+        sockets.append(sock)
+        return sock
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        await gate
+
+    m_socket.socket = _socket  # type: ignore
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        task = asyncio.create_task(
+            start_connections(
+                [IPV6_ADDR_INFO, IPV4_ADDR_INFO], 2, happy_eyeballs_delay=0.01
+            )
+        )
+        await asyncio.sleep(0.05)
+        assert len(sockets) == 4
+        gate.set_result(None)
+        socks = await task
+
+    assert socks == sockets[:2]
+    for sock in sockets[:2]:
+        sock.close.assert_not_called()
+    for sock in sockets[2:]:
+        sock.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connections_fewer_sockets(m_socket: ModuleType) -> None:
+    """The sockets which connected are returned when the addresses run out."""
+    loop = asyncio.get_running_loop()
+    attempts = 0
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        nonlocal attempts
+        attempts += 1
+        first = attempts == 1
+        await asyncio.sleep(0)
+        if not first:
+            raise OSError(errno.ECONNREFUSED, "refused")
+
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        socks = await start_connections([IPV4_ADDR_INFO], 3)
+
+    assert len(socks) == 1
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connections_all_fail(m_socket: ModuleType) -> None:
+    loop = asyncio.get_running_loop()
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        raise OSError(errno.ECONNREFUSED, "refused")
+
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="refused") as exc_info,
+    ):
+        await start_connections(
+            [IPV6_ADDR_INFO, IPV4_ADDR_INFO],
+            2,
+            happy_eyeballs_delay=lambda index, addr_info: 0.01,
+        )
+    assert exc_info.value.errno == errno.ECONNREFUSED
+
+
+IPV6_ADDR_INFO_2 = (
+    socket.AF_INET6,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("dead:beef::2", 80, 0, 0),
+)
+IPV4_ADDR_INFO_2 = (
+    socket.AF_INET,
+    socket.SOCK_STREAM,
+    socket.IPPROTO_TCP,
+    "",
+    ("107.6.106.83", 80),
+)
+
+
+def _fake_resolver(answers, lookups=None):
+    """Return a resolver answering each family after a delay."""
+
+    async def _resolve(host, port, family):
+        if lookups is not None:
+            lookups.append((host, port, family))
+        delay, result = answers[family]
+        await asyncio.sleep(delay)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    return _resolve
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_by_host(m_socket: ModuleType) -> None:
+    """Addresses of both families are interleaved, IPv6 first."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    lookups: list[tuple[str, int, int]] = []
+    sockets: list[mock.MagicMock] = []
+
+    def _socket(*args, **kw):
+        sock = _new_mock_socket()
+        sockets.append(sock)
+        return sock
+
+    m_socket.socket = _socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if address[0] != "107.6.106.83":
+            await asyncio.sleep(10)
+
+    resolver = _fake_resolver(
+        {
+            socket.AF_INET6: (0, [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2]),
+            socket.AF_INET: (0, [IPV4_ADDR_INFO, IPV4_ADDR_INFO_2]),
+        },
+        lookups,
+    )
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        sock = await start_connection_by_host(
+            "example.org", 80, resolver=resolver, happy_eyeballs_delay=0.01
+        )
+
+    assert sock is sockets[3]
+    assert sockets[3].close.call_count == 0
+    assert lookups == [
+        ("example.org", 80, socket.AF_INET6),
+        ("example.org", 80, socket.AF_INET),
+    ]
+    assert create_calls == [
+        "dead:beef::",
+        "107.6.106.82",
+        "dead:beef::2",
+        "107.6.106.83",
+    ]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_by_host_slow_aaaa(m_socket: ModuleType) -> None:
+    """IPv4 is used after the resolution delay, late IPv6 answers join."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if address[0] != "dead:beef::":
+            await asyncio.sleep(10)
+
+    resolver = _fake_resolver(
+        {
+            socket.AF_INET6: (0.05, [IPV6_ADDR_INFO]),
+            socket.AF_INET: (0, [IPV4_ADDR_INFO, IPV4_ADDR_INFO_2]),
+        }
+    )
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        await start_connection_by_host(
+            "example.org",
+            80,
+            resolver=resolver,
+            resolution_delay=0.001,
+            happy_eyeballs_delay=1,
+        )
+
+    # The IPv6 address starts right away when its delay already passed
+    assert create_calls == ["107.6.106.82", "dead:beef::"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_by_host_aaaa_within_delay(
+    m_socket: ModuleType,
+) -> None:
+    """IPv6 is preferred when it is resolved within the resolution delay."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+
+    resolver = _fake_resolver(
+        {
+            socket.AF_INET6: (0.01, [IPV6_ADDR_INFO]),
+            socket.AF_INET: (0, [IPV4_ADDR_INFO]),
+        }
+    )
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        await start_connection_by_host(
+            "example.org", 80, resolver=resolver, resolution_delay=10
+        )
+
+    assert create_calls == ["dead:beef::"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_by_host_family(m_socket: ModuleType) -> None:
+    """Only the requested family is looked up."""
+    loop = asyncio.get_running_loop()
+    lookups: list[tuple[str, int, int]] = []
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        pass
+
+    resolver = _fake_resolver({socket.AF_INET: (0, [IPV4_ADDR_INFO])}, lookups)
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        await start_connection_by_host(
+            "example.org", 80, resolver=resolver, family=socket.AF_INET
+        )
+
+    assert lookups == [("example.org", 80, socket.AF_INET)]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_by_host_getaddrinfo(m_socket: ModuleType) -> None:
+    """The default resolver uses loop.getaddrinfo."""
+    loop = asyncio.get_running_loop()
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _getaddrinfo(host, port, *, family, type, proto):
+        assert (type, proto) == (socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        if family == socket.AF_INET6:
+            raise socket.gaierror(socket.EAI_NONAME, "no address")
+        return [IPV4_ADDR_INFO]
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        pass
+
+    with (
+        mock.patch.object(loop, "getaddrinfo", _getaddrinfo),
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+    ):
+        sock = await start_connection_by_host("example.org", 80)
+    assert sock is not None
+
+
+@pytest.mark.asyncio
+async def test_start_connection_by_host_resolve_errors() -> None:
+    """The resolution error is raised when no address was resolved."""
+    error = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+    resolver = _fake_resolver({socket.AF_INET6: (0, error), socket.AF_INET: (0, error)})
+    with pytest.raises(socket.gaierror, match="not known"):
+        await start_connection_by_host("example.org", 80, resolver=resolver)
+
+    resolver = _fake_resolver({socket.AF_INET6: (0, []), socket.AF_INET: (0, [])})
+    with pytest.raises(OSError, match=r"could not resolve 'example\.org'"):
+        await start_connection_by_host("example.org", 80, resolver=resolver)
+
+    resolver = _fake_resolver(
+        {socket.AF_INET6: (0, error), socket.AF_INET: (0, ValueError("bug"))}
+    )
+    with pytest.raises(ValueError, match="bug"):
+        await start_connection_by_host("example.org", 80, resolver=resolver)
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_by_host_connect_errors(m_socket: ModuleType) -> None:
+    """The connection errors are raised once resolved addresses all fail."""
+    loop = asyncio.get_running_loop()
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        raise OSError(errno.ECONNREFUSED, "refused")
+
+    resolver = _fake_resolver(
+        {
+            socket.AF_INET6: (0, socket.gaierror(socket.EAI_NONAME, "no address")),
+            socket.AF_INET: (0, [IPV4_ADDR_INFO]),
+        }
+    )
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        pytest.raises(OSError, match="refused") as exc_info,
+    ):
+        await start_connection_by_host("example.org", 80, resolver=resolver)
+    assert exc_info.value.errno == errno.ECONNREFUSED
+
+
+@pytest.mark.asyncio
+async def test_start_connection_by_host_timeout() -> None:
+    """The timeout covers the resolution and cancels pending lookups."""
+    cancelled = []
+
+    async def _resolve(host, port, family):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(family)
+            raise
+        return []
+
+    with pytest.raises(StartConnectionTimeoutError, match=r"timed out after 0\.01"):
+        await start_connection_by_host(
+            "example.org", 80, resolver=_resolve, timeout=0.01
+        )
+    assert sorted(cancelled) == sorted([socket.AF_INET6, socket.AF_INET])
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_history(m_socket: ModuleType) -> None:
+    """The history records the attempts and reorders the next race."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    history = ConnectionHistory()
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if address[0] == "dead:beef::":
+            raise OSError(errno.ENETUNREACH, "unreachable")
+        if address[0] == "dead:beef::2":
+            await asyncio.sleep(10)
+
+    addr_infos = [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2, IPV4_ADDR_INFO, IPV4_ADDR_INFO_2]
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        await start_connection(addr_infos, happy_eyeballs_delay=0.01, history=history)
+        assert create_calls == ["dead:beef::", "107.6.106.82"]
+        assert history.rtt(IPV4_ADDR_INFO) is not None
+
+        create_calls.clear()
+        await start_connection(addr_infos, history=history)
+        # The winner goes first and the failed address last
+        assert create_calls == ["107.6.106.82"]
+
+        create_calls.clear()
+        await start_connection_by_host(
+            "example.org",
+            80,
+            resolver=_fake_resolver(
+                {
+                    socket.AF_INET6: (0, [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2]),
+                    socket.AF_INET: (0, [IPV4_ADDR_INFO_2, IPV4_ADDR_INFO]),
+                }
+            ),
+            happy_eyeballs_delay=0.1,
+            history=history,
+        )
+        assert create_calls == ["dead:beef::2", "107.6.106.82"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_backoff(m_socket: ModuleType) -> None:
+    """Addresses which failed are only attempted after the others."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    backoff = AddressBackoff()
+    history = ConnectionHistory()
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if address[0] == "107.6.106.82":
+            raise OSError(errno.ECONNREFUSED, "refused")
+
+    addr_infos = [IPV4_ADDR_INFO, IPV4_ADDR_INFO_2]
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        await start_connection(addr_infos, backoff=backoff, history=history)
+        assert create_calls == ["107.6.106.82", "107.6.106.83"]
+        assert backoff.is_bad(IPV4_ADDR_INFO)
+        assert history.rtt(IPV4_ADDR_INFO_2) is not None
+
+        create_calls.clear()
+        await start_connection(addr_infos, backoff=backoff)
+        assert create_calls == ["107.6.106.83"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_rfc6724(m_socket: ModuleType) -> None:
+    """The addresses are sorted by RFC 6724 before interleaving them."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    m_socket.socket = _new_mock_socket  # type: ignore
+    ula_addr_info = (
+        socket.AF_INET6,
+        socket.SOCK_STREAM,
+        socket.IPPROTO_TCP,
+        "",
+        ("fd00::1", 80, 0, 0),
+    )
+    sources = {"fd00::1": "fd00::2", "dead:beef::": None, "107.6.106.82": "10.0.0.1"}
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        raise OSError(errno.ECONNREFUSED, "refused")
+
+    addr_infos = [IPV6_ADDR_INFO, ula_addr_info, IPV4_ADDR_INFO]
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        mock.patch(
+            "aiohappyeyeballs.rfc6724.udp_source_address",
+            lambda addr_info: sources[addr_info[4][0]],
+        ),
+        pytest.raises(OSError),
+    ):
+        await start_connection(addr_infos, rfc6724=True)
+    assert create_calls == ["107.6.106.82", "fd00::1", "dead:beef::"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_family_health(m_socket: ModuleType) -> None:
+    """IPv4 leads once IPv6 attempts keep losing to it."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    family_health = FamilyHealth(threshold=2, timeout=0.005)
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if ":" in address[0]:
+            # Blackholed
+            await asyncio.sleep(10)
+
+    addr_infos = [IPV6_ADDR_INFO, IPV4_ADDR_INFO]
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        for _ in range(2):
+            await start_connection(
+                addr_infos, happy_eyeballs_delay=0.01, family_health=family_health
+            )
+        assert create_calls == ["dead:beef::", "107.6.106.82"] * 2
+        assert not family_health.is_healthy(socket.AF_INET6)
+
+        create_calls.clear()
+        await start_connection(
+            addr_infos, happy_eyeballs_delay=0.01, family_health=family_health
+        )
+        assert create_calls == ["107.6.106.82"]
+
+        create_calls.clear()
+        await start_connection_by_host(
+            "example.org",
+            80,
+            resolver=_fake_resolver(
+                {
+                    socket.AF_INET6: (0, [IPV6_ADDR_INFO]),
+                    socket.AF_INET: (0.01, [IPV4_ADDR_INFO]),
+                }
+            ),
+            happy_eyeballs_delay=0.01,
+            resolution_delay=0.1,
+            family_health=family_health,
+        )
+        # The IPv6 addresses were held back for the IPv4 lookup
+        assert create_calls == ["107.6.106.82"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_route_probe(m_socket: ModuleType) -> None:
+    """Addresses without a route are not attempted."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    probed = []
+    m_socket.socket = _new_mock_socket  # type: ignore
+    sources = {"dead:beef::": None, "107.6.106.82": "10.0.0.1"}
+
+    def _probe(addr_info: AddrInfoType) -> str | None:
+        probed.append(addr_info[4][0])
+        return sources[addr_info[4][0]]
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        raise OSError(errno.ECONNREFUSED, "refused")
+
+    route_probe = RouteProbe(probe=_probe)
+    addr_infos = [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2, IPV4_ADDR_INFO]
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        with pytest.raises(OSError):
+            await start_connection(
+                addr_infos, happy_eyeballs_delay=0.01, route_probe=route_probe
+            )
+        # The IPv6 addresses share a prefix, which has no route
+        assert create_calls == ["107.6.106.82"]
+        assert probed == ["dead:beef::", "107.6.106.82"]
+
+        create_calls.clear()
+        probed.clear()
+        route_probe.clear()
+        # Only a link-local IPv6 source address, sorted after IPv4
+        sources["dead:beef::"] = "fe80::1"
+        with pytest.raises(OSError):
+            await start_connection(
+                [IPV6_ADDR_INFO, IPV4_ADDR_INFO],
+                rfc6724=True,
+                route_probe=route_probe,
+            )
+        assert create_calls == ["107.6.106.82", "dead:beef::"]
+        # The routes are probed once for the filter and the sorting
+        assert probed == ["dead:beef::", "107.6.106.82"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_skip_unreachable(m_socket: ModuleType) -> None:
+    """Addresses of a family whose network is unreachable are skipped."""
+    loop = asyncio.get_running_loop()
+    create_calls = []
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        create_calls.append(address[0])
+        if ":" in address[0]:
+            raise OSError(errno.ENETUNREACH, "Network is unreachable")
+        raise OSError(errno.ECONNREFUSED, "Connection refused")
+
+    addr_infos = [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2, IPV4_ADDR_INFO, IPV4_ADDR_INFO_2]
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        for happy_eyeballs_delay in (None, 0.01):
+            create_calls.clear()
+            with pytest.raises(OSError, match="skipped connecting") as exc_info:
+                await start_connection(
+                    addr_infos,
+                    happy_eyeballs_delay=happy_eyeballs_delay,
+                    skip_unreachable=True,
+                )
+            assert "107.6.106.83" in create_calls
+            assert "dead:beef::2" not in create_calls
+            assert (
+                "skipped connecting to address ('dead:beef::2', 80, 0, 0): "
+                "network is unreachable" in str(exc_info.value)
+            )
+
+        # Server errors do not skip anything
+        create_calls.clear()
+        with pytest.raises(OSError, match="Connection refused"):
+            await start_connection(
+                [IPV4_ADDR_INFO, IPV4_ADDR_INFO_2], skip_unreachable=True
+            )
+        assert create_calls == ["107.6.106.82", "107.6.106.83"]
+
+        # Not skipped by default
+        create_calls.clear()
+        with pytest.raises(OSError):
+            await start_connection(addr_infos, happy_eyeballs_delay=0.01)
+        assert "dead:beef::2" in create_calls
+
+        create_calls.clear()
+        with pytest.raises(OSError, match="skipped connecting"):
+            await start_connection_by_host(
+                "example.org",
+                80,
+                resolver=_fake_resolver(
+                    {
+                        socket.AF_INET6: (0, [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2]),
+                        socket.AF_INET: (0, [IPV4_ADDR_INFO]),
+                    }
+                ),
+                happy_eyeballs_delay=0.01,
+                skip_unreachable=True,
+            )
+        assert create_calls == ["dead:beef::", "107.6.106.82"]
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_cancelled_after_winning(m_socket: ModuleType) -> None:
+    """The winning socket is closed if the caller is cancelled before it gets it."""
+    loop = asyncio.get_running_loop()
+    sockets = []
+    task: asyncio.Task[socket.socket] | None = None
+
+    def _socket(*args, **kw):
+        sock = _new_mock_socket()
+        sockets.append(sock)
+        return sock
+
+    attempt_done = _staggered._StaggeredRace._attempt_done
+
+    def _attempt_done(
+        race: _staggered._StaggeredRace[socket.socket],
+        fut: asyncio.Future[socket.socket],
+    ) -> bool:
+        next_attempt = attempt_done(race, fut)
+        if race.winners:
+            assert task is not None
+            # Cancelled once the race has its winner, before the caller resumes
+            task.cancel()
+        return next_attempt
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        # Not connected synchronously by the eager start of Python 3.12+
+        await asyncio.sleep(0)
+
+    m_socket.socket = _socket  # type: ignore
+    with (
+        mock.patch.object(loop, "sock_connect", _sock_connect),
+        mock.patch.object(_staggered._StaggeredRace, "_attempt_done", _attempt_done),
+    ):
+        task = asyncio.create_task(
+            start_connection([IPV6_ADDR_INFO, IPV4_ADDR_INFO], happy_eyeballs_delay=0.3)
+        )
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert len(sockets) == 1
+    sockets[0].close.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connections_cancelled(m_socket: ModuleType) -> None:
+    """The sockets connected so far are closed if the caller is cancelled."""
+    loop = asyncio.get_running_loop()
+    sockets = []
+
+    def _socket(*args, **kw):
+        sock = _new_mock_socket()
+        sockets.append(sock)
+        return sock
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        if len(sockets) > 2:
+            await asyncio.sleep(10)
+
+    m_socket.socket = _socket  # type: ignore
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                start_connections(
+                    [IPV6_ADDR_INFO, IPV4_ADDR_INFO], 3, happy_eyeballs_delay=0.01
+                ),
+                0.1,
+            )
+    assert len(sockets) >= 3
+    for sock in sockets:
+        sock.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch_socket
+async def test_start_connection_family_health_refused(m_socket: ModuleType) -> None:
+    """A host refusing on all its IPv6 addresses keeps IPv6 healthy."""
+    loop = asyncio.get_running_loop()
+    family_health = FamilyHealth(threshold=2)
+    m_socket.socket = _new_mock_socket  # type: ignore
+
+    async def _sock_connect(sock: socket.socket, address: tuple[str, int]) -> None:
+        raise ConnectionRefusedError(errno.ECONNREFUSED, "Connection refused")
+
+    with mock.patch.object(loop, "sock_connect", _sock_connect):
+        with pytest.raises(OSError):
+            await start_connection(
+                [IPV6_ADDR_INFO, IPV6_ADDR_INFO_2],
+                happy_eyeballs_delay=0.01,
+                family_health=family_health,
+            )
+    assert family_health.is_healthy(socket.AF_INET6)
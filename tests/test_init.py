@@ -1,5 +1,6 @@
-from aiohappyeyeballs import start_connection
+from aiohappyeyeballs import start_connection, start_connections
 
 
 def test_init():
     assert start_connection is not None
+    assert start_connections is not None
@@ -0,0 +1,177 @@
+import asyncio
+import socket
+from collections.abc import Generator
+from unittest import mock
+
+import pytest
+
+from aiohappyeyeballs import AddrInfoType, WarmPool, start_connection
+
+
+@pytest.fixture
+def listener() -> Generator[socket.socket, None, None]:
+    """A listening socket, connections complete in its backlog."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    try:
+        yield sock
+    finally:
+        sock.close()
+
+
+def _addr_infos(sock: socket.socket) -> list[AddrInfoType]:
+    return [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            sock.getsockname(),
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_acquire_warm_socket(listener: socket.socket) -> None:
+    """Test an idle socket is handed out and replaced in the background."""
+    addr_infos = _addr_infos(listener)
+    async with WarmPool(size=2) as pool:
+        await pool.warm(addr_infos)
+        assert len(pool) == 2
+        with mock.patch(
+            "aiohappyeyeballs.pool.start_connection", wraps=start_connection
+        ) as m_start_connection:
+            sock = await pool.acquire(addr_infos)
+            assert len(pool) == 1
+            assert m_start_connection.call_count == 0
+            await asyncio.sleep(0.05)
+            assert len(pool) == 2
+            assert m_start_connection.call_count == 1
+        assert sock.getpeername() == listener.getsockname()
+        sock.close()
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_cold(listener: socket.socket) -> None:
+    """Test a socket is connected right away if none is idle."""
+    addr_infos = _addr_infos(listener)
+    async with WarmPool() as pool:
+        sock = await pool.acquire(addr_infos)
+        assert sock.getpeername() == listener.getsockname()
+        sock.close()
+        await asyncio.sleep(0.05)
+        assert len(pool) == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_socket_is_not_handed_out(listener: socket.socket) -> None:
+    """Test a socket the server closed while it was idle is discarded."""
+    addr_infos = _addr_infos(listener)
+    async with WarmPool() as pool:
+        await pool.warm(addr_infos)
+        conn, _ = listener.accept()
+        conn.close()
+        await asyncio.sleep(0.01)
+        with mock.patch(
+            "aiohappyeyeballs.pool.start_connection", wraps=start_connection
+        ) as m_start_connection:
+            sock = await pool.acquire(addr_infos)
+            # One for the caller and one to fill the pool again
+            assert m_start_connection.call_count == 2
+        sock.close()
+
+
+@pytest.mark.asyncio
+async def test_data_is_left_in_the_socket(listener: socket.socket) -> None:
+    """Test the liveness check does not consume what the server sent."""
+    addr_infos = _addr_infos(listener)
+    async with WarmPool() as pool:
+        await pool.warm(addr_infos)
+        conn, _ = listener.accept()
+        conn.sendall(b"hello")
+        await asyncio.sleep(0.01)
+        sock = await pool.acquire(addr_infos)
+        assert await asyncio.get_running_loop().sock_recv(sock, 5) == b"hello"
+        sock.close()
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout(listener: socket.socket) -> None:
+    """Test idle sockets are closed and the destination forgotten."""
+    addr_infos = _addr_infos(listener)
+    async with WarmPool(size=2, idle_timeout=0.05) as pool:
+        await pool.warm(addr_infos)
+        assert len(pool) == 2
+        await asyncio.sleep(0.1)
+        assert len(pool) == 0
+        assert not pool._destinations
+
+
+@pytest.mark.asyncio
+async def test_expired_socket_is_not_handed_out(listener: socket.socket) -> None:
+    """Test an expired socket is discarded even before its timer ran."""
+    addr_infos = _addr_infos(listener)
+    loop = asyncio.get_running_loop()
+    async with WarmPool(idle_timeout=10) as pool:
+        await pool.warm(addr_infos)
+        with mock.patch.object(loop, "time", return_value=loop.time() + 10):
+            with mock.patch(
+                "aiohappyeyeballs.pool.start_connection", wraps=start_connection
+            ) as m_start_connection:
+                sock = await pool.acquire(addr_infos)
+                assert m_start_connection.call_count == 2
+        sock.close()
+
+
+@pytest.mark.asyncio
+async def test_connect_failure(listener: socket.socket) -> None:
+    """Test a failure to fill the pool is raised to warm() and acquire()."""
+    addr_infos = _addr_infos(listener)
+    listener.close()
+    async with WarmPool() as pool:
+        with pytest.raises(ConnectionRefusedError):
+            await pool.warm(addr_infos)
+        assert len(pool) == 0
+        assert not pool._destinations
+        with pytest.raises(OSError):
+            await pool.acquire(addr_infos)
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_close_while_filling(listener: socket.socket) -> None:
+    """Test closing the pool cancels connecting in the background."""
+    addr_infos = _addr_infos(listener)
+    pool = WarmPool(size=3)
+    sock = await pool.acquire(addr_infos)
+    await pool.close()
+    assert len(pool) == 0
+    sock.close()
+
+
+@pytest.mark.asyncio
+async def test_destinations_by_local_addr_infos(listener: socket.socket) -> None:
+    """Test the local addresses are part of the destination."""
+    addr_infos = _addr_infos(listener)
+    local_addr_infos = [
+        (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("127.0.0.1", 0))
+    ]
+    async with WarmPool() as pool:
+        await pool.warm(addr_infos)
+        await pool.warm(addr_infos, local_addr_infos)
+        assert len(pool) == 2
+        sock = await pool.acquire(addr_infos, local_addr_infos)
+        assert sock.getsockname()[0] == "127.0.0.1"
+        sock.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_arguments() -> None:
+    """Test the size and the addresses are validated."""
+    with pytest.raises(ValueError, match="size must be at least 1"):
+        WarmPool(size=0)
+    with pytest.raises(ValueError, match="addr_infos must not be empty"):
+        await WarmPool().acquire([])
@@ -0,0 +1,324 @@
+import asyncio
+import socket
+import struct
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+import pytest_asyncio
+
+from aiohappyeyeballs import ResolutionCache, StubResolver, start_connection_by_host
+from aiohappyeyeballs.resolver import _encode_name, _parse_response, _ServerFailure
+
+A, CNAME, AAAA = 1, 5, 28
+
+
+class FakeNameserver:
+    """A nameserver answering from a dict of records over UDP and TCP."""
+
+    def __init__(self) -> None:
+        # (name, qtype) -> list of (rtype, rdata)
+        self.records: dict[tuple[str, int], list[tuple[int, bytes]]] = {}
+        self.queries: list[tuple[str, str, int]] = []
+        self.truncate = False
+        self.drop = 0
+        self.rcode: int | None = None
+        self.port = 0
+
+    def add(self, name: str, address: str) -> None:
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        qtype = AAAA if family == socket.AF_INET6 else A
+        self.records.setdefault((name, qtype), []).append(
+            (qtype, socket.inet_pton(family, address))
+        )
+
+    def answer(self, query: bytes, transport: str) -> bytes | None:
+        self.queries.append((transport, *self._question(query)))
+        if transport == "udp" and self.drop:
+            self.drop -= 1
+            return None
+        qid = query[:2]
+        name, qtype = self._question(query)
+        question = query[12:]
+        records = self.records.get((name, qtype), [])
+        exists = any(key[0] == name for key in self.records)
+        rcode = self.rcode if self.rcode is not None else (0 if exists else 3)
+        flags = 0x8180 | rcode
+        if transport == "udp" and self.truncate:
+            return qid + struct.pack("!HHHHH", flags | 0x0200, 1, 0, 0, 0) + question
+        answers = b""
+        for rtype, rdata in records:
+            # Compressed owner name pointing at the question
+            answers += b"\xc0\x0c" + struct.pack("!HHIH", rtype, 1, 60, len(rdata))
+            answers += rdata
+        return (
+            qid
+            + struct.pack("!HHHHH", flags, 1, len(records), 0, 0)
+            + question
+            + answers
+        )
+
+    @staticmethod
+    def _question(query: bytes) -> tuple[str, int]:
+        offset = 12
+        labels = []
+        while length := query[offset]:
+            labels.append(query[offset + 1 : offset + 1 + length].decode())
+            offset += 1 + length
+        return ".".join(labels), struct.unpack_from("!H", query, offset + 1)[0]
+
+
+class _UDPServer(asyncio.DatagramProtocol):
+    def __init__(self, server: FakeNameserver) -> None:
+        self.server = server
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        if (response := self.server.answer(data, "udp")) is not None:
+            self.transport.sendto(response, addr)  # type: ignore[attr-defined]
+
+
+@pytest_asyncio.fixture
+async def nameserver() -> AsyncGenerator[FakeNameserver, None]:
+    loop = asyncio.get_running_loop()
+    server = FakeNameserver()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _UDPServer(server), local_addr=("127.0.0.1", 0)
+    )
+    server.port = transport.get_extra_info("sockname")[1]
+
+    async def _handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+        response = server.answer(await reader.readexactly(length), "tcp")
+        assert response is not None
+        writer.write(struct.pack("!H", len(response)) + response)
+        await writer.drain()
+        writer.close()
+
+    tcp_server = await asyncio.start_server(_handle, "127.0.0.1", server.port)
+    try:
+        yield server
+    finally:
+        transport.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+
+def _resolver(nameserver: FakeNameserver, **kwargs: Any) -> StubResolver:
+    kwargs.setdefault("search", [])
+    kwargs.setdefault("ndots", 1)
+    kwargs.setdefault("timeout", 0.5)
+    kwargs.setdefault("attempts", 1)
+    return StubResolver(["127.0.0.1"], port=nameserver.port, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_resolve(nameserver: FakeNameserver) -> None:
+    """Test both families are resolved, IPv6 first."""
+    nameserver.add("example.org", "107.6.106.82")
+    nameserver.add("example.org", "dead:beef::")
+    resolver = _resolver(nameserver)
+    assert await resolver.resolve("example.org", 80) == [
+        (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("dead:beef::", 80, 0, 0),
+        ),
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 80),
+        ),
+    ]
+    assert await resolver("example.org", 443, socket.AF_INET) == [
+        (
+            socket.AF_INET,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            ("107.6.106.82", 443),
+        )
+    ]
+    assert await resolver.resolve(
+        "example.org", 53, socket.AF_INET, socket.SOCK_DGRAM
+    ) == [
+        (
+            socket.AF_INET,
+            socket.SOCK_DGRAM,
+            socket.IPPROTO_UDP,
+            "",
+            ("107.6.106.82", 53),
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resolve_one_family_missing(nameserver: FakeNameserver) -> None:
+    """Test a host with IPv4 only resolves, unless IPv6 is asked for."""
+    nameserver.add("example.org", "107.6.106.82")
+    resolver = _resolver(nameserver)
+    assert [ai[4][0] for ai in await resolver.resolve("example.org", 80)] == [
+        "107.6.106.82"
+    ]
+    with pytest.raises(socket.gaierror) as exc_info:
+        await resolver.resolve("example.org", 80, socket.AF_INET6)
+    assert exc_info.value.errno == getattr(socket, "EAI_NODATA", socket.EAI_NONAME)
+
+
+@pytest.mark.asyncio
+async def test_resolve_nxdomain(nameserver: FakeNameserver) -> None:
+    """Test a name that does not exist."""
+    with pytest.raises(socket.gaierror, match="not known") as exc_info:
+        await _resolver(nameserver).resolve("missing.example.org", 80)
+    assert exc_info.value.errno == socket.EAI_NONAME
+
+
+@pytest.mark.asyncio
+async def test_resolve_cname(nameserver: FakeNameserver) -> None:
+    """Test the addresses after a CNAME in the answer are used."""
+    nameserver.records[("www.example.org", A)] = [
+        (CNAME, _encode_name("example.org")),
+        (A, socket.inet_pton(socket.AF_INET, "107.6.106.82")),
+    ]
+    addr_infos = await _resolver(nameserver).resolve(
+        "www.example.org", 80, socket.AF_INET
+    )
+    assert [ai[4] for ai in addr_infos] == [("107.6.106.82", 80)]
+
+
+@pytest.mark.asyncio
+async def test_tcp_fallback(nameserver: FakeNameserver) -> None:
+    """Test a truncated answer is queried again over TCP."""
+    nameserver.add("example.org", "107.6.106.82")
+    nameserver.truncate = True
+    addr_infos = await _resolver(nameserver).resolve("example.org", 80, socket.AF_INET)
+    assert [ai[4] for ai in addr_infos] == [("107.6.106.82", 80)]
+    assert [query[0] for query in nameserver.queries] == ["udp", "tcp"]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_timeout(nameserver: FakeNameserver) -> None:
+    """Test the query is retried when no answer arrives in time."""
+    nameserver.add("example.org", "107.6.106.82")
+    nameserver.drop = 1
+    resolver = _resolver(nameserver, timeout=0.05, attempts=2)
+    addr_infos = await resolver.resolve("example.org", 80, socket.AF_INET)
+    assert [ai[4] for ai in addr_infos] == [("107.6.106.82", 80)]
+    assert len(nameserver.queries) == 2
+
+    nameserver.drop = 2
+    with pytest.raises(socket.gaierror, match="Temporary failure") as exc_info:
+        await resolver.resolve("example.org", 80, socket.AF_INET)
+    assert exc_info.value.errno == socket.EAI_AGAIN
+
+
+@pytest.mark.asyncio
+async def test_server_failure(nameserver: FakeNameserver) -> None:
+    """Test a server failure is a temporary failure."""
+    nameserver.add("example.org", "107.6.106.82")
+    nameserver.rcode = 2
+    with pytest.raises(socket.gaierror, match="Temporary failure"):
+        await _resolver(nameserver).resolve("example.org", 80, socket.AF_INET)
+
+
+@pytest.mark.asyncio
+async def test_search_domains(nameserver: FakeNameserver) -> None:
+    """Test short names are tried with the search domains first."""
+    nameserver.add("db.internal.example", "10.0.0.1")
+    resolver = _resolver(nameserver, search=["other.example", "internal.example"])
+    addr_infos = await resolver.resolve("db", 80, socket.AF_INET)
+    assert [ai[4] for ai in addr_infos] == [("10.0.0.1", 80)]
+    assert [query[1] for query in nameserver.queries] == [
+        "db.other.example",
+        "db.internal.example",
+    ]
+    nameserver.queries.clear()
+    with pytest.raises(socket.gaierror):
+        await resolver.resolve("db.", 80, socket.AF_INET)
+    assert [query[1] for query in nameserver.queries] == ["db"]
+
+
+@pytest.mark.asyncio
+async def test_ip_literal() -> None:
+    """Test IP addresses are returned without a query."""
+    resolver = StubResolver(["192.0.2.1"], search=[], ndots=1, timeout=1, attempts=1)
+    assert await resolver.resolve("127.0.0.1", 80) == [
+        (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("127.0.0.1", 80))
+    ]
+    assert await resolver.resolve("::1", 80, socket.AF_INET6) == [
+        (socket.AF_INET6, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("::1", 80, 0, 0))
+    ]
+    with pytest.raises(socket.gaierror):
+        await resolver.resolve("::1", 80, socket.AF_INET)
+    with pytest.raises(socket.gaierror):
+        await resolver.resolve("example.org", 80, socket.AF_UNIX)
+
+
+@pytest.mark.asyncio
+async def test_with_start_connection_by_host(nameserver: FakeNameserver) -> None:
+    """Test the resolver and its cache with start_connection_by_host."""
+    nameserver.add("example.org", "107.6.106.82")
+    loop = asyncio.get_running_loop()
+    cache = ResolutionCache(_resolver(nameserver))
+    sock = mock.MagicMock()
+    with mock.patch.object(loop, "sock_connect", mock.AsyncMock()) as sock_connect:
+        for _ in range(2):
+            assert (
+                await start_connection_by_host(
+                    "example.org", 80, resolver=cache, socket_factory=lambda _: sock
+                )
+                is sock
+            )
+    assert sock_connect.await_args is not None
+    assert sock_connect.await_args[0][1] == ("107.6.106.82", 80)
+    assert len(nameserver.queries) == 2
+    assert cache.hits == 2
+
+
+def test_resolv_conf(tmp_path: Path) -> None:
+    """Test the settings are read from resolv.conf."""
+    resolv_conf = tmp_path / "resolv.conf"
+    resolv_conf.write_text(
+        "# comment\n"
+        "domain ignored.example\n"
+        "search a.example b.example\n"
+        "nameserver 192.0.2.1\n"
+        "nameserver fe80::1%eth0\n"
+        "nameserver 2001:db8::1 ; comment\n"
+        "nameserver 192.0.2.2\n"
+        "nameserver 192.0.2.3\n"
+        "options ndots:2 timeout:3 attempts:4 rotate\n"
+    )
+    resolver = StubResolver(resolv_conf=str(resolv_conf))
+    assert resolver.nameservers == ["192.0.2.1", "2001:db8::1", "192.0.2.2"]
+    assert resolver.search == ["a.example", "b.example"]
+    assert (resolver.ndots, resolver.timeout, resolver.attempts) == (2, 3.0, 4)
+
+    resolver = StubResolver(resolv_conf=str(tmp_path / "missing"))
+    assert resolver.nameservers == ["127.0.0.1"]
+    assert (resolver.ndots, resolver.timeout, resolver.attempts) == (1, 5.0, 2)
+
+
+def test_parse_response_rejects_malformed() -> None:
+    """Test responses to other queries or cut short are rejected."""
+    qname = _encode_name("example.org")
+    question = qname + struct.pack("!HH", A, 1)
+    header = struct.pack("!HHHHHH", 1, 0x8180, 1, 1, 0, 0)
+    with pytest.raises(_ServerFailure, match="not a response"):
+        _parse_response(header + question, 2, qname, A)
+    with pytest.raises(_ServerFailure, match="another question"):
+        _parse_response(header + question, 1, qname, AAAA)
+    with pytest.raises(_ServerFailure, match="malformed"):
+        _parse_response(header + question + b"\xc0", 1, qname, A)
+    with pytest.raises(_ServerFailure, match="compression pointers"):
+        _parse_response(header + question + b"\xc0\x1d" * 2, 1, qname, A)
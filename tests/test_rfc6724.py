@@ -0,0 +1,148 @@
+import errno
+import socket
+from collections.abc import Mapping
+from unittest import mock
+
+from aiohappyeyeballs import AddrInfoType, sort_by_rfc6724
+from aiohappyeyeballs.rfc6724 import udp_source_address
+
+
+def _addr_info(address: str) -> AddrInfoType:
+    if ":" in address:
+        return (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            (address, 80, 0, 0),
+        )
+    return (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, 80))
+
+
+def _sort(destinations: list[str], sources: Mapping[str, str | None]) -> list[str]:
+    """Sort the destinations with a source address per destination."""
+    sorted_addr_infos = sort_by_rfc6724(
+        [_addr_info(address) for address in destinations],
+        lambda addr_info: sources[addr_info[4][0]],
+    )
+    return [addr_info[4][0] for addr_info in sorted_addr_infos]
+
+
+def test_unusable_last():
+    """Test destinations without a source address go last (rule 1)."""
+    assert _sort(
+        ["2001:db8::1", "198.51.100.1"],
+        {"2001:db8::1": None, "198.51.100.1": "192.0.2.10"},
+    ) == ["198.51.100.1", "2001:db8::1"]
+
+
+def test_matching_scope_first():
+    """Test destinations in the scope of their source go first (rule 2)."""
+    # Only a link-local IPv6 source, e.g. no IPv6 router on the link
+    assert _sort(
+        ["2001:db8::1", "198.51.100.1"],
+        {"2001:db8::1": "fe80::1", "198.51.100.1": "192.0.2.10"},
+    ) == ["198.51.100.1", "2001:db8::1"]
+
+
+def test_matching_label_first():
+    """Test destinations with the label of their source go first (rule 5)."""
+    # A 6to4 source address prefers the 6to4 destination
+    assert _sort(
+        ["2001:db8::1", "2002:c633:6401::1"],
+        {"2001:db8::1": "2002:c000:20a::1", "2002:c633:6401::1": "2002:c000:20a::1"},
+    ) == ["2002:c633:6401::1", "2001:db8::1"]
+
+
+def test_precedence():
+    """Test IPv6 before IPv4 before unique local IPv6 (rule 6)."""
+    sources = {
+        "fd00::1": "fd00::2",
+        "198.51.100.1": "192.0.2.10",
+        "2001:db8::1": "2001:db8::2",
+    }
+    assert _sort(["fd00::1", "198.51.100.1", "2001:db8::1"], sources) == [
+        "2001:db8::1",
+        "198.51.100.1",
+        "fd00::1",
+    ]
+
+
+def test_smaller_scope_first():
+    """Test link-local destinations go before global ones (rule 8)."""
+    assert _sort(
+        ["198.51.100.1", "169.254.0.1"],
+        {"198.51.100.1": "192.0.2.10", "169.254.0.1": "169.254.0.2"},
+    ) == ["169.254.0.1", "198.51.100.1"]
+
+
+def test_longest_matching_prefix():
+    """Test the IPv6 destination closest to its source goes first (rule 9)."""
+    sources = {"2001:db8:1::1": "2001:db8:2::2", "2001:db8:2::1": "2001:db8:2::2"}
+    assert _sort(["2001:db8:1::1", "2001:db8:2::1"], sources) == [
+        "2001:db8:2::1",
+        "2001:db8:1::1",
+    ]
+    # Not applied to IPv4
+    sources = {"198.51.100.1": "198.51.100.2", "203.0.113.1": "198.51.100.2"}
+    assert _sort(["203.0.113.1", "198.51.100.1"], sources) == [
+        "203.0.113.1",
+        "198.51.100.1",
+    ]
+
+
+def test_stable():
+    """Test destinations equal by every rule keep their order."""
+    sources = {"2001:db8::1": "2001:db8::2", "2001:db8::3": "2001:db8::2"}
+    assert _sort(["2001:db8::3", "2001:db8::1"], sources) == [
+        "2001:db8::3",
+        "2001:db8::1",
+    ]
+    assert _sort([], {}) == []
+
+
+def test_scoped_source_address():
+    """Test a source address with a zone index is understood."""
+    assert _sort(
+        ["198.51.100.1", "fe80::1"],
+        {"198.51.100.1": "192.0.2.10", "fe80::1": "fe80::2%eth0"},
+    ) == ["fe80::1", "198.51.100.1"]
+
+
+def test_udp_source_address():
+    """Test the source address is looked up with a UDP socket."""
+    assert udp_source_address(_addr_info("127.0.0.1")) == "127.0.0.1"
+    with mock.patch.object(
+        socket.socket, "connect", side_effect=OSError(errno.ENETUNREACH, "down")
+    ):
+        assert udp_source_address(_addr_info("192.0.2.1")) is None
+
+
+def test_default_source_address():
+    """Test the default lookup sorts loopback first."""
+    assert sort_by_rfc6724([_addr_info("192.0.2.1"), _addr_info("127.0.0.1")])[
+        0
+    ] == _addr_info("127.0.0.1")
+
+
+def test_scopes():
+    """Test the scope of multicast and site-local destinations (rule 8)."""
+    sources = {
+        "ff05::1": "2001:db8::2",
+        "ff02::1": "2001:db8::2",
+        "fec0::1": "2001:db8::2",
+        "2001:db8::1": "2001:db8::2",
+    }
+    assert _sort(["2001:db8::1", "fec0::1", "ff05::1", "ff02::1"], sources) == [
+        "2001:db8::1",
+        "ff02::1",
+        "ff05::1",
+        "fec0::1",
+    ]
+
+
+def test_not_an_address():
+    """Test a destination which is not an IP address goes last."""
+    assert _sort(
+        ["unix", "198.51.100.1"], {"unix": "192.0.2.10", "198.51.100.1": "192.0.2.10"}
+    ) == ["198.51.100.1", "unix"]
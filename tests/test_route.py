@@ -0,0 +1,127 @@
+import socket
+
+import pytest
+
+from aiohappyeyeballs import AddrInfoType, RouteProbe
+
+from .conftest import FakeClock
+
+
+def _addr_info(address: str, scope_id: int = 0) -> AddrInfoType:
+    if ":" in address:
+        return (
+            socket.AF_INET6,
+            socket.SOCK_STREAM,
+            socket.IPPROTO_TCP,
+            "",
+            (address, 80, 0, scope_id),
+        )
+    return (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, 80))
+
+
+class FakeProbe:
+    """Route everything but IPv6, counting the probes."""
+
+    def __init__(self) -> None:
+        self.probed: list[str] = []
+
+    def __call__(self, addr_info: AddrInfoType) -> str | None:
+        self.probed.append(addr_info[4][0])
+        return None if addr_info[0] == socket.AF_INET6 else "192.0.2.1"
+
+
+def test_filter():
+    """Test the addresses without a route are dropped."""
+    route_probe = RouteProbe(probe=FakeProbe())
+    addr_infos = [_addr_info("2001:db8::1"), _addr_info("198.51.100.1")]
+    assert route_probe.filter(addr_infos) == [_addr_info("198.51.100.1")]
+    assert route_probe.is_routable(_addr_info("198.51.100.1"))
+    assert not route_probe.is_routable(_addr_info("2001:db8::1"))
+    assert route_probe.source_address(_addr_info("198.51.100.1")) == "192.0.2.1"
+
+
+def test_filter_keeps_all_without_any_route():
+    """Test all addresses are kept if none has a route."""
+    route_probe = RouteProbe(probe=FakeProbe())
+    addr_infos = [_addr_info("2001:db8::1"), _addr_info("2001:db8::2")]
+    assert route_probe.filter(addr_infos) == addr_infos
+    assert route_probe.filter([]) == []
+
+
+def test_cached_per_prefix():
+    """Test the route is probed once per prefix until the ttl expired."""
+    clock = FakeClock()
+    probe = FakeProbe()
+    route_probe = RouteProbe(ttl=30, clock=clock, probe=probe)
+    route_probe.filter(
+        [
+            _addr_info("198.51.100.1"),
+            _addr_info("198.51.100.2"),
+            _addr_info("203.0.113.1"),
+            _addr_info("2001:db8::1"),
+            _addr_info("2001:db8::2"),
+            _addr_info("2001:db8:1::1"),
+        ]
+    )
+    assert probe.probed == [
+        "198.51.100.1",
+        "203.0.113.1",
+        "2001:db8::1",
+        "2001:db8:1::1",
+    ]
+    assert len(route_probe) == 4
+    probe.probed.clear()
+    clock.now = 29.9
+    route_probe.filter([_addr_info("198.51.100.3")])
+    assert probe.probed == []
+    clock.now = 30
+    route_probe.filter([_addr_info("198.51.100.3")])
+    assert probe.probed == ["198.51.100.3"]
+    route_probe.clear()
+    assert len(route_probe) == 0
+
+
+def test_scope_id_is_part_of_the_prefix():
+    """Test link-local addresses are probed per interface."""
+    probe = FakeProbe()
+    route_probe = RouteProbe(probe=probe)
+    route_probe.is_routable(_addr_info("fe80::1", 1))
+    route_probe.is_routable(_addr_info("fe80::2", 1))
+    route_probe.is_routable(_addr_info("fe80::1", 2))
+    assert probe.probed == ["fe80::1", "fe80::1"]
+
+
+def test_not_an_address_is_not_cached():
+    """Test addresses which are not IP addresses are probed every time."""
+    probe = FakeProbe()
+    route_probe = RouteProbe(probe=probe)
+    route_probe.is_routable(_addr_info("unix"))
+    route_probe.is_routable(_addr_info("unix"))
+    assert probe.probed == ["unix", "unix"]
+    assert len(route_probe) == 0
+
+
+def test_max_size():
+    """Test the least recently used prefixes are evicted."""
+    probe = FakeProbe()
+    route_probe = RouteProbe(max_size=2, probe=probe)
+    route_probe.is_routable(_addr_info("198.51.100.1"))
+    route_probe.is_routable(_addr_info("203.0.113.1"))
+    route_probe.is_routable(_addr_info("198.51.100.1"))
+    route_probe.is_routable(_addr_info("192.0.2.1"))
+    assert len(route_probe) == 2
+    probe.probed.clear()
+    route_probe.is_routable(_addr_info("198.51.100.1"))
+    route_probe.is_routable(_addr_info("203.0.113.1"))
+    assert probe.probed == ["203.0.113.1"]
+
+
+def test_default_probe():
+    """Test the default probe finds the route to loopback."""
+    assert RouteProbe().source_address(_addr_info("127.0.0.1")) == "127.0.0.1"
+
+
+def test_invalid_max_size():
+    """Test max_size must be positive."""
+    with pytest.raises(ValueError, match="max_size must be at least 1"):
+        RouteProbe(max_size=0)
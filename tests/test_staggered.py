@@ -1,9 +1,13 @@
 import asyncio
 import sys
+import time
+from collections.abc import Awaitable, Callable
 from functools import partial
+from unittest import mock
 
 import pytest
 
+from aiohappyeyeballs import _staggered, _timer_wheel
 from aiohappyeyeballs._staggered import staggered_race
 
 
@@ -85,3 +89,1019 @@ def test_multiple_winners_eager_task_factory():
 
     loop.run_until_complete(run())
     loop.close()
+
+
+@pytest.mark.asyncio
+async def test_coro_fn_raises():
+    """Test a coroutine function raising when called counts as a failure."""
+
+    def fail():
+        raise ValueError("no good")
+
+    async def coro():
+        return "ok"
+
+    winner, index, excs = await staggered_race([fail, coro], delay=None)
+    assert winner == "ok"
+    assert index == 1
+    assert isinstance(excs[0], ValueError)
+    assert excs[1] is None
+
+
+@pytest.mark.asyncio
+async def test_awaitable_futures():
+    """Test coroutine functions may return plain futures."""
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    loop.call_soon(fut.set_result, "fut")
+
+    winner, index, excs = await staggered_race([lambda: fut], delay=0.1)
+    assert winner == "fut"
+    assert index == 0
+    assert excs == [None]
+
+
+@pytest.mark.asyncio
+async def test_earlier_failure_does_not_start_next():
+    """Test only the failure of the latest attempt starts the next one."""
+    loop = asyncio.get_running_loop()
+    started = []
+    fail_first = loop.create_future()
+    finish_second = loop.create_future()
+
+    async def first():
+        started.append(0)
+        await fail_first
+        raise ValueError("no good")
+
+    async def second():
+        started.append(1)
+        await finish_second
+        return "second"
+
+    async def third():
+        started.append(2)
+        return "third"
+
+    task = loop.create_task(staggered_race([first, second, third], delay=0.05))
+    await asyncio.sleep(0.07)
+    fail_first.set_result(None)
+    await asyncio.sleep(0)
+    finish_second.set_result(None)
+    winner, index, excs = await task
+    assert started == [0, 1]
+    assert winner == "second"
+    assert index == 1
+    assert isinstance(excs[0], ValueError)
+    assert excs[1] is None
+
+
+@pytest.mark.asyncio
+async def test_system_exit_calling_coro_fn():
+    """Test SystemExit raised by a coroutine function is re-raised."""
+
+    class MockSystemExit(BaseException):
+        """Mock SystemExit."""
+
+    def exit_now():
+        raise MockSystemExit
+
+    with (
+        mock.patch.object(_staggered, "RE_RAISE_EXCEPTIONS", (MockSystemExit,)),
+        pytest.raises(MockSystemExit),
+    ):
+        await staggered_race([exit_now], delay=0.1)
+
+
+@pytest.mark.asyncio
+async def test_system_exit_while_cancelling_losers():
+    """Test SystemExit raised by a cancelled loser is re-raised."""
+
+    class MockSystemExit(BaseException):
+        """Mock SystemExit."""
+
+    loop = asyncio.get_running_loop()
+    finish = loop.create_future()
+
+    async def loser():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            raise MockSystemExit from None
+
+    async def winner():
+        await finish
+        return "winner"
+
+    task = loop.create_task(staggered_race([loser, winner], delay=0.01))
+    await asyncio.sleep(0.05)
+    finish.set_result(None)
+    with (
+        mock.patch.object(_staggered, "RE_RAISE_EXCEPTIONS", (MockSystemExit,)),
+        pytest.raises(MockSystemExit),
+    ):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_many_candidates_last_wins():
+    """Test a large race where every earlier candidate is still pending."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx != 63:
+            await asyncio.sleep(10)
+        return idx
+
+    coros = [partial(coro, idx) for idx in range(64)]
+
+    winner, index, excs = await staggered_race(coros, delay=0.0001)
+    assert started == list(range(64))
+    assert winner == 63
+    assert index == 63
+    assert len(excs) == 64
+    assert all(isinstance(exc, asyncio.CancelledError) for exc in excs[:63])
+    assert excs[63] is None
+
+
+@pytest.mark.asyncio
+async def test_done_future_wins_without_loop_iteration():
+    """Test an already completed first attempt is returned right away."""
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    fut.set_result("done")
+    ran: list[bool] = []
+    handle = loop.call_soon(ran.append, True)
+
+    coro_fns: list[Callable[[], Awaitable[object]]] = [
+        lambda: fut,
+        partial(asyncio.sleep, 1),
+    ]
+    winner, index, excs = await staggered_race(coro_fns, delay=0.1)
+    assert ran == []
+    handle.cancel()
+    assert winner == "done"
+    assert index == 0
+    assert excs == [None]
+
+
+@pytest.mark.asyncio
+async def test_done_future_failure_starts_next():
+    """Test an already failed attempt moves straight on to the next one."""
+    loop = asyncio.get_running_loop()
+    failed = loop.create_future()
+    failed.set_exception(ValueError("no good"))
+    done = loop.create_future()
+    done.set_result("done")
+
+    winner, index, excs = await staggered_race(
+        [lambda: failed, lambda: done], delay=0.1
+    )
+    assert winner == "done"
+    assert index == 1
+    assert isinstance(excs[0], ValueError)
+    assert excs[1] is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires python3.12 or higher")
+@pytest.mark.asyncio
+async def test_first_attempt_started_eagerly():
+    """Test a first attempt that completes without suspending wins right away."""
+    loop = asyncio.get_running_loop()
+    started = []
+    ran: list[bool] = []
+
+    async def coro(idx):
+        started.append(idx)
+        return idx
+
+    handle = loop.call_soon(ran.append, True)
+    winner, index, excs = await staggered_race(
+        [partial(coro, idx) for idx in range(2)], delay=0.1
+    )
+    assert ran == []
+    handle.cancel()
+    assert started == [0]
+    assert winner == 0
+    assert index == 0
+    assert excs == [None]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires python3.12 or higher")
+@pytest.mark.asyncio
+async def test_first_attempt_fails_eagerly():
+    """Test a first attempt that fails without suspending starts the next one."""
+
+    async def fail():
+        raise ValueError("no good")
+
+    async def coro():
+        await asyncio.sleep(0)
+        return "ok"
+
+    winner, index, excs = await staggered_race([fail, coro], delay=0.1)
+    assert winner == "ok"
+    assert index == 1
+    assert isinstance(excs[0], ValueError)
+    assert excs[1] is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires python3.12 or higher")
+def test_synchronous_failures_eager_task_factory():
+    """Test many attempts failing without suspending under an eager factory."""
+    loop = asyncio.new_event_loop()
+    eager_task_factory = asyncio.create_eager_task_factory(asyncio.Task)
+    loop.set_task_factory(eager_task_factory)
+    asyncio.set_event_loop(None)
+
+    async def fail():
+        raise ValueError("no good")
+
+    async def coro():
+        return "ok"
+
+    async def run():
+        winner, index, excs = await staggered_race([fail] * 2000 + [coro], delay=0.1)
+        assert winner == "ok"
+        assert index == 2000
+        assert len(excs) == 2001
+
+    loop.run_until_complete(run())
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_cancel_losers_in_background():
+    """Test the winner is returned before the losers finish cancelling."""
+    loop = asyncio.get_running_loop()
+    finish = loop.create_future()
+    loser_done = loop.create_future()
+
+    async def loser():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Slow cleanup on cancellation
+            await asyncio.sleep(0.01)
+            loser_done.set_result(None)
+
+    async def winner():
+        await finish
+        return "winner"
+
+    task = loop.create_task(
+        staggered_race([loser, winner], delay=0.01, cancel_losers_in_background=True)
+    )
+    await asyncio.sleep(0.05)
+    finish.set_result(None)
+    winner_result, index, excs = await task
+    assert winner_result == "winner"
+    assert index == 1
+    assert not loser_done.done()
+    assert excs == [None, None]
+
+    await loser_done
+    await asyncio.sleep(0)
+    assert isinstance(excs[0], asyncio.CancelledError)
+    assert excs[1] is None
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight():
+    """Test new attempts are held back until a running one fails."""
+    loop = asyncio.get_running_loop()
+    started = []
+    fail = [loop.create_future() for _ in range(4)]
+
+    async def coro(idx):
+        started.append(idx)
+        await fail[idx]
+        if idx == 3:
+            return idx
+        raise ValueError(idx)
+
+    coros = [partial(coro, idx) for idx in range(4)]
+    task = loop.create_task(staggered_race(coros, delay=0.001, max_in_flight=2))
+    await asyncio.sleep(0.05)
+    assert started == [0, 1]
+
+    # An earlier attempt failing frees a slot for the held back start
+    fail[0].set_result(None)
+    await asyncio.sleep(0.05)
+    assert started == [0, 1, 2]
+
+    fail[2].set_result(None)
+    await asyncio.sleep(0.05)
+    assert started == [0, 1, 2, 3]
+
+    fail[3].set_result(None)
+    winner, index, excs = await task
+    assert winner == 3
+    assert index == 3
+    assert isinstance(excs[0], ValueError)
+    assert isinstance(excs[1], asyncio.CancelledError)
+    assert isinstance(excs[2], ValueError)
+    assert excs[3] is None
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_must_be_positive():
+    """Test max_in_flight must allow at least one attempt."""
+    with pytest.raises(ValueError, match="max_in_flight must be at least 1"):
+        await staggered_race([], delay=0.1, max_in_flight=0)
+
+
+@pytest.mark.asyncio
+async def test_delay_sequence():
+    """Test a sequence of delays is applied per attempt, reusing the last one."""
+    loop = asyncio.get_running_loop()
+    started = []
+    finish = loop.create_future()
+
+    async def coro(idx):
+        started.append(idx)
+        await finish
+        return idx
+
+    coros = [partial(coro, idx) for idx in range(4)]
+    task = loop.create_task(staggered_race(coros, delay=[0.001, 10]))
+    await asyncio.sleep(0.05)
+    assert started == [0, 1]
+    finish.set_result(None)
+    winner, index, excs = await task
+    assert winner == 0
+    assert index == 0
+    assert excs == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_delay_sequence_reuses_last():
+    """Test the last delay of the sequence is reused."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx != 3:
+            await asyncio.sleep(10)
+        return idx
+
+    coros = [partial(coro, idx) for idx in range(4)]
+    winner, index, _ = await staggered_race(coros, delay=[0.001])
+    assert started == [0, 1, 2, 3]
+    assert winner == 3
+    assert index == 3
+
+
+@pytest.mark.asyncio
+async def test_delay_sequence_must_not_be_empty():
+    """Test an empty delay sequence is rejected."""
+    with pytest.raises(ValueError, match="delay sequence must not be empty"):
+        await staggered_race([], delay=[])
+
+
+@pytest.mark.asyncio
+async def test_delay_callable():
+    """Test a delay callable gets the index of the attempt to be scheduled."""
+    loop = asyncio.get_running_loop()
+    started = []
+    delay_calls = []
+    fail_second = loop.create_future()
+
+    async def coro(idx):
+        started.append(idx)
+        if idx == 0:
+            await asyncio.sleep(10)
+        if idx == 1:
+            await fail_second
+            raise ValueError(idx)
+        return idx
+
+    def delay(index):
+        delay_calls.append(index)
+        # Only start the third attempt once the second one fails
+        return 0.001 if index == 1 else None
+
+    coros = [partial(coro, idx) for idx in range(4)]
+    task = loop.create_task(staggered_race(coros, delay=delay))
+    await asyncio.sleep(0.05)
+    assert started == [0, 1]
+    assert delay_calls == [1, 2]
+    fail_second.set_result(None)
+    winner, index, excs = await task
+    assert started == [0, 1, 2]
+    assert delay_calls == [1, 2, 3]
+    assert winner == 2
+    assert index == 2
+    assert isinstance(excs[0], asyncio.CancelledError)
+    assert isinstance(excs[1], ValueError)
+    assert excs[2] is None
+
+
+@pytest.mark.asyncio
+async def test_delay_zero_starts_right_away():
+    """Test a delay of 0 from a sequence starts the next attempt right away."""
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        await asyncio.sleep(10)
+
+    coros = [partial(coro, idx) for idx in range(3)]
+    task = loop.create_task(staggered_race(coros, delay=[0, 10]))
+    await asyncio.sleep(0.01)
+    assert started == [0, 1]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_delay_zero_runs_sequentially():
+    """Test a scalar delay of 0 only starts an attempt once the previous fails."""
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        await asyncio.sleep(10)
+
+    coros = [partial(coro, idx) for idx in range(3)]
+    task = loop.create_task(staggered_race(coros, delay=0))
+    await asyncio.sleep(0.01)
+    assert started == [0]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_delay_callable_raises():
+    """Test an error of the delay callable is raised from the race."""
+    cancelled = []
+
+    async def coro():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def delay(index):
+        if index == 2:
+            raise ValueError("no delay")
+        return 0.001
+
+    with pytest.raises(ValueError, match="no delay"):
+        await asyncio.wait_for(staggered_race([coro] * 3, delay=delay), 1)
+    assert cancelled == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_deadline_cuts_off_running_attempts():
+    """Test attempts still running at the deadline are cancelled."""
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx == 0:
+            raise ValueError(idx)
+        await asyncio.sleep(10)
+        return idx  # pragma: no cover
+
+    coros = [partial(coro, idx) for idx in range(4)]
+    winner, index, excs = await staggered_race(
+        coros, delay=[0.001, 0.001, 10], deadline=loop.time() + 0.05
+    )
+    # The fourth attempt would only have started after the deadline
+    assert started == [0, 1, 2]
+    assert winner is None
+    assert index is None
+    assert isinstance(excs[0], ValueError)
+    assert isinstance(excs[1], TimeoutError)
+    assert isinstance(excs[2], TimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_deadline_already_passed():
+    """Test nothing is started once the deadline has passed."""
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def coro(idx):
+        started.append(idx)  # pragma: no cover
+
+    winner, index, excs = await staggered_race(
+        [partial(coro, 0)], delay=0.1, deadline=loop.time() - 1
+    )
+    assert started == []
+    assert winner is None
+    assert index is None
+    assert excs == []
+
+
+@pytest.mark.asyncio
+async def test_winner_before_deadline():
+    """Test a winner before the deadline is returned as usual."""
+    loop = asyncio.get_running_loop()
+
+    async def coro(idx):
+        await asyncio.sleep(0)
+        return idx
+
+    winner, index, excs = await staggered_race(
+        [partial(coro, 0)], delay=0.1, deadline=loop.time() + 10
+    )
+    assert winner == 0
+    assert index == 0
+    assert excs == [None]
+
+
+@pytest.mark.asyncio
+async def test_winner_at_deadline():
+    """Test a winner found in the same loop iteration as the deadline wins."""
+    loop = asyncio.get_running_loop()
+
+    async def coro():
+        await asyncio.sleep(0)
+        # Block the loop until the deadline is due
+        time.sleep(0.02)
+        return "winner"
+
+    winner, index, excs = await staggered_race(
+        [coro], delay=0.1, deadline=loop.time() + 0.01
+    )
+    assert winner == "winner"
+    assert index == 0
+    assert excs == [None]
+
+
+@pytest.mark.asyncio
+async def test_overdue_attempts_start_right_away():
+    """Test attempts overdue after the loop ran late start at once."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(
+        staggered_race([partial(coro, i) for i in range(4)], delay=0.01)
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert started == [0]
+    # Block the loop for longer than three delays
+    time.sleep(0.05)
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert started == [0, 1, 2, 3]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_schedule_moves_back_after_failure():
+    """Test the schedule is rebased when an attempt fails early."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx == 0:
+            await asyncio.sleep(0.05)
+            raise OSError("fail")
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(
+        staggered_race([partial(coro, i) for i in range(3)], delay=0.1)
+    )
+    # The timer armed for 0.1 fires before attempt 2 is due at 0.15
+    await asyncio.sleep(0.12)
+    assert started == [0, 1]
+    await asyncio.sleep(0.08)
+    assert started == [0, 1, 2]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_schedule_moves_forward_after_failure():
+    """Test the timer is re-armed when the rebased schedule is earlier."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx == 0:
+            await asyncio.sleep(0)
+            raise OSError("fail")
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(
+        staggered_race([partial(coro, i) for i in range(3)], delay=[10, 0.01])
+    )
+    await asyncio.sleep(0.05)
+    assert started == [0, 1, 2]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_use_timer_wheel():
+    """Test the race timers can be scheduled on the shared timer wheel."""
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx == 2:
+            return idx
+        await asyncio.sleep(10)
+
+    with mock.patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+        winner, index, excs = await staggered_race(
+            [partial(coro, i) for i in range(3)],
+            delay=0.01,
+            deadline=loop.time() + 10,
+            use_timer_wheel=True,
+        )
+    assert winner == 2
+    assert index == 2
+    assert started == [0, 1, 2]
+    assert len(excs) == 3
+    # The race timers, deadline included, share the timer of the wheel
+    callbacks = {c.args[1].__qualname__ for c in call_at.call_args_list}
+    assert "TimerWheel._run" in callbacks
+    assert not any(name.startswith("_StaggeredRace") for name in callbacks)
+    assert loop not in _timer_wheel._WHEELS
+
+
+@pytest.mark.asyncio
+async def test_async_iterable():
+    """Test racing coroutine functions from an async iterable."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        await asyncio.sleep(0)
+        if idx < 2:
+            raise OSError(idx)
+        return idx
+
+    async def candidates():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield partial(coro, i)
+
+    winner, index, excs = await staggered_race(candidates(), delay=10)
+    assert winner == 2
+    assert index == 2
+    assert started == [0, 1, 2]
+    assert [type(e) for e in excs] == [OSError, OSError, type(None)]
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_exhausted():
+    """Test the race ends without a winner once the source is exhausted."""
+
+    async def coro():
+        raise OSError("fail")
+
+    async def candidates():
+        yield coro
+        await asyncio.sleep(0.01)
+        yield coro
+        await asyncio.sleep(0.01)
+
+    winner, index, excs = await staggered_race(candidates(), delay=10)
+    assert winner is None
+    assert index is None
+    assert len(excs) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_exhausted_while_running():
+    """Test the source running out while an attempt is still running."""
+    fail = asyncio.get_running_loop().create_future()
+
+    async def coro():
+        await fail
+        raise OSError("fail")
+
+    async def candidates():
+        yield coro
+
+    task = asyncio.create_task(staggered_race(candidates(), delay=None))
+    await asyncio.sleep(0.01)
+    fail.set_result(None)
+    winner, index, excs = await task
+    assert winner is None
+    assert index is None
+    assert len(excs) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_raises():
+    """Test an exception from the source is raised from the race."""
+    cancelled = []
+
+    async def coro():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def candidates():
+        yield coro
+        await asyncio.sleep(0)
+        raise ValueError("resolution failed")
+
+    with pytest.raises(ValueError, match="resolution failed"):
+        await staggered_race(candidates(), delay=10)
+    assert cancelled == [True]
+
+
+@pytest.mark.parametrize("delay", [0.01, None], ids=["timer", "failure"])
+@pytest.mark.asyncio
+async def test_iterable_raises_mid_race(delay):
+    """Test an exception from the iterator after the first start is raised."""
+    cancelled = []
+
+    async def coro():
+        try:
+            await asyncio.sleep(10 if delay else 0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        raise OSError("fail")
+
+    def candidates():
+        yield coro
+        raise ValueError("no more candidates")
+
+    with pytest.raises(ValueError, match="no more candidates"):
+        await asyncio.wait_for(staggered_race(candidates(), delay=delay), 1)
+    assert cancelled == ([True] if delay else [])
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_cancelled_on_winner():
+    """Test the source is cancelled once there is a winner."""
+    closed = []
+
+    async def coro():
+        return "winner"
+
+    async def candidates():
+        try:
+            yield coro
+            await asyncio.sleep(10)
+        finally:
+            closed.append(True)
+
+    winner, index, _ = await staggered_race(candidates(), delay=10)
+    assert winner == "winner"
+    assert index == 0
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_candidate_queue_append_while_running():
+    """Test candidates appended mid-race join it."""
+    queue: _staggered.CandidateQueue[int] = _staggered.CandidateQueue()
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx == 0:
+            await asyncio.sleep(10)
+        return idx
+
+    queue.append(partial(coro, 0))
+    task = asyncio.create_task(staggered_race(queue, delay=0.01))
+    # The stagger delay passes before the next candidate is known
+    await asyncio.sleep(0.05)
+    assert started == [0]
+    assert not queue.closed
+    queue.append(partial(coro, 1))
+    queue.close()
+    winner, index, excs = await task
+    assert winner == 1
+    assert index == 1
+    assert started == [0, 1]
+    assert len(queue) == 0
+    assert isinstance(excs[0], asyncio.CancelledError)
+
+
+@pytest.mark.asyncio
+async def test_candidate_queue_closed():
+    """Test a closed queue ends the race and rejects new candidates."""
+
+    async def coro():
+        raise OSError("fail")
+
+    queue = _staggered.CandidateQueue([coro, coro])
+    assert len(queue) == 2
+    queue.close()
+    with pytest.raises(RuntimeError, match="CandidateQueue is closed"):
+        queue.append(coro)
+    winner, index, excs = await staggered_race(queue, delay=None)
+    assert winner is None
+    assert index is None
+    assert len(excs) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_system_exit_while_cancelled():
+    """Test SystemExit raised by the source while it is cancelled."""
+
+    class MockSystemExit(BaseException):
+        """Mock SystemExit."""
+
+    async def coro():
+        return "winner"
+
+    async def candidates():
+        yield coro
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            raise MockSystemExit from None
+
+    with (
+        mock.patch.object(_staggered, "RE_RAISE_EXCEPTIONS", (MockSystemExit,)),
+        pytest.raises(MockSystemExit),
+    ):
+        await staggered_race(candidates(), delay=10)
+
+
+@pytest.mark.asyncio
+async def test_staggered_race_many():
+    """Test racing for several winners starts the missing ones together."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        await asyncio.sleep(0)
+        if idx == 0:
+            raise OSError("fail")
+        return idx
+
+    winners, excs = await _staggered.staggered_race_many(
+        [partial(coro, i) for i in range(6)], delay=10, count=3
+    )
+    # 0, 1 and 2 start together, once nothing is running the one
+    # winner still missing is started right away.
+    assert started == [0, 1, 2, 3]
+    assert winners == [(1, 1), (2, 2), (3, 3)]
+    assert isinstance(excs[0], OSError)
+    assert excs[1:] == [None, None, None]
+
+
+@pytest.mark.asyncio
+async def test_staggered_race_many_delay():
+    """Test the missing winners are started together after the delay."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        if idx < 2:
+            await asyncio.sleep(10)
+        await asyncio.sleep(0)
+        return idx
+
+    winners, excs = await _staggered.staggered_race_many(
+        [partial(coro, i) for i in range(6)], delay=0.01, count=2
+    )
+    assert started == [0, 1, 2, 3]
+    assert winners == [(2, 2), (3, 3)]
+    assert [type(e) for e in excs[:2]] == [asyncio.CancelledError] * 2
+
+
+@pytest.mark.asyncio
+async def test_staggered_race_many_runs_out():
+    """Test the winners found are returned when the coroutines run out."""
+
+    async def coro(idx):
+        await asyncio.sleep(0)
+        if idx:
+            raise OSError("fail")
+        return idx
+
+    winners, excs = await _staggered.staggered_race_many(
+        [partial(coro, i) for i in range(3)], delay=None, count=3
+    )
+    assert winners == [(0, 0)]
+    assert len(excs) == 3
+
+
+@pytest.mark.asyncio
+async def test_staggered_race_many_count_validation():
+    """Test count must be at least 1."""
+    with pytest.raises(ValueError, match="count must be at least 1"):
+        await _staggered.staggered_race_many([], delay=None, count=0)
+
+
+@pytest.mark.asyncio
+async def test_staggered_race_many_all_winners():
+    """Test the race ends once all winners are found."""
+    started = []
+
+    async def coro(idx):
+        started.append(idx)
+        await asyncio.sleep(0)
+        return idx
+
+    winners, excs = await _staggered.staggered_race_many(
+        [partial(coro, i) for i in range(5)], delay=10, count=2
+    )
+    assert winners == [(0, 0), (1, 1)]
+    assert started == [0, 1]
+    assert excs == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_on_late_result():
+    """Test results of attempts completing after the winner are disposed."""
+    loop = asyncio.get_running_loop()
+    gate = loop.create_future()
+    late: list[object] = []
+
+    async def coro(idx):
+        await gate
+        return idx
+
+    task = asyncio.create_task(
+        staggered_race(
+            [partial(coro, i) for i in range(3)],
+            delay=0.001,
+            on_late_result=late.append,
+        )
+    )
+    await asyncio.sleep(0.05)
+    gate.set_result(None)
+    winner, index, _ = await task
+    assert (winner, index) == (0, 0)
+    assert late == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_on_late_result_in_background():
+    """Test late results are disposed when losers are reaped in the background."""
+    loop = asyncio.get_running_loop()
+    loser_done = loop.create_future()
+    late: list[object] = []
+
+    async def loser():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # Completes instead of being cancelled
+            return "late"
+        finally:
+            loop.call_soon(loser_done.set_result, None)
+
+    async def winner():
+        return "winner"
+
+    result, index, _ = await staggered_race(
+        [loser, winner],
+        delay=0.01,
+        cancel_losers_in_background=True,
+        on_late_result=late.append,
+    )
+    assert (result, index) == ("winner", 1)
+    assert late == []
+    await loser_done
+    assert late == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_on_late_result_error():
+    """Test an error from on_late_result is reported to the loop."""
+    loop = asyncio.get_running_loop()
+    gate = loop.create_future()
+
+    async def coro(idx):
+        await gate
+        return idx
+
+    def _fail(result):
+        raise ValueError("boom")
+
+    task = asyncio.create_task(
+        staggered_race(
+            [partial(coro, i) for i in range(2)], delay=0.001, on_late_result=_fail
+        )
+    )
+    await asyncio.sleep(0.05)
+    with mock.patch.object(loop, "call_exception_handler") as handler:
+        gate.set_result(None)
+        winner, _, _ = await task
+    assert winner == 0
+    assert isinstance(handler.call_args[0][0]["exception"], ValueError)
@@ -0,0 +1,164 @@
+import asyncio
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from aiohappyeyeballs import _timer_wheel
+from aiohappyeyeballs._timer_wheel import TimerWheel, get_timer_wheel
+
+
+@pytest.mark.asyncio
+async def test_timers_fire_in_order():
+    """Test timers fire in order and never before they are due."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop)
+    fired: list[tuple[str, float]] = []
+
+    def _fire(name):
+        fired.append((name, loop.time()))
+
+    start = loop.time()
+    wheel.call_at(start + 0.02, lambda: _fire("b"))
+    wheel.call_at(start + 0.01, lambda: _fire("a"))
+    wheel.call_later(0.03, lambda: _fire("c"))
+    assert len(wheel) == 3
+    await asyncio.sleep(0.05)
+    assert [name for name, _ in fired] == ["a", "b", "c"]
+    for (_, when), offset in zip(fired, (0.01, 0.02, 0.03), strict=True):
+        assert when >= start + offset
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_timers_share_a_loop_timer():
+    """Test timers in the same bucket share a single loop timer."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop, resolution=1)
+    fired: list[str] = []
+    when = loop.time() + 0.01
+    with mock.patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+        timers = [
+            wheel.call_at(when, partial(fired.append, "shared")) for _ in range(100)
+        ]
+    assert call_at.call_count == 1
+    for timer in timers:
+        timer.cancel()
+    assert fired == []
+
+
+@pytest.mark.asyncio
+async def test_earlier_timer_rearms_the_loop_timer():
+    """Test an earlier timer moves the loop timer forward."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop)
+    fired: list[str] = []
+    late = wheel.call_later(10, lambda: fired.append("late"))
+    wheel.call_later(0.01, lambda: fired.append("early"))
+    await asyncio.sleep(0.03)
+    assert fired == ["early"]
+    assert not late.cancelled()
+    late.cancel()
+    assert late.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_cancel():
+    """Test cancelled timers do not fire and an idle wheel drops its timer."""
+    loop = asyncio.get_running_loop()
+    wheel = get_timer_wheel(loop)
+    assert get_timer_wheel(loop) is wheel
+    fired: list[str] = []
+    timer = wheel.call_later(0.01, lambda: fired.append("cancelled"))
+    wheel.call_later(0.01, lambda: fired.append("fired"))
+    timer.cancel()
+    timer.cancel()
+    assert len(wheel) == 1
+    await asyncio.sleep(0.03)
+    assert fired == ["fired"]
+    assert len(wheel) == 0
+    # The idle wheel was dropped, a new one is created on demand
+    assert loop not in _timer_wheel._WHEELS
+    assert get_timer_wheel(loop) is not wheel
+    get_timer_wheel(loop).call_later(10, partial(fired.append, "idle")).cancel()
+    assert loop not in _timer_wheel._WHEELS
+
+
+@pytest.mark.asyncio
+async def test_cancel_from_callback():
+    """Test a callback cancelling a timer in the same bucket."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop, resolution=1)
+    fired: list[str] = []
+    when = loop.time()
+    wheel.call_at(when, lambda: other.cancel())
+    other = wheel.call_at(when, lambda: fired.append("other"))
+    await asyncio.sleep(0.01)
+    assert fired == []
+
+
+@pytest.mark.asyncio
+async def test_schedule_from_callback():
+    """Test a callback scheduling a timer that is already due."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop)
+    fired: list[str] = []
+
+    def _first():
+        fired.append("first")
+        wheel.call_at(loop.time() - 1, lambda: fired.append("second"))
+        wheel.call_later(0.01, lambda: fired.append("third"))
+
+    wheel.call_later(0, _first)
+    await asyncio.sleep(0.001)
+    assert fired == ["first", "second"]
+    await asyncio.sleep(0.03)
+    assert fired == ["first", "second", "third"]
+    wheel.call_later(0, lambda: wheel.call_later(0.01, lambda: fired.append("last")))
+    await asyncio.sleep(0.03)
+    assert fired[-1] == "last"
+
+
+@pytest.mark.asyncio
+async def test_callback_exception():
+    """Test a failing callback is reported and does not stop the others."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop)
+    fired: list[str] = []
+
+    def _fail():
+        raise ValueError("boom")
+
+    when = loop.time()
+    wheel.call_at(when, _fail)
+    wheel.call_at(when, lambda: fired.append("fired"))
+    with mock.patch.object(loop, "call_exception_handler") as handler:
+        await asyncio.sleep(0.01)
+    assert fired == ["fired"]
+    assert isinstance(handler.call_args[0][0]["exception"], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_callback_system_exit():
+    """Test SystemExit from a callback is not swallowed."""
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(loop)
+
+    def _exit():
+        raise SystemExit
+
+    wheel.call_at(loop.time(), _exit)
+    assert wheel._handle is not None
+    wheel._handle.cancel()
+    with pytest.raises(SystemExit):
+        wheel._run()
+
+
+def test_resolution_must_be_positive():
+    """Test the resolution must be positive."""
+    loop = asyncio.new_event_loop()
+    try:
+        with pytest.raises(ValueError, match="resolution must be positive"):
+            TimerWheel(loop, resolution=0)
+    finally:
+        loop.close()